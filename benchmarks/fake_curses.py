@@ -0,0 +1,79 @@
+"""
+Fake Curses Module
+Stand-in curses windows so the game can be benchmarked without a terminal.
+"""
+
+import curses
+from contextlib import contextmanager
+
+
+class FakeWindow:
+    """Curses window replacement that counts draw calls instead of painting."""
+
+    def __init__(self, height, width):
+        """Initialize a window of the given size."""
+        self.height = height
+        self.width = width
+        self.draw_calls = 0
+
+    def getmaxyx(self):
+        """Return the window size."""
+        return self.height, self.width
+
+    def addch(self, y, x, ch, attr=0):
+        """Count a character draw."""
+        self.draw_calls += 1
+
+    def addstr(self, y, x, text, attr=0):
+        """Count a string draw."""
+        self.draw_calls += 1
+
+    def border(self):
+        """Count a border draw."""
+        self.draw_calls += 1
+
+    def resize(self, height, width):
+        """Change the window size."""
+        self.height = height
+        self.width = width
+
+    def mvwin(self, y, x):
+        """Ignore window moves."""
+
+    def getch(self):
+        """Return no key."""
+        return -1
+
+    def clear(self):
+        """Ignore screen clears."""
+
+    def erase(self):
+        """Ignore screen erases."""
+
+    def refresh(self):
+        """Ignore refreshes."""
+
+    def noutrefresh(self):
+        """Ignore refreshes."""
+
+    def keypad(self, flag):
+        """Ignore keypad mode."""
+
+    def nodelay(self, flag):
+        """Ignore input mode."""
+
+    def timeout(self, delay):
+        """Ignore input timeouts."""
+
+
+@contextmanager
+def fake_terminal(height, width):
+    """Patch curses so SnakeGame runs against FakeWindow screens. Yields stdscr."""
+    saved = (curses.curs_set, curses.newwin, curses.doupdate)
+    curses.curs_set = lambda visibility: None
+    curses.newwin = lambda rows, cols, y, x: FakeWindow(rows, cols)
+    curses.doupdate = lambda: None
+    try:
+        yield FakeWindow(height, width)
+    finally:
+        curses.curs_set, curses.newwin, curses.doupdate = saved
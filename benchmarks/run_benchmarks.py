@@ -0,0 +1,697 @@
+#!/usr/bin/env python3
+"""
+Snake Game Benchmarks
+Measures the tick, collision, spawn, render, world, arena, server, stream, env, tournament, autopilot and
+leaderboard hot paths without a terminal, plus the startup time of both games, writes the results as JSON
+and compares them against a stored baseline so regressions are visible.
+
+Usage:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --save-baseline
+    python benchmarks/run_benchmarks.py --quick --filter tick
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_curses import FakeWindow, fake_terminal  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Terminal size used for the game benchmarks (play area 100 x 300)
+SCREEN_HEIGHT = 105
+SCREEN_WIDTH = 302
+
+SNAKE_LENGTHS = [3, 1000, 10000, 25000]
+FILL_FRACTIONS = [0.10, 0.50, 0.95]
+
+# Startup benchmark: entry points as the installed scripts run them, and the text of the first frame
+STARTUP_ENTRY_POINTS = {
+    'snake_game': 'src.snake_game',
+    'snake_game_modular': 'src.snake_game_modular'
+}
+FIRST_FRAME_MARKER = b'Score:'
+
+# Absolute limits for metrics with a real-time budget, checked on every run
+BUDGETS = {
+    'arena.tick.bots_1000': 50.0,  # ms/tick: a tick over 1000 bots fits the fastest tick interval
+    'server.sessions_1000.cpu': 100.0,  # %: 1000 sessions run in real time on one core
+}
+
+# Registered benchmarks: (name, function)
+BENCHMARKS = []
+
+
+def benchmark(name):
+    """Register a benchmark function that yields (metric, value, unit, higher_is_better)."""
+    def register(func):
+        BENCHMARKS.append((name, func))
+        return func
+    return register
+
+
+class Timer:
+    """Accumulates time spent in a measured section."""
+
+    def __init__(self):
+        """Initialize an empty timer."""
+        self.elapsed = 0.0
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed += time.perf_counter() - self.start
+
+
+def best_rate(func, iterations, repeat):
+    """Run func(iterations) repeat times and return the best calls per second."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(iterations)
+        best = min(best, time.perf_counter() - start)
+    return iterations / best
+
+
+def serpentine_cycle(rows, cols):
+    """Return a closed path over every interior cell of a rows x cols play area.
+
+    Row 1 runs right, the following rows sweep back and forth over columns
+    2 and up, and column 1 leads back to the start. rows - 2 must be even.
+    """
+    cycle = [(1, x) for x in range(1, cols - 1)]
+    for y in range(2, rows - 1):
+        xs = range(cols - 2, 1, -1) if y % 2 == 0 else range(2, cols - 1)
+        cycle.extend((y, x) for x in xs)
+    cycle.extend((y, 1) for y in range(rows - 2, 1, -1))
+    return cycle
+
+
+def make_game(module_name='snake_game', **options):
+    """Create a SnakeGame on a fake terminal (inside fake_terminal())."""
+    if module_name == 'snake_game':
+        from src import snake_game as module
+    else:
+        from src import snake_game_modular as module
+    return module.SnakeGame(FakeWindow(SCREEN_HEIGHT, SCREEN_WIDTH), **options)
+
+
+def lay_out_snake(game, cycle, length):
+    """Place a snake of the given length along the cycle. Returns the per-cell direction table."""
+    from src.modules.board import SNAKE, FOOD
+    from src.modules.game_engine import UP, DOWN, LEFT, RIGHT
+    from src.modules.snake_body import SnakeBody
+
+    state = game.state
+    state.reset(seed=1)
+    state.progression = False
+    board = state.board
+    for y, x in state.snake:
+        board.set(y, x, 0)
+    board.set(state.food[0], state.food[1], 0)
+
+    state.snake = SnakeBody.from_positions(state.width, reversed(cycle[:length]))
+    for y, x in state.snake:
+        board.set(y, x, SNAKE)
+    state.food = state.generate_food()
+    board.set(state.food[0], state.food[1], FOOD)
+
+    deltas = {(-1, 0): UP, (1, 0): DOWN, (0, -1): LEFT, (0, 1): RIGHT}
+    directions = [RIGHT] * (state.height * state.width)
+    for i, (y, x) in enumerate(cycle):
+        next_y, next_x = cycle[(i + 1) % len(cycle)]
+        directions[y * state.width + x] = deltas[(next_y - y, next_x - x)]
+    head_y, head_x = cycle[length - 1]
+    prev_y, prev_x = cycle[length - 2]
+    state.direction = state.last_direction = deltas[(head_y - prev_y, head_x - prev_x)]
+    board.take_dirty()
+    return directions
+
+
+def follow_cycle(game, directions, ticks, render=None, timer=None):
+    """Advance the game along the cycle for a number of ticks."""
+    state = game.state
+    for tick in range(ticks):
+        state.direction = directions[state.snake.head]
+        game.update()
+        if render is not None:
+            with timer:
+                render()
+        elif tick % 1000 == 0:
+            state.board.take_dirty()
+
+
+@benchmark('tick')
+def bench_tick(quick):
+    """update() ticks per second as the snake grows."""
+    game = make_game()
+    cycle = serpentine_cycle(game.game_height, game.game_width)
+    ticks = 2000 if quick else 20000
+    for length in SNAKE_LENGTHS:
+        directions = lay_out_snake(game, cycle, length)
+        rate = best_rate(lambda n: follow_cycle(game, directions, n), ticks, 1 if quick else 3)
+        yield f'tick.update.len_{length}', rate, 'ticks/s', True
+        yield f'tick.body_bytes.len_{length}', sys.getsizeof(game.state.snake.buffer), 'bytes', False
+
+
+@benchmark('collision')
+def bench_collision(quick):
+    """check_collision() calls per second against long snakes."""
+    game = make_game()
+    cycle = serpentine_cycle(game.game_height, game.game_width)
+    calls = 20000 if quick else 200000
+    for length in (3, SNAKE_LENGTHS[-1]):
+        lay_out_snake(game, cycle, length)
+        tail = list(game.snake[-1])
+
+        def check(n):
+            check_collision = game.check_collision
+            for _ in range(n):
+                check_collision(tail)
+        yield f'collision.check.len_{length}', best_rate(check, calls, 3), 'calls/s', True
+
+
+@benchmark('spawn')
+def bench_spawn(quick):
+    """generate_food() calls per second on boards filled to 10%, 50% and 95%."""
+    from src.modules.board import SNAKE
+
+    game = make_game()
+    calls = 2000 if quick else 20000
+    for fraction in FILL_FRACTIONS:
+        game.state.reset(seed=1)
+        board = game.board
+        rng = random.Random(2)
+        initial_free = board.free_count()
+        while initial_free - board.free_count() < int(initial_free * fraction):
+            y, x = board.random_free_cell(rng)
+            board.set(y, x, SNAKE)
+
+        def spawn(n):
+            generate_food = game.generate_food
+            for _ in range(n):
+                generate_food()
+        yield f'spawn.food.fill_{int(fraction * 100)}', best_rate(spawn, calls, 3), 'calls/s', True
+
+
+@benchmark('render')
+def bench_render(quick):
+    """Per-frame render cost and draw calls, incremental and full redraw."""
+    game = make_game()
+    cycle = serpentine_cycle(game.game_height, game.game_width)
+    frames = 200 if quick else 2000
+    for length in (3, 1000, 10000):
+        for mode in ('incremental', 'full'):
+            directions = lay_out_snake(game, cycle, length)
+            game.incremental_render = mode == 'incremental'
+            game.full_redraw = True
+            game.render()
+            calls_before = game.window.draw_calls + game.stdscr.draw_calls
+            hud_before = game.hud_hits, game.hud_writes
+            timer = Timer()
+            follow_cycle(game, directions, frames, render=game.render, timer=timer)
+            calls = game.window.draw_calls + game.stdscr.draw_calls - calls_before
+            yield f'render.{mode}.len_{length}', timer.elapsed / frames * 1e6, 'us/frame', False
+            yield f'render.{mode}.len_{length}.draw_calls', calls / frames, 'calls/frame', False
+            if mode == 'incremental':
+                yield (f'render.{mode}.len_{length}.hud_cache_hits',
+                       (game.hud_hits - hud_before[0]) / frames * 100, '%', True)
+                yield (f'render.{mode}.len_{length}.hud_writes',
+                       (game.hud_writes - hud_before[1]) / frames, 'fields/frame', False)
+    game.incremental_render = True
+
+    modular = make_game('snake_game_modular')
+    renderer = modular.renderer
+    timer = Timer()
+    for _ in range(frames):
+        modular.update()
+        with timer:
+            renderer.draw_frame(modular.board, modular.snake, modular.food,
+                                modular.score, modular.high_score, modular.paused)
+        if modular.state.game_over:
+            modular.reset_game()
+    yield 'render.game_renderer.incremental', timer.elapsed / frames * 1e6, 'us/frame', False
+    yield 'render.game_renderer.hud_cache_hits', renderer.hud_hits / frames * 100, '%', True
+
+    # The ANSI backend writes real escape sequences, to /dev/null here
+    from src.modules.ansi_renderer import AnsiRenderer
+    modular_cycle = serpentine_cycle(modular.game_height, modular.game_width)
+    with open(os.devnull, 'wb') as devnull:
+        renderer = AnsiRenderer(modular.stdscr, modular.window, modular.game_height, modular.game_width,
+                                fd=devnull.fileno())
+        for length in (3, 1000):
+            directions = lay_out_snake(modular, modular_cycle, length)
+            renderer.invalidate()
+            renderer.draw_frame(modular.board, modular.snake, modular.food, modular.score, modular.high_score, False)
+            bytes_before = renderer.screen.bytes_written
+            timer = Timer()
+            follow_cycle(modular, directions, frames, timer=timer,
+                         render=lambda: renderer.draw_frame(modular.board, modular.snake, modular.food,
+                                                            modular.score, modular.high_score, False))
+            yield f'render.ansi.len_{length}', timer.elapsed / frames * 1e6, 'us/frame', False
+            yield (f'render.ansi.len_{length}.bytes', (renderer.screen.bytes_written - bytes_before) / frames,
+                   'bytes/frame', False)
+
+            timer = Timer()
+            for _ in range(frames // 10):
+                renderer.invalidate()
+                with timer:
+                    renderer.draw_frame(modular.board, modular.snake, modular.food,
+                                        modular.score, modular.high_score, False)
+            yield f'render.ansi.full.len_{length}', timer.elapsed / (frames // 10) * 1e6, 'us/frame', False
+
+
+@benchmark('world')
+def bench_world(quick):
+    """Tick and frame cost on a terminal-sized board vs. a 10000 x 10000 world."""
+    from src.modules.game_engine import UP, RIGHT
+
+    ticks = 2000 if quick else 20000
+    for name, world_size in (('screen', None), ('10000x10000', (10000, 10000))):
+        game = make_game(world_size=world_size)
+        game.state.reset(seed=1)
+        game.state.progression = False
+        update_timer, render_timer = Timer(), Timer()
+        for tick in range(ticks):
+            # Staircase up and to the right, so the camera keeps scrolling
+            if tick % 20 == 0:
+                game.state.set_direction(UP if tick % 40 else RIGHT)
+            with update_timer:
+                alive = game.update()
+            if not alive:
+                game.reset_game()
+            with render_timer:
+                game.render()
+        yield f'world.{name}.update', update_timer.elapsed / ticks * 1e6, 'us/tick', False
+        yield f'world.{name}.render', render_timer.elapsed / ticks * 1e6, 'us/frame', False
+
+
+@benchmark('resize')
+def bench_resize(quick):
+    """Time from a terminal resize to the first frame at the new size."""
+    resizes = 50 if quick else 500
+    for name, world_size in (('terminal', None), ('10000x10000', (10000, 10000))):
+        game = make_game(world_size=world_size)
+        game.state.reset(seed=1)
+        game.render()
+        for i in range(resizes):
+            # Alternate between the full screen and a standard 80x24 terminal
+            game.stdscr.height, game.stdscr.width = (24, 80) if i % 2 == 0 else (SCREEN_HEIGHT, SCREEN_WIDTH)
+            game.handle_resize()
+            game.render()
+            if not game.update():
+                game.reset_game()
+        yield f'resize.{name}.first_frame', game.perf.mean_ms('resize') * 1e3, 'us', False
+
+
+@benchmark('arena')
+def bench_arena(quick):
+    """Arena tick time with hundreds to thousands of bot snakes."""
+    from src.modules.arena import Arena
+
+    ticks = 50 if quick else 500
+    for bots in (100, 1000, 3000):
+        arena = Arena(SCREEN_HEIGHT - 5, SCREEN_WIDTH - 2, bots=bots, seed=1)
+        total = worst = 0.0
+        for _ in range(ticks):
+            if arena.game_over:
+                arena.reset(arena.seed + 1)
+            start = time.perf_counter()
+            arena.step()
+            elapsed = time.perf_counter() - start
+            total += elapsed
+            worst = max(worst, elapsed)
+        yield f'arena.tick.bots_{bots}', total / ticks * 1e3, 'ms/tick', False
+        yield f'arena.tick.bots_{bots}.max', worst * 1e3, 'ms/tick', False
+
+
+@benchmark('server')
+def bench_server(quick):
+    """Game server cost of ticking 1000 sessions from one timer wheel, frames encoded but not sent."""
+    from src.modules.game_server import GameServer
+
+    server = GameServer()
+    for seed in range(1000):
+        server.add_session(lambda data, frame=False: True, seed=seed)
+    slots = 200 if quick else 2000  # 5 ms slots: 1 s or 10 s of game time
+    total = worst = 0.0
+    for _ in range(slots):
+        start = time.perf_counter()
+        server.run_slot()
+        elapsed = time.perf_counter() - start
+        total += elapsed
+        worst = max(worst, elapsed)
+        for session in list(server.sessions.values()):
+            if session.state.game_over:
+                server.command(session, 'restart')
+    game_seconds = slots * server.wheel.slot
+    yield 'server.sessions_1000.slot', total / slots * 1e3, 'ms/slot', False
+    yield 'server.sessions_1000.slot.max', worst * 1e3, 'ms/slot', False
+    yield 'server.sessions_1000.cpu', total / game_seconds * 100, '%', False
+
+
+@benchmark('stream')
+def bench_stream(quick):
+    """Spectator stream encode and decode time and bytes per tick over autopilot games."""
+    from src.modules.autopilot import Autopilot
+    from src.modules.frame_stream import FrameEncoder, FrameDecoder, encode_header
+
+    game = make_game()
+    state = game.state
+    state.reset(seed=1)
+    autopilot = Autopilot()
+    encoder = FrameEncoder(state.width)
+    chunks = [encode_header(state.height, state.width), encoder.encode(state)]
+    ticks = 2000 if quick else 20000
+    encode_time = 0.0
+    for _ in range(ticks):
+        if state.game_over:
+            state.reset(seed=state.seed + 1)
+            autopilot.reset()
+        state.step(autopilot.next_direction(state))
+        start = time.perf_counter()
+        chunks.append(encoder.encode(state))
+        encode_time += time.perf_counter() - start
+
+    decoder = FrameDecoder()
+    start = time.perf_counter()
+    for chunk in chunks:
+        decoder.feed(chunk)
+        while decoder.next_record() is not None:
+            pass
+    decode_time = time.perf_counter() - start
+    yield 'stream.encode', encode_time / ticks * 1e6, 'us/tick', False
+    yield 'stream.decode', decode_time / ticks * 1e6, 'us/tick', False
+    yield 'stream.bytes', sum(len(chunk) for chunk in chunks[1:]) / ticks, 'bytes/tick', False
+
+
+def import_time_ms(module, env):
+    """Return a module's cumulative import time in a fresh interpreter, from -X importtime."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    for line in result.stderr.splitlines():
+        fields = line.split('|')
+        if len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[1]) / 1000
+    raise RuntimeError(f"no import time reported for {module}")
+
+
+def first_frame_ms(module, env):
+    """Return the time from starting a game under a pseudo-terminal until its first frame is drawn."""
+    import pty
+    import select
+
+    start = time.perf_counter()
+    pid, fd = pty.fork()
+    if pid == 0:
+        try:
+            os.chdir(ROOT)
+            os.execve(sys.executable, [sys.executable, '-c', f'from {module} import main_wrapper; main_wrapper()'], env)
+        finally:
+            os._exit(127)
+
+    output = b''
+    elapsed = None
+    try:
+        while elapsed is None and time.perf_counter() - start < 10:
+            if select.select([fd], [], [], 0.05)[0]:
+                output += os.read(fd, 65536)
+                if FIRST_FRAME_MARKER in output:
+                    elapsed = time.perf_counter() - start
+        os.write(fd, b'q')
+        while os.read(fd, 65536):
+            pass
+    except OSError:
+        pass  # The terminal closes when the game exits
+    finally:
+        os.waitpid(pid, 0)
+        os.close(fd)
+    if elapsed is None:
+        raise RuntimeError(f"{module} drew no frame")
+    return elapsed * 1000
+
+
+@benchmark('startup')
+def bench_startup(quick):
+    """Import time and time to first frame of both games, each in a fresh interpreter."""
+    env = dict(os.environ, TERM='xterm', LINES='30', COLUMNS='100')
+    # Bytecode is cached as on an installed game
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    runs = 3 if quick else 11
+    for name, module in STARTUP_ENTRY_POINTS.items():
+        import_time_ms(module, env)
+        yield f'startup.import.{name}', statistics.median(import_time_ms(module, env) for _ in range(runs)), 'ms', False
+        if os.name == 'posix':
+            yield (f'startup.first_frame.{name}', statistics.median(first_frame_ms(module, env) for _ in range(runs)),
+                   'ms', False)
+
+
+@benchmark('env')
+def bench_env(quick):
+    """Step time of the reinforcement-learning environments with random actions (skipped without NumPy)."""
+    try:
+        import numpy as np
+        from src.modules.snake_env import SnakeEnv, VectorSnakeEnv
+    except ImportError:
+        return
+
+    steps = 5000 if quick else 50000
+    rng = random.Random(1)
+    actions = [rng.randrange(4) for _ in range(steps)]
+    env = SnakeEnv(20, 20, max_steps=1000)
+    env.reset(seed=1)
+    start = time.perf_counter()
+    for action in actions:
+        _, _, terminated, truncated, _ = env.step(action)
+        if terminated or truncated:
+            env.reset()
+    yield 'env.single.step', (time.perf_counter() - start) / steps * 1e6, 'us/step', False
+
+    num_envs = 256
+    batches = 20 if quick else 200
+    vec = VectorSnakeEnv(num_envs, 20, 20, seed=1)
+    vec_actions = np.random.default_rng(1).integers(0, 4, size=(batches, num_envs))
+    start = time.perf_counter()
+    for step_actions in vec_actions:
+        vec.step(step_actions)
+    yield f'env.vector_{num_envs}.step', (time.perf_counter() - start) / (batches * num_envs) * 1e6, 'us/env-step', False
+
+
+@benchmark('tournament')
+def bench_tournament(quick):
+    """Autopilot tournament throughput in this process and on a pool with one worker per CPU core."""
+    from src.modules.tournament import run_tournament
+
+    seeds = range(8 if quick else 64)
+    for name, jobs in (('jobs_1', 1), ('jobs_all', None)):
+        start = time.perf_counter()
+        ticks = sum(result[4] for result in run_tournament(['autopilot'], seeds, jobs=jobs))
+        yield f'tournament.{name}', ticks / (time.perf_counter() - start), 'ticks/s', True
+
+
+@benchmark('autopilot')
+def bench_autopilot(quick):
+    """Autopilot search time per tick while it plays full games."""
+    from src.modules.autopilot import Autopilot
+
+    game = make_game()
+    state = game.state
+    state.reset(seed=1)
+    autopilot = Autopilot()
+    ticks = 5000 if quick else 50000
+    for _ in range(ticks):
+        if state.game_over:
+            state.reset(seed=state.seed + 1)
+            autopilot.reset()
+        state.step(autopilot.next_direction(state))
+    yield 'autopilot.search.mean', autopilot.average_search_time() * 1e3, 'ms/tick', False
+    yield 'autopilot.search.max', autopilot.max_search_time * 1e3, 'ms/tick', False
+
+
+@benchmark('hamiltonian')
+def bench_hamiltonian(quick):
+    """Cycle build vs. cache load time, and the Hamiltonian solver's time per tick."""
+    from src.modules.game_engine import GameState
+    from src.modules.hamiltonian import HamiltonianSolver
+
+    height, width = SCREEN_HEIGHT - 5, SCREEN_WIDTH - 2
+    with tempfile.TemporaryDirectory() as tmp:
+        build, load = Timer(), Timer()
+        with build:
+            HamiltonianSolver(tmp).cycle_for(height, width, [])
+        with load:
+            HamiltonianSolver(tmp).cycle_for(height, width, [])
+    yield 'hamiltonian.cycle.build', build.elapsed * 1e3, 'ms', False
+    yield 'hamiltonian.cycle.cached', load.elapsed * 1e3, 'ms', False
+
+    state = GameState(height, width, seed=1)
+    solver = HamiltonianSolver()
+    ticks = 5000 if quick else 50000
+    for _ in range(ticks):
+        if state.game_over:
+            state.reset(seed=state.seed + 1)
+            solver.reset()
+        state.step(solver.next_direction(state))
+    yield 'hamiltonian.search.mean', solver.average_search_time() * 1e3, 'ms/tick', False
+    yield 'hamiltonian.search.max', solver.max_search_time * 1e3, 'ms/tick', False
+
+
+@benchmark('leaderboard')
+def bench_leaderboard(quick):
+    """update_leaderboard() cost on the game thread, write-through latency and query latency."""
+    from src.modules.leaderboard_store import LeaderboardStore
+
+    game = make_game()
+    calls = 50 if quick else 500
+    history = 1000 if quick else 100000
+    with tempfile.TemporaryDirectory() as tmp:
+        store = LeaderboardStore(os.path.join(tmp, 'scores.db'))
+        rng = random.Random(3)
+        store.import_once('benchmark', [
+            (rng.randrange(2000), rng.randrange(1, 20),
+             f'2024-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d} 12:00:00')
+            for _ in range(history)
+        ])
+        game.persistence.flush()
+        game.leaderboard_store = store
+
+        def update(n):
+            for i in range(n):
+                game.update_leaderboard(i % 2000)
+
+        def update_persisted(n):
+            for i in range(n):
+                game.update_leaderboard(i % 2000)
+                game.persistence.flush()
+
+        def top(n):
+            for i in range(n):
+                store.top(10, level=i % 20 + 1)
+
+        def on_date(n):
+            for i in range(n):
+                store.on_date(f'2024-06-{i % 28 + 1:02d}', 10)
+        yield 'leaderboard.update', 1e3 / best_rate(update, calls, 3), 'ms/call', False
+        game.persistence.flush()
+        yield 'leaderboard.update_persisted', 1e3 / best_rate(update_persisted, calls, 3), 'ms/call', False
+        yield 'leaderboard.top_by_level', 1e3 / best_rate(top, calls, 3), 'ms/call', False
+        yield 'leaderboard.top_by_date', 1e3 / best_rate(on_date, calls, 3), 'ms/call', False
+        store.close()
+
+
+def run(selected, quick):
+    """Run the selected benchmarks and return the results dictionary."""
+    results = {}
+    for name, func in BENCHMARKS:
+        if selected and not any(part in name for part in selected):
+            continue
+        for metric, value, unit, higher_is_better in func(quick):
+            results[metric] = {'value': value, 'unit': unit, 'higher_is_better': higher_is_better}
+            print(f"  {metric:45s} {value:14,.2f} {unit}")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print the change of every metric against the baseline. Returns the regressed metrics."""
+    regressions = []
+    print(f"\nComparison against baseline (threshold {threshold:.0%}):")
+    for metric, result in results.items():
+        if metric not in baseline:
+            continue
+        old = baseline[metric]['value']
+        new = result['value']
+        if old == 0:
+            continue
+        change = (new - old) / old
+        worse = -change if result['higher_is_better'] else change
+        status = 'REGRESSION' if worse > threshold else 'ok'
+        if worse > threshold:
+            regressions.append(metric)
+        print(f"  {metric:45s} {change:+8.1%}  {status}")
+    return regressions
+
+
+def check_budgets(results):
+    """Print every metric that has a budget against its limit. Returns the metrics over budget."""
+    over = []
+    checked = [metric for metric in BUDGETS if metric in results]
+    if checked:
+        print("\nBudgets:")
+    for metric in checked:
+        limit = BUDGETS[metric]
+        result = results[metric]
+        value = result['value']
+        exceeded = value < limit if result['higher_is_better'] else value > limit
+        if exceeded:
+            over.append(metric)
+        print(f"  {metric:45s} {value:14,.2f} / {limit:,.2f} {result['unit']}  {'OVER BUDGET' if exceeded else 'ok'}")
+    return over
+
+
+def main(argv=None):
+    """Run the benchmark suite from the command line."""
+    parser = argparse.ArgumentParser(description="Benchmark the snake game hot paths.")
+    parser.add_argument('--output', metavar='FILE', help="write results as JSON")
+    parser.add_argument('--baseline', metavar='FILE', default=DEFAULT_BASELINE,
+                        help="baseline JSON to compare against (default: benchmarks/baseline.json)")
+    parser.add_argument('--save-baseline', action='store_true', help="overwrite the baseline with these results")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="relative slowdown reported as a regression (default: 0.25)")
+    parser.add_argument('--fail-on-regression', action='store_true', help="exit with status 1 on regressions")
+    parser.add_argument('--quick', action='store_true', help="fewer iterations, for smoke runs")
+    parser.add_argument('--filter', action='append', default=[], help="only run benchmarks whose name contains this")
+    args = parser.parse_args(argv)
+
+    # Keep score files written by the game out of the real home directory
+    with tempfile.TemporaryDirectory() as home, fake_terminal(SCREEN_HEIGHT, SCREEN_WIDTH):
+        os.environ['HOME'] = home
+        print("Running benchmarks...")
+        results = run(args.filter, args.quick)
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'quick': args.quick,
+        },
+        'results': results,
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+
+    regressions = check_budgets(results)
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r') as f:
+            regressions += compare(results, json.load(f)['results'], args.threshold)
+    if regressions and args.fail_on_regression:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,297 @@
+"""
+ANSI Renderer Module
+Renderer backend writing ANSI escape sequences instead of curses calls.
+
+Drawing goes into a back buffer of the screen. Each frame the cells
+drawn since the last one are compared with the front buffer, what the
+terminal shows, and only the differences are sent, as one byte string
+with a single write. Runs of adjacent cells need no cursor movement;
+each jump uses the shortest of an absolute move, a move within the row
+or rewriting the unchanged cells in between.
+"""
+
+import os
+import sys
+import curses
+
+from .game_renderer import GameRenderer
+
+# Cell attributes kept in the buffers (curses attributes are mapped onto these)
+NORMAL = 0
+BOLD = 1
+
+# Escape sequences for switching to each attribute
+ATTR_SEQUENCES = {
+    NORMAL: '\x1b[22m',
+    BOLD: '\x1b[1m'
+}
+
+CLEAR_SCREEN = '\x1b[0m\x1b[2J'
+
+# Gaps up to this many cells may be rewritten rather than jumped over
+MAX_REWRITE = 3
+
+
+class AnsiScreen:
+    """Back and front buffers of the terminal, flushed as ANSI escape sequences.
+
+    Cells are kept as one-character strings with an attribute. put()
+    draws into the back buffer and records the cell; flush() sends what
+    differs from the front buffer. The cursor position and attribute
+    are not assumed to survive between frames, since curses may move
+    the cursor while reading keys.
+    """
+
+    def __init__(self, height, width, fd):
+        """Initialize blank buffers for a height x width terminal writing to file descriptor fd."""
+        self.fd = fd
+        self.resize(height, width)
+
+        # Statistics
+        self.frames = 0
+        self.bytes_written = 0
+        self.cells_written = 0
+
+    def resize(self, height, width):
+        """Resize the buffers; the next flush clears the terminal and draws everything."""
+        self.height = height
+        self.width = width
+        size = height * width
+        self.back = [' '] * size
+        self.back_attrs = bytearray(size)
+        self.dirty = []
+        self.invalidate()
+
+    def invalidate(self):
+        """Forget what the terminal shows, so the next flush starts from a cleared screen."""
+        self.cleared = True
+        self.front = [' '] * (self.height * self.width)
+        self.front_attrs = bytearray(self.height * self.width)
+        self.dirty.extend(index for index, char in enumerate(self.back) if char != ' ')
+
+    def clear(self):
+        """Blank the whole screen, sent as a single clear sequence."""
+        size = self.height * self.width
+        self.back = [' '] * size
+        self.back_attrs = bytearray(size)
+        self.dirty = []
+        self.cleared = True
+        self.front = [' '] * size
+        self.front_attrs = bytearray(size)
+
+    def clear_area(self, top, left, height, width):
+        """Blank a rectangle of the screen."""
+        bottom = min(top + height, self.height)
+        left = max(left, 0)
+        right = min(left + width, self.width)
+        if right <= left:
+            return
+        blank = [' '] * (right - left)
+        normal = bytes(right - left)
+        for y in range(max(top, 0), bottom):
+            start = y * self.width + left
+            end = start + right - left
+            if self.back[start:end] != blank or self.back_attrs[start:end] != normal:
+                self.back[start:end] = blank
+                self.back_attrs[start:end] = normal
+                self.dirty.extend(range(start, end))
+
+    def put(self, y, x, text, attr=NORMAL):
+        """Draw text at a screen position, cutting off what falls outside the screen."""
+        if not 0 <= y < self.height:
+            return
+        width = self.width
+        if x < 0:
+            text = text[-x:]
+            x = 0
+        text = text[:width - x]
+        index = y * width + x
+        back, back_attrs, dirty = self.back, self.back_attrs, self.dirty
+        for char in text:
+            back[index] = char
+            back_attrs[index] = attr
+            dirty.append(index)
+            index += 1
+
+    def move(self, cursor, index):
+        """Return the shortest escape sequence moving the cursor from cursor (None if unknown) to index."""
+        y, x = divmod(index, self.width)
+        best = f'\x1b[{y + 1};{x + 1}H'
+        if cursor is None or cursor // self.width != y:
+            return best
+        column = f'\x1b[{x + 1}G'
+        if len(column) < len(best):
+            best = column
+        gap = index - cursor
+        if gap > 0:
+            forward = f'\x1b[{gap}C' if gap > 1 else '\x1b[C'
+            if len(forward) < len(best):
+                best = forward
+        return best
+
+    def flush(self):
+        """Write the cells that differ from the front buffer to the terminal in one write."""
+        out = []
+        if self.cleared:
+            out.append(CLEAR_SCREEN)
+            self.cleared = False
+
+        back, back_attrs = self.back, self.back_attrs
+        front, front_attrs = self.front, self.front_attrs
+        width = self.width
+        cursor = None
+        attr = None
+        written = 0
+        for index in sorted(set(self.dirty)):
+            char = back[index]
+            cell_attr = back_attrs[index]
+            if char == front[index] and cell_attr == front_attrs[index]:
+                continue
+            if cursor != index:
+                move = self.move(cursor, index)
+                gap = index - cursor if cursor is not None and cursor // width == index // width else 0
+                if 0 < gap <= MAX_REWRITE and all(a == attr for a in front_attrs[cursor:index]):
+                    # The cells in between are unchanged, so writing them again may be shorter
+                    filler = ''.join(front[cursor:index])
+                    if len(filler.encode()) < len(move):
+                        move = filler
+                out.append(move)
+            if cell_attr != attr:
+                out.append(ATTR_SEQUENCES[cell_attr])
+                attr = cell_attr
+            out.append(char)
+            front[index] = char
+            front_attrs[index] = cell_attr
+            written += 1
+            # At the last column the cursor waits to wrap, so its position is not relied on
+            cursor = index + 1 if (index + 1) % width else None
+        self.dirty = []
+
+        if out:
+            self.write(''.join(out).encode())
+        self.frames += 1
+        self.cells_written += written
+
+    def write(self, data):
+        """Write all of data to the terminal."""
+        view = memoryview(data)
+        while view:
+            view = view[os.write(self.fd, view):]
+        self.bytes_written += len(data)
+
+
+class AnsiWindow:
+    """A rectangle of an AnsiScreen with the curses window methods GameRenderer uses."""
+
+    def __init__(self, screen, top, left, height, width):
+        """Initialize a window of height x width at (top, left) on the screen."""
+        self.screen = screen
+        self.top = top
+        self.left = left
+        self.height = height
+        self.width = width
+
+    def getmaxyx(self):
+        """Return the window size."""
+        return self.height, self.width
+
+    def addch(self, y, x, char, attr=curses.A_NORMAL):
+        """Draw a character at a window position."""
+        self.screen.put(self.top + y, self.left + x, char, BOLD if attr & curses.A_BOLD else NORMAL)
+
+    def addstr(self, y, x, text, attr=curses.A_NORMAL):
+        """Draw a string at a window position."""
+        self.screen.put(self.top + y, self.left + x, text, BOLD if attr & curses.A_BOLD else NORMAL)
+
+    def border(self):
+        """Draw a box around the edge of the window."""
+        height, width = self.height, self.width
+        self.addstr(0, 0, '┌' + '─' * (width - 2) + '┐')
+        for y in range(1, height - 1):
+            self.addch(y, 0, '│')
+            self.addch(y, width - 1, '│')
+        self.addstr(height - 1, 0, '└' + '─' * (width - 2) + '┘')
+
+    def clear(self):
+        """Blank the window."""
+        screen = self.screen
+        if (self.top, self.left, self.height, self.width) == (0, 0, screen.height, screen.width):
+            screen.clear()
+        else:
+            screen.clear_area(self.top, self.left, self.height, self.width)
+
+    erase = clear
+
+    def refresh(self):
+        """Send what was drawn to the terminal."""
+        self.screen.flush()
+
+    def noutrefresh(self):
+        """Do nothing; frames are sent by AnsiRenderer.update()."""
+
+    def resize(self, height, width):
+        """Change the window size."""
+        self.height = height
+        self.width = width
+
+    def mvwin(self, y, x):
+        """Move the window."""
+        self.top = y
+        self.left = x
+
+
+class AnsiRenderer(GameRenderer):
+    """GameRenderer drawing through ANSI escape sequences instead of curses.
+
+    Curses still reads the keys and reports the terminal size, through
+    the stdscr and window given; nothing is drawn with them. Frames are
+    written to file descriptor fd, standard output unless given.
+    """
+
+    def __init__(self, stdscr, window, game_height, game_width, incremental=True, fd=None):
+        """Initialize the renderer over the curses screen and input window."""
+        self.terminal = stdscr
+        self.input_window = window
+        height, width = stdscr.getmaxyx()
+        self.screen = AnsiScreen(height, width, sys.stdout.fileno() if fd is None else fd)
+        super().__init__(AnsiWindow(self.screen, 0, 0, height, width),
+                         AnsiWindow(self.screen, 2, 1, game_height, game_width),
+                         game_height, game_width, incremental)
+        self.sync_curses()
+
+    def sync_curses(self):
+        """Let curses finish its own screen updates, then redraw everything over them.
+
+        Curses clears the terminal on its first refresh and after a resize,
+        so that has to happen before our frames rather than on the next key read.
+        """
+        self.terminal.refresh()
+        self.input_window.refresh()
+        self.screen.invalidate()
+
+    def sync_size(self):
+        """Follow a change of the terminal size."""
+        height, width = self.terminal.getmaxyx()
+        if (height, width) != (self.screen.height, self.screen.width):
+            self.screen.resize(height, width)
+            self.stdscr.resize(height, width)
+        self.sync_curses()
+
+    def resize(self, game_height, game_width):
+        """Resize the game window after the terminal was resized, and lay the screen out again.
+
+        The curses window keys are read through gets the same geometry as the drawn one.
+        """
+        self.input_window.resize(game_height, game_width)
+        self.input_window.mvwin(2, 1)
+        self.sync_size()
+        super().resize(game_height, game_width)
+
+    def draw_message(self, text):
+        """Clear the screen and show one line of text in place of the game."""
+        self.sync_size()
+        super().draw_message(text)
+
+    def update(self):
+        """Send the frame to the terminal in a single write."""
+        self.screen.flush()
@@ -0,0 +1,302 @@
+"""
+Arena Module
+Many snakes on one board: the player's snake plus hundreds to thousands
+of bot snakes, several pieces of food and head-to-head collisions.
+
+All snakes share one occupancy grid, so every collision check is a
+single cell lookup, and per-snake state lives in parallel arrays
+indexed by snake number (struct of arrays) rather than in one object
+per snake. Bots steer greedily toward a food target with a one-cell
+look-ahead, which keeps a tick over 1000 snakes at a few milliseconds,
+far inside the 50 ms tick interval of the fastest level.
+"""
+
+import random
+from array import array
+
+from .board import EMPTY, SNAKE, FOOD
+from .game_config import REFRESH_RATE_MS, INITIAL_SNAKE_LENGTH, FOOD_POINTS
+from .game_engine import (
+    UP, DOWN, LEFT, RIGHT, OPPOSITE_DIRECTIONS, FOOD_EATEN, COLLISION, NO_EVENTS, new_board
+)
+from .snake_body import SnakeBody
+
+# The player's snake number
+PLAYER = 0
+
+# Default pieces of food per bot
+FOOD_PER_BOT = 0.25
+
+# Directions a bot tries after the two toward its target, by current direction
+FALLBACK_TURNS = {
+    UP: (UP, LEFT, RIGHT),
+    DOWN: (DOWN, RIGHT, LEFT),
+    LEFT: (LEFT, DOWN, UP),
+    RIGHT: (RIGHT, UP, DOWN)
+}
+
+
+class Arena:
+    """Owns every snake, the food and the RNG of one arena game.
+
+    Offers the player-facing part of the GameState interface (snake,
+    food, score, step() and so on, all about snake 0), so the curses
+    front end can run an arena like a normal game. The game is over when
+    the player's snake dies; bots that die respawn elsewhere at once.
+
+    Rules match GameState: every snake moves one cell per tick, and a
+    move into a wall, an obstacle or any snake's body as it was at the
+    start of the tick (tails included) kills the snake. Snakes whose
+    heads meet on the same cell all die.
+    """
+
+    def __init__(self, height, width, bots=1000, food=None, seed=None, track_changes=False):
+        """Initialize an arena with the given number of bots and pieces of food."""
+        self.height = height
+        self.width = width
+        self.bot_count = bots
+        self.food_count = food if food is not None else max(1, int(bots * FOOD_PER_BOT))
+        self.track_changes = track_changes
+        self.progression = False
+        self.offsets = (-width, width, -1, 1)
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        """Start a new arena game, with a fresh seed unless given."""
+        if seed is None:
+            seed = random.getrandbits(32)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.board = new_board(self.height, self.width, self.track_changes)
+
+        count = self.bot_count + 1
+        self.bodies = [None] * count
+        self.directions = bytearray(count)
+        self.last_directions = bytearray(count)
+        self.alive = bytearray(count)
+        self.growth = array('i', [0]) * count  # Segments still to grow
+        self.scores = array('i', [0]) * count
+        self.targets = array('i', [-1]) * count  # Food cell each bot heads for
+
+        self.food_cells = []
+        self.ticks = 0
+        self.level = 1
+        self.obstacles = []
+        self.game_over = False
+        self.won = False
+
+        # Statistics
+        self.deaths = 0
+        self.head_on_collisions = 0
+
+        # The player starts in the middle, heading right, as in a normal game
+        start_y = self.height // 2
+        start_x = self.width // 2
+        body = SnakeBody.from_positions(self.width, [[start_y, start_x - i] for i in range(INITIAL_SNAKE_LENGTH)])
+        for cell in body.indices():
+            self.board.set_at(cell, SNAKE)
+        self.bodies[PLAYER] = body
+        self.directions[PLAYER] = self.last_directions[PLAYER] = RIGHT
+        self.alive[PLAYER] = 1
+
+        for bot in range(1, count):
+            self.spawn_bot(bot)
+        while len(self.food_cells) < self.food_count and self.place_food():
+            pass
+
+    # Player-facing GameState interface
+
+    @property
+    def snake(self):
+        """The player's SnakeBody."""
+        return self.bodies[PLAYER]
+
+    @property
+    def direction(self):
+        """The player's direction for the coming tick."""
+        return self.directions[PLAYER]
+
+    @property
+    def last_direction(self):
+        """The direction the player's snake last moved in."""
+        return self.last_directions[PLAYER]
+
+    @property
+    def score(self):
+        """The player's score."""
+        return self.scores[PLAYER]
+
+    @property
+    def food_index(self):
+        """Cell index of one piece of food, or None if there is none."""
+        return self.food_cells[0] if self.food_cells else None
+
+    @property
+    def food(self):
+        """Position of one piece of food as [y, x], or None if there is none."""
+        if not self.food_cells:
+            return None
+        return list(divmod(self.food_cells[0], self.width))
+
+    def alive_count(self):
+        """Return the number of living snakes."""
+        return self.alive.count(1)
+
+    def tick_interval(self):
+        """Return the tick interval in milliseconds (arenas have no levels)."""
+        return REFRESH_RATE_MS
+
+    def calculate_level(self):
+        """Arenas have no levels. Returns False."""
+        return False
+
+    def set_direction(self, direction):
+        """Change the player's direction unless it reverses the last move. Returns True if accepted."""
+        if direction == OPPOSITE_DIRECTIONS[self.last_directions[PLAYER]]:
+            return False
+        self.directions[PLAYER] = direction
+        return True
+
+    def check_collision(self, head):
+        """Check if a [y, x] position is a wall, an obstacle or part of any snake."""
+        return self.board.is_blocked(head[0], head[1])
+
+    def generate_food(self):
+        """Return a random free position for food, or None if the board is full."""
+        cell = self.board.random_free_cell(self.rng)
+        return list(cell) if cell is not None else None
+
+    # Simulation
+
+    def spawn_bot(self, bot):
+        """Place a bot as a single segment on a random free cell; it grows to the starting length."""
+        cell = self.board.random_free_cell(self.rng)
+        if cell is None:
+            self.alive[bot] = 0
+            return
+        index = cell[0] * self.width + cell[1]
+        self.bodies[bot] = SnakeBody(self.width, [index], capacity=8)
+        self.board.set_at(index, SNAKE)
+        direction = self.rng.randrange(4)
+        self.directions[bot] = self.last_directions[bot] = direction
+        self.alive[bot] = 1
+        self.growth[bot] = INITIAL_SNAKE_LENGTH - 1
+        self.targets[bot] = -1
+
+    def place_food(self):
+        """Put a piece of food on a random free cell. Returns False if the board is full."""
+        cell = self.board.random_free_cell(self.rng)
+        if cell is None:
+            return False
+        index = cell[0] * self.width + cell[1]
+        self.board.set_at(index, FOOD)
+        self.food_cells.append(index)
+        return True
+
+    def steer_bot(self, bot, head):
+        """Pick a bot's direction: toward its food target, avoiding blocked cells."""
+        board = self.board
+        target = self.targets[bot]
+        if target < 0 or board.get_at(target) != FOOD:
+            target = self.targets[bot] = self.rng.choice(self.food_cells) if self.food_cells else -1
+
+        current = self.last_directions[bot]
+        if target >= 0:
+            width = self.width
+            head_y = head // width
+            target_y = target // width
+            dy = target_y - head_y
+            dx = (target - target_y * width) - (head - head_y * width)
+            vertical = DOWN if dy > 0 else UP
+            horizontal = RIGHT if dx > 0 else LEFT
+            if abs(dy) >= abs(dx):
+                toward = (vertical, horizontal) if dx else (vertical,)
+            else:
+                toward = (horizontal, vertical) if dy else (horizontal,)
+            choices = toward + FALLBACK_TURNS[current]
+        else:
+            choices = FALLBACK_TURNS[current]
+
+        reverse = OPPOSITE_DIRECTIONS[current]
+        offsets = self.offsets
+        for direction in choices:
+            if direction != reverse and not board.is_blocked_at(head + offsets[direction]):
+                return direction
+        return current
+
+    def step(self, action=None):
+        """Advance every snake by one tick and return the player's events (NO_EVENTS if none)."""
+        if self.game_over:
+            return [COLLISION]
+        if action is not None:
+            self.set_direction(action)
+
+        board = self.board
+        bodies = self.bodies
+        alive = self.alive
+        directions = self.directions
+        offsets = self.offsets
+
+        # Every move is judged against the board as it was at the start of the tick
+        moves = []
+        heads = {}
+        for snake in range(len(bodies)):
+            if not alive[snake]:
+                continue
+            head = bodies[snake].head
+            if snake != PLAYER:
+                directions[snake] = self.steer_bot(snake, head)
+            new_head = head + offsets[directions[snake]]
+            if board.is_blocked_at(new_head):
+                moves.append((snake, -1))
+                continue
+            if new_head in heads:
+                heads[new_head] += 1
+            else:
+                heads[new_head] = 1
+            moves.append((snake, new_head))
+
+        events = NO_EVENTS
+        dead = []
+        eaten = 0
+        for snake, new_head in moves:
+            if new_head < 0 or heads[new_head] > 1:
+                if new_head >= 0:
+                    self.head_on_collisions += 1
+                dead.append(snake)
+                continue
+
+            body = bodies[snake]
+            if board.get_at(new_head) == FOOD:
+                self.scores[snake] += FOOD_POINTS
+                self.growth[snake] += 1
+                self.food_cells.remove(new_head)
+                eaten += 1
+                if snake == PLAYER:
+                    events = [FOOD_EATEN]
+            body.push_head(new_head)
+            board.set_at(new_head, SNAKE)
+            if self.growth[snake]:
+                self.growth[snake] -= 1
+            else:
+                board.set_at(body.pop_tail(), EMPTY)
+            self.last_directions[snake] = directions[snake]
+
+        # Dead snakes leave the board; bots come back elsewhere
+        for snake in dead:
+            self.deaths += 1
+            alive[snake] = 0
+            for cell in bodies[snake].indices():
+                board.set_at(cell, EMPTY)
+            if snake == PLAYER:
+                self.game_over = True
+                events = [COLLISION]
+        for snake in dead:
+            if snake != PLAYER:
+                self.spawn_bot(snake)
+        for _ in range(eaten):
+            if not self.place_food():
+                break
+
+        self.ticks += 1
+        return events
@@ -0,0 +1,275 @@
+"""
+Autopilot Module
+Steers the snake toward the food with A* over a bitmap of blocked cells.
+
+The path found for a piece of food is kept and followed tick by tick.
+Nothing but new obstacles can block it while the snake walks it (the body
+only moves onto path cells in order and the tail only frees cells), so
+usually one search per piece of food is enough. When a path does break,
+only the part after the last still-free cell is searched again.
+
+A* gives up after a fixed number of expansions (food behind a long wall,
+or out of reach) and hands over to a breadth-first search, whose cost is
+bounded by the board size, so even on a 300 x 100 board one tick stays
+well inside the fastest (50 ms) tick interval.
+"""
+
+import time
+from array import array
+from heapq import heappush, heappop
+
+from .board import EMPTY, FOOD
+from .game_engine import UP, DOWN, LEFT, RIGHT, DIRECTION_DELTAS, OPPOSITE_DIRECTIONS
+
+# Ticks to wait before searching again for food that could not be reached
+RETRY_TICKS = 8
+
+# Cells counted at most when judging the space behind each move
+MAX_FLOOD_CELLS = 2000
+
+# A* expansions before switching to breadth-first search
+MAX_ASTAR_EXPANSIONS = 2000
+
+# Maps cell states to 1 (blocked) or 0 (the snake can move there)
+BLOCKED_TABLE = bytes(0 if state in (EMPTY, FOOD) else 1 for state in range(256))
+
+
+class Autopilot:
+    """Chooses a direction for each tick of a GameState."""
+
+    def __init__(self):
+        """Initialize an autopilot with no cached path."""
+        self.reset()
+
+        # Search time per tick, in seconds
+        self.ticks = 0
+        self.searches = 0
+        self.bfs_searches = 0
+        self.repairs = 0
+        self.failed_searches = 0
+        self.last_search_time = 0.0
+        self.max_search_time = 0.0
+        self.total_search_time = 0.0
+
+    def reset(self):
+        """Forget the cached path, e.g. for a new game."""
+        self.path = []  # Cell indices from the food back to the next cell
+        self.target = None
+        self.board = None
+        self.obstacle_count = 0
+        self.retry_tick = 0
+
+    def average_search_time(self):
+        """Return the mean time spent choosing a direction, in seconds."""
+        if not self.ticks:
+            return 0.0
+        return self.total_search_time / self.ticks
+
+    def next_direction(self, state):
+        """Return the direction to take on the coming tick."""
+        start = time.perf_counter()
+        direction = self.choose(state)
+        elapsed = time.perf_counter() - start
+
+        self.ticks += 1
+        self.last_search_time = elapsed
+        self.total_search_time += elapsed
+        if elapsed > self.max_search_time:
+            self.max_search_time = elapsed
+        return direction
+
+    def choose(self, state):
+        """Pick the next direction from the cached, repaired or a new path."""
+        board = state.board
+        width = board.width
+        head = state.snake.head
+        food = state.food_index
+
+        # A new game, new food or new obstacles invalidate the cached path
+        if board is not self.board or food != self.target:
+            self.board = board
+            self.target = food
+            self.path = []
+            self.retry_tick = state.ticks
+        elif len(state.obstacles) != self.obstacle_count:
+            self.repair_path(board, head)
+        self.obstacle_count = len(state.obstacles)
+
+        path = self.path
+        if path and not (abs(path[-1] - head) in (1, width) and is_passable(board.cells, path[-1])):
+            # The snake left the path (e.g. autopilot was just switched on)
+            path = self.path = []
+
+        if not path and food is not None and state.ticks >= self.retry_tick:
+            path = self.path = self.find_path(board, head, food)
+            if not path:
+                self.retry_tick = state.ticks + RETRY_TICKS
+
+        if path:
+            return direction_between(head, path.pop(), width)
+        return self.survival_direction(state, head)
+
+    def repair_path(self, board, head):
+        """Re-plan the cached path from the last free cell before the first blocked one."""
+        cells = board.cells
+        path = self.path
+        for i in range(len(path) - 1, -1, -1):
+            if not is_passable(cells, path[i]):
+                break
+        else:
+            return
+
+        # path[i + 1:] is the still-free stretch right after the head
+        self.repairs += 1
+        prefix = path[i + 1:]
+        start = prefix[0] if prefix else head
+        rest = self.find_path(board, start, self.target, avoid=set(prefix))
+        self.path = rest + prefix if rest else []
+
+    def find_path(self, board, start, goal, avoid=()):
+        """Find a shortest path from start to goal, not entering the avoid cells.
+
+        Returns the path as cell indices from goal back to the cell after
+        start (so pop() yields the next step), or an empty list.
+        """
+        self.searches += 1
+        blocked = board.cells.translate(BLOCKED_TABLE)
+        for cell in avoid:
+            blocked[cell] = 1
+
+        path = astar_path(blocked, board.width, start, goal, MAX_ASTAR_EXPANSIONS)
+        if path is None:
+            self.bfs_searches += 1
+            path = bfs_path(blocked, board.width, start, goal)
+        if not path:
+            self.failed_searches += 1
+        return path
+
+    def survival_direction(self, state, head):
+        """With no path to food, move toward the most open space."""
+        cells = state.board.cells
+        width = state.board.width
+        limit = min(MAX_FLOOD_CELLS, 2 * len(state.snake) + 1)
+        best_direction = state.direction
+        best_space = -1
+        for direction in (state.direction, UP, DOWN, LEFT, RIGHT):
+            if direction == OPPOSITE_DIRECTIONS[state.last_direction]:
+                continue
+            neighbor = head + direction_offset(direction, width)
+            if not is_passable(cells, neighbor):
+                continue
+            space = flood_count(cells, width, neighbor, limit)
+            if space > best_space:
+                best_direction = direction
+                best_space = space
+        return best_direction
+
+
+def is_passable(cells, index):
+    """Check if the snake can move into a cell (empty or food)."""
+    state = cells[index]
+    return state == EMPTY or state == FOOD
+
+
+def direction_offset(direction, width):
+    """Return the flat index offset of one step in a direction."""
+    dy, dx = DIRECTION_DELTAS[direction]
+    return dy * width + dx
+
+
+def direction_between(cell, neighbor, width):
+    """Return the direction of a step between two adjacent cells."""
+    delta = neighbor - cell
+    if delta == -width:
+        return UP
+    if delta == width:
+        return DOWN
+    return LEFT if delta == -1 else RIGHT
+
+
+def astar_path(blocked, width, start, goal, max_expansions):
+    """A* over a blocked-cell bitmap with the Manhattan distance as estimate.
+
+    Returns the path from goal back to the cell after start, an empty
+    list if goal cannot be reached, or None if max_expansions ran out.
+    """
+    goal_y, goal_x = divmod(goal, width)
+    offsets = (-width, width, -1, 1)
+
+    def estimate(cell):
+        y, x = divmod(cell, width)
+        return abs(y - goal_y) + abs(x - goal_x)
+
+    came_from = {start: -1}
+    cost = {start: 0}
+    # Ties go to the deepest node, which keeps the search on straight lines
+    heap = [(estimate(start), 0, start)]
+    expansions = 0
+    while heap:
+        _, neg_g, cell = heappop(heap)
+        if cell == goal:
+            path = []
+            while cell != start:
+                path.append(cell)
+                cell = came_from[cell]
+            return path
+        g = -neg_g
+        if g > cost[cell]:
+            continue
+        expansions += 1
+        if expansions > max_expansions:
+            return None
+        g += 1
+        for offset in offsets:
+            neighbor = cell + offset
+            if blocked[neighbor]:
+                continue
+            if g < cost.get(neighbor, g + 1):
+                cost[neighbor] = g
+                came_from[neighbor] = cell
+                heappush(heap, (g + estimate(neighbor), -g, neighbor))
+    return []
+
+
+def bfs_path(blocked, width, start, goal):
+    """Breadth-first search over a blocked-cell bitmap, which it marks as visited.
+
+    Returns the path from goal back to the cell after start, or an empty list.
+    """
+    parents = array('i', [-1]) * len(blocked)
+    offsets = (-width, width, -1, 1)
+    blocked[start] = 1
+    frontier = [start]
+    while frontier:
+        next_frontier = []
+        for cell in frontier:
+            for offset in offsets:
+                neighbor = cell + offset
+                if blocked[neighbor]:
+                    continue
+                blocked[neighbor] = 1
+                parents[neighbor] = cell
+                if neighbor == goal:
+                    path = []
+                    while neighbor != start:
+                        path.append(neighbor)
+                        neighbor = parents[neighbor]
+                    return path
+                next_frontier.append(neighbor)
+        frontier = next_frontier
+    return []
+
+
+def flood_count(cells, width, start, limit):
+    """Count passable cells reachable from start, stopping at limit."""
+    seen = {start}
+    stack = [start]
+    offsets = (-width, width, -1, 1)
+    while stack and len(seen) < limit:
+        cell = stack.pop()
+        for offset in offsets:
+            neighbor = cell + offset
+            if neighbor not in seen and is_passable(cells, neighbor):
+                seen.add(neighbor)
+                stack.append(neighbor)
+    return len(seen)
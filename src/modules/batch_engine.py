@@ -0,0 +1,226 @@
+"""
+Batch Engine Module
+Vectorized simulator that advances many boards in lockstep with NumPy.
+
+Requires NumPy, which is not needed to play the game.
+"""
+
+try:
+    import numpy as np
+except ImportError as e:  # pragma: no cover - depends on environment
+    raise ImportError("The batch engine requires NumPy: pip install numpy") from e
+
+from .board import EMPTY, SNAKE, OBSTACLE, FOOD, WALL
+from .game_config import (
+    INITIAL_SNAKE_LENGTH, FOOD_POINTS, POINTS_PER_LEVEL,
+    OBSTACLE_START_LEVEL, OBSTACLES_PER_LEVEL
+)
+from .game_engine import UP, DOWN, LEFT, RIGHT, OPPOSITE_DIRECTIONS
+
+# Event flags reported per board by BatchGameState.step()
+FOOD_EATEN_FLAG = 1
+LEVEL_UP_FLAG = 2
+COLLISION_FLAG = 4
+BOARD_FULL_FLAG = 8
+
+# Rejection-sampling rounds before falling back to an exact free-cell scan
+SPAWN_ROUNDS = 8
+
+
+class BatchGameState:
+    """N independent games on height x width boards, stepped together.
+
+    Follows the rules of GameState: wall, self and obstacle collisions end
+    a game, food is worth FOOD_POINTS, the level rises every
+    POINTS_PER_LEVEL points and obstacles appear from OBSTACLE_START_LEVEL.
+    Boards whose game ended are reset automatically at the end of step(),
+    with their final score and level kept in final_score and final_level.
+
+    Each board is a flat uint8 row of cell states (the same codes as
+    Board) and each snake is a ring buffer of flat cell indices.
+    """
+
+    def __init__(self, num_boards, height, width, seed=None):
+        """Initialize num_boards games on boards of the given dimensions."""
+        self.num_boards = num_boards
+        self.height = height
+        self.width = width
+        self.rng = np.random.default_rng(seed)
+
+        size = height * width
+        self.capacity = (height - 2) * (width - 2)
+        self.deltas = np.zeros(4, dtype=np.int64)
+        self.deltas[UP] = -width
+        self.deltas[DOWN] = width
+        self.deltas[LEFT] = -1
+        self.deltas[RIGHT] = 1
+        self.opposite = np.array([OPPOSITE_DIRECTIONS[d] for d in range(4)], dtype=np.int8)
+
+        # Template board: walls plus the starting snake
+        start_y = height // 2
+        start_x = width // 2
+        self.start_body = np.array(
+            [start_y * width + start_x - i for i in range(INITIAL_SNAKE_LENGTH - 1, -1, -1)],
+            dtype=np.int64
+        )
+        template = np.full((height, width), EMPTY, dtype=np.uint8)
+        template[0, :] = WALL
+        template[-1, :] = WALL
+        template[:, 0] = WALL
+        template[:, -1] = WALL
+        template = template.reshape(size)
+        template[self.start_body] = SNAKE
+        self.template = template
+
+        self.grid = np.empty((num_boards, size), dtype=np.uint8)
+        self.body = np.zeros((num_boards, self.capacity), dtype=np.int64)
+        self.head_ptr = np.zeros(num_boards, dtype=np.int64)
+        self.length = np.zeros(num_boards, dtype=np.int64)
+        self.direction = np.zeros(num_boards, dtype=np.int8)
+        self.last_direction = np.zeros(num_boards, dtype=np.int8)
+        self.food = np.zeros(num_boards, dtype=np.int64)
+        self.free = np.zeros(num_boards, dtype=np.int64)
+        self.score = np.zeros(num_boards, dtype=np.int64)
+        self.level = np.ones(num_boards, dtype=np.int64)
+        self.obstacle_count = np.zeros(num_boards, dtype=np.int64)
+        self.ticks = np.zeros(num_boards, dtype=np.int64)
+
+        # Results of games that ended during the last step
+        self.final_score = np.zeros(num_boards, dtype=np.int64)
+        self.final_level = np.zeros(num_boards, dtype=np.int64)
+        self.final_ticks = np.zeros(num_boards, dtype=np.int64)
+        self.games_finished = 0
+
+        self.reset_boards(np.arange(num_boards))
+
+    def grids(self):
+        """Return the boards as an (N, height, width) view of cell states."""
+        return self.grid.reshape(self.num_boards, self.height, self.width)
+
+    def heads(self):
+        """Return the flat cell index of every snake head."""
+        return self.body[np.arange(self.num_boards), self.head_ptr]
+
+    def reset_boards(self, boards):
+        """Reset the given boards to the start of a new game."""
+        if boards.size == 0:
+            return
+        length = INITIAL_SNAKE_LENGTH
+        self.grid[boards] = self.template
+        self.body[boards, :length] = self.start_body
+        self.head_ptr[boards] = length - 1
+        self.length[boards] = length
+        self.direction[boards] = RIGHT
+        self.last_direction[boards] = RIGHT
+        self.free[boards] = self.capacity - length
+        self.score[boards] = 0
+        self.level[boards] = 1
+        self.obstacle_count[boards] = 0
+        self.ticks[boards] = 0
+        self.spawn_food(boards)
+
+    def spawn_food(self, boards):
+        """Place food on a random free cell of each board. Returns boards with no free cell."""
+        full = boards[self.free[boards] == 0]
+        pending = boards[self.free[boards] > 0]
+        size = self.height * self.width
+
+        for _ in range(SPAWN_ROUNDS):
+            if pending.size == 0:
+                break
+            cells = self.rng.integers(0, size, size=pending.size)
+            hit = self.grid[pending, cells] == EMPTY
+            placed = pending[hit]
+            self.grid[placed, cells[hit]] = FOOD
+            self.food[placed] = cells[hit]
+            self.free[placed] -= 1
+            pending = pending[~hit]
+
+        # Nearly full boards: pick exactly among the remaining free cells
+        for board in pending:
+            empty = np.flatnonzero(self.grid[board] == EMPTY)
+            cell = empty[self.rng.integers(empty.size)]
+            self.grid[board, cell] = FOOD
+            self.food[board] = cell
+            self.free[board] -= 1
+
+        return full
+
+    def add_obstacles(self, board):
+        """Add obstacles to one board after a level up, away from the walls."""
+        level = self.level[board]
+        if level < OBSTACLE_START_LEVEL or \
+                self.obstacle_count[board] >= (level - OBSTACLE_START_LEVEL + 1) * OBSTACLES_PER_LEVEL:
+            return
+        max_attempts = 100
+        for _ in range(OBSTACLES_PER_LEVEL):
+            ys = self.rng.integers(2, self.height - 2, size=max_attempts)
+            xs = self.rng.integers(2, self.width - 2, size=max_attempts)
+            cells = ys * self.width + xs
+            hit = np.flatnonzero(self.grid[board, cells] == EMPTY)
+            if hit.size:
+                self.grid[board, cells[hit[0]]] = OBSTACLE
+                self.obstacle_count[board] += 1
+                self.free[board] -= 1
+
+    def step(self, actions=None):
+        """Advance every board by one tick and return an array of event flags.
+
+        actions, if given, holds one direction per board; negative entries
+        keep the current direction. Reversals of the last move are ignored.
+        """
+        boards = np.arange(self.num_boards)
+        if actions is not None:
+            actions = np.asarray(actions, dtype=np.int8)
+            turn = (actions >= 0) & (actions != self.opposite[self.last_direction])
+            self.direction = np.where(turn, actions, self.direction)
+
+        heads = self.body[boards, self.head_ptr]
+        new_heads = heads + self.deltas[self.direction]
+        target = self.grid[boards, new_heads]
+
+        dead = (target == SNAKE) | (target == OBSTACLE) | (target == WALL)
+        alive = ~dead
+        eat = alive & (target == FOOD)
+        events = np.where(dead, COLLISION_FLAG, 0).astype(np.uint8)
+
+        # Remove tails of snakes that move without eating
+        movers = np.flatnonzero(alive & ~eat)
+        tails = (self.head_ptr[movers] - self.length[movers] + 1) % self.capacity
+        self.grid[movers, self.body[movers, tails]] = EMPTY
+
+        # Add new heads
+        living = np.flatnonzero(alive)
+        self.head_ptr[living] = (self.head_ptr[living] + 1) % self.capacity
+        self.body[living, self.head_ptr[living]] = new_heads[living]
+        self.grid[living, new_heads[living]] = SNAKE
+        self.last_direction[living] = self.direction[living]
+        self.ticks[living] += 1
+
+        # Food, score and level progression
+        eaters = np.flatnonzero(eat)
+        full = np.zeros(self.num_boards, dtype=bool)
+        if eaters.size:
+            self.length[eaters] += 1
+            self.score[eaters] += FOOD_POINTS
+            events[eaters] |= FOOD_EATEN_FLAG
+            full[self.spawn_food(eaters)] = True
+
+            new_level = self.score[eaters] // POINTS_PER_LEVEL + 1
+            leveled = new_level > self.level[eaters]
+            for board, level in zip(eaters[leveled], new_level[leveled]):
+                self.level[board] = level
+                self.add_obstacles(board)
+                events[board] |= LEVEL_UP_FLAG
+            events[full] |= BOARD_FULL_FLAG
+
+        # Record and restart finished games
+        finished = np.flatnonzero(dead | full)
+        if finished.size:
+            self.final_score[finished] = self.score[finished]
+            self.final_level[finished] = self.level[finished]
+            self.final_ticks[finished] = self.ticks[finished]
+            self.games_finished += finished.size
+            self.reset_boards(finished)
+
+        return events
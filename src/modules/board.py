@@ -0,0 +1,127 @@
+"""
+Board Module
+Occupancy grid used for constant-time collision, food and obstacle checks,
+with a free-cell index for constant-time random spawning.
+"""
+
+import random
+from array import array
+
+# Cell states
+EMPTY = 0
+SNAKE = 1
+OBSTACLE = 2
+FOOD = 3
+WALL = 4
+
+
+class Board:
+    """Flat occupancy grid of the play area, indexed by y * width + x.
+
+    The outer ring of cells is the window border and is marked as WALL.
+    Every EMPTY cell is also kept in a swap-remove array, so a uniformly
+    random free cell can be picked without scanning the grid. With
+    track_changes enabled, the index of every cell whose state changes is
+    recorded so renderers can repaint only those cells.
+    """
+
+    def __init__(self, height, width, track_changes=False):
+        """Initialize an empty board of the given dimensions."""
+        self.height = height
+        self.width = width
+        self.track_changes = track_changes
+        self.clear()
+
+    def clear(self):
+        """Mark every interior cell as empty and the border as wall."""
+        height, width = self.height, self.width
+        size = height * width
+        self.cells = bytearray([WALL]) * size
+        self.free = array('i')
+        self.slots = array('i', [-1]) * size
+        self.dirty = []
+
+        # Filled a row at a time, so resetting or resizing a board stays cheap
+        if width > 2:
+            interior = bytes([WALL]) + bytes(width - 2) + bytes([WALL])
+            for y in range(1, height - 1):
+                start = y * width + 1
+                end = start + width - 2
+                self.cells[start - 1:end + 1] = interior
+                self.slots[start:end] = array('i', range(len(self.free), len(self.free) + width - 2))
+                self.free.extend(range(start, end))
+
+    def index(self, y, x):
+        """Return the flat cell index for a position."""
+        return y * self.width + x
+
+    def get(self, y, x):
+        """Return the state of the cell at a position."""
+        return self.cells[y * self.width + x]
+
+    def get_at(self, index):
+        """Return the state of the cell at a flat index."""
+        return self.cells[index]
+
+    def set(self, y, x, state):
+        """Set the state of the cell at a position, keeping the free index in sync."""
+        self.set_at(y * self.width + x, state)
+
+    def set_at(self, index, state):
+        """Set the state of the cell at a flat index, keeping the free index in sync."""
+        old_state = self.cells[index]
+        if old_state == state:
+            return
+        self.cells[index] = state
+        if self.track_changes:
+            self.dirty.append(index)
+
+        if old_state == EMPTY and state != EMPTY:
+            self._take(index)
+        elif old_state != EMPTY and state == EMPTY:
+            self._release(index)
+
+    def is_empty(self, y, x):
+        """Check if the cell at a position is free."""
+        return self.cells[y * self.width + x] == EMPTY
+
+    def is_blocked(self, y, x):
+        """Check if the cell at a position is occupied by the snake, an obstacle or the wall."""
+        state = self.cells[y * self.width + x]
+        return state == SNAKE or state == OBSTACLE or state == WALL
+
+    def is_blocked_at(self, index):
+        """Check if the cell at a flat index is occupied by the snake, an obstacle or the wall."""
+        state = self.cells[index]
+        return state == SNAKE or state == OBSTACLE or state == WALL
+
+    def free_count(self):
+        """Return the number of empty cells."""
+        return len(self.free)
+
+    def random_free_cell(self, rng=random):
+        """Return a uniformly random empty (y, x) cell, or None if the board is full."""
+        if not self.free:
+            return None
+        index = self.free[rng.randrange(len(self.free))]
+        return divmod(index, self.width)
+
+    def take_dirty(self):
+        """Return the indices of cells changed since the last call and reset the list."""
+        dirty = self.dirty
+        self.dirty = []
+        return dirty
+
+    def _take(self, index):
+        """Remove a cell from the free index by swapping in the last entry."""
+        slot = self.slots[index]
+        last = self.free.pop()
+        if last != index:
+            self.free[slot] = last
+            self.slots[last] = slot
+        self.slots[index] = -1
+
+    def _release(self, index):
+        """Add a cell back to the free index."""
+        self.slots[index] = len(self.free)
+        self.free.append(index)
@@ -0,0 +1,456 @@
+"""
+Frame Stream Module
+Broadcasts a live game to spectators as a compact stream of per-tick
+deltas, and rebuilds the game from such a stream.
+
+A stream is the magic bytes b'SNKS', a version byte and the board height
+and width as LEB128 varints, followed by records. Each record starts with
+a code byte holding the record type in its high five bits and a small
+argument in its low three:
+
+    TICK      the head moved one cell in direction (arg & 3); the tail
+              stays if arg & 4 (the snake grew), else it is removed
+    FOOD      varint food cell + 1 (0 when the board is full)
+    OBSTACLE  varint cell of a new obstacle
+    SCORE     varint score
+    LEVEL     varint level
+    OVER      the game ended; arg is 1 if it was won
+    KEYFRAME  the whole game: b'SNKF', then varints tick, score, level,
+              flags (game over | won << 1), head, length, food + 1,
+              obstacle count and obstacle cells, then the direction from
+              each segment to the next, packed four per byte
+
+A plain tick is a single byte. Keyframes are written when a game starts
+and every KEYFRAME_INTERVAL ticks, so a spectator joining late only has
+to find the latest one.
+"""
+
+import errno
+import socket
+
+from .board import EMPTY, SNAKE, OBSTACLE, FOOD
+from .game_config import REFRESH_RATE_MS, MIN_REFRESH_RATE_MS, LEVEL_SPEEDUP_MS
+from .game_engine import UP, DOWN, LEFT, RIGHT, new_board
+from .replay import encode_varint, decode_varint
+from .snake_body import SnakeBody
+
+MAGIC = b'SNKS'
+VERSION = 1
+
+# Record types
+TICK = 1
+FOOD_MOVED = 2
+OBSTACLE_ADDED = 3
+SCORE_CHANGED = 4
+LEVEL_CHANGED = 5
+GAME_OVER = 6
+KEYFRAME = 7
+
+# Marks the start of a keyframe, so late joiners can search for it
+KEYFRAME_SYNC = bytes([KEYFRAME << 3]) + b'SNKF'
+
+# Ticks between keyframes
+KEYFRAME_INTERVAL = 100
+
+# Bytes a spectator may fall behind before it is disconnected
+MAX_SPECTATOR_BACKLOG = 256 * 1024
+
+
+class IncompleteRecord(Exception):
+    """Raised when the rest of a record has not been received yet."""
+
+
+def read_varint(data, pos):
+    """Read a varint, raising IncompleteRecord if it is cut off."""
+    try:
+        return decode_varint(data, pos)
+    except ValueError:
+        raise IncompleteRecord from None
+
+
+def encode_header(height, width):
+    """Return the stream header for a board size."""
+    data = bytearray(MAGIC)
+    data.append(VERSION)
+    encode_varint(height, data)
+    encode_varint(width, data)
+    return bytes(data)
+
+
+class FrameEncoder:
+    """Turns successive GameState snapshots into delta records.
+
+    encode() is called once per step(); it compares the state with what
+    it last encoded and writes only the differences. A new game, or a
+    gap of more than one tick, starts with a keyframe instead.
+    """
+
+    def __init__(self, width, keyframe_interval=KEYFRAME_INTERVAL):
+        """Initialize an encoder for boards of the given width."""
+        self.width = width
+        self.keyframe_interval = keyframe_interval
+        self.directions = {-width: UP, width: DOWN, -1: LEFT, 1: RIGHT}
+        self.seed = None
+        self.tick = 0
+        self.keyframe_tick = 0
+        self.length = 0
+        self.food_index = None
+        self.obstacle_count = 0
+        self.score = 0
+        self.level = 0
+        self.game_over = False
+
+    def keyframe(self, state):
+        """Return a keyframe record for a state, without changing the encoder."""
+        snake = state.snake
+        data = bytearray(KEYFRAME_SYNC)
+        flags = int(state.game_over) | int(state.won) << 1
+        food = state.food_index + 1 if state.food_index is not None else 0
+        for value in (state.ticks, state.score, state.level, flags, snake.head, len(snake), food,
+                      len(state.obstacles)):
+            encode_varint(value, data)
+        for y, x in state.obstacles:
+            encode_varint(y * self.width + x, data)
+
+        directions = self.directions
+        packed = 0
+        shift = 0
+        previous = None
+        for cell in snake.indices():
+            if previous is not None:
+                packed |= directions[cell - previous] << shift
+                shift += 2
+                if shift == 8:
+                    data.append(packed)
+                    packed = shift = 0
+            previous = cell
+        if shift:
+            data.append(packed)
+        return bytes(data)
+
+    def encode(self, state):
+        """Return the records describing the state's changes since the last call."""
+        if (state.seed != self.seed or state.ticks < self.tick or state.ticks > self.tick + 1
+                or state.ticks - self.keyframe_tick >= self.keyframe_interval):
+            data = self.keyframe(state)
+            self.seed = state.seed
+            self.keyframe_tick = state.ticks
+        else:
+            data = bytearray()
+            if state.ticks != self.tick:
+                grew = len(state.snake) > self.length
+                data.append(TICK << 3 | grew << 2 | state.last_direction)
+            if state.food_index != self.food_index:
+                data.append(FOOD_MOVED << 3)
+                encode_varint(state.food_index + 1 if state.food_index is not None else 0, data)
+            for y, x in state.obstacles[self.obstacle_count:]:
+                data.append(OBSTACLE_ADDED << 3)
+                encode_varint(y * self.width + x, data)
+            if state.score != self.score:
+                data.append(SCORE_CHANGED << 3)
+                encode_varint(state.score, data)
+            if state.level != self.level:
+                data.append(LEVEL_CHANGED << 3)
+                encode_varint(state.level, data)
+            if state.game_over and not self.game_over:
+                data.append(GAME_OVER << 3 | int(state.won))
+            data = bytes(data)
+
+        self.tick = state.ticks
+        self.length = len(state.snake)
+        self.food_index = state.food_index
+        self.obstacle_count = len(state.obstacles)
+        self.score = state.score
+        self.level = state.level
+        self.game_over = state.game_over
+        return data
+
+
+class SpectatorState:
+    """A game rebuilt from a frame stream, shaped like GameState for rendering."""
+
+    def __init__(self, height, width):
+        """Initialize an empty game of the given dimensions."""
+        self.height = height
+        self.width = width
+        self.offsets = (-width, width, -1, 1)
+        # Sparse for large worlds, like the board of the game being watched
+        self.board = new_board(height, width, track_changes=True)
+        self.snake = SnakeBody(width)
+        self.food_index = None
+        self.obstacles = []
+        self.clear()
+
+    def clear(self):
+        """Empty the board cell by cell (far cheaper than a new board) and reset the counters."""
+        board = self.board
+        for cell in self.snake.indices():
+            board.set_at(cell, EMPTY)
+        for y, x in self.obstacles:
+            board.set(y, x, EMPTY)
+        if self.food_index is not None:
+            board.set_at(self.food_index, EMPTY)
+        self.snake = SnakeBody(self.width)
+        self.food_index = None
+        self.obstacles = []
+        self.ticks = 0
+        self.score = 0
+        self.level = 1
+        self.game_over = False
+        self.won = False
+
+    @property
+    def food(self):
+        """Food position as [y, x], or None once the board is full."""
+        if self.food_index is None:
+            return None
+        return list(divmod(self.food_index, self.width))
+
+    def tick_interval(self):
+        """Return the tick interval in milliseconds of the current level."""
+        return max(MIN_REFRESH_RATE_MS, REFRESH_RATE_MS - (self.level - 1) * LEVEL_SPEEDUP_MS)
+
+
+class FrameDecoder:
+    """Rebuilds a game from stream data fed in pieces of any size.
+
+    Records before the first keyframe are skipped, so a decoder can start
+    at any keyframe after the header.
+    """
+
+    def __init__(self):
+        """Initialize a decoder waiting for the stream header."""
+        self.buffer = bytearray()
+        self.pos = 0
+        self.height = None
+        self.width = None
+        self.state = None
+
+    def feed(self, data):
+        """Add received stream data."""
+        if self.pos:
+            del self.buffer[:self.pos]
+            self.pos = 0
+        self.buffer += data
+
+    def next_record(self):
+        """Apply the next complete record. Returns its type, or None if more data is needed."""
+        try:
+            if self.height is None:
+                return self.read_header()
+            record, pos = self.read_record(self.pos)
+        except (IncompleteRecord, IndexError):
+            return None
+        self.pos = pos
+        return record
+
+    def read_header(self):
+        """Read the stream header."""
+        data = self.buffer
+        if len(data) < len(MAGIC) + 1:
+            raise IncompleteRecord
+        if data[:4] != MAGIC:
+            raise ValueError("not a snake frame stream")
+        if data[4] != VERSION:
+            raise ValueError(f"unsupported frame stream version {data[4]}")
+        height, pos = read_varint(data, 5)
+        width, pos = read_varint(data, pos)
+        self.height = height
+        self.width = width
+        self.pos = pos
+        return None if pos >= len(data) else self.next_record()
+
+    def read_record(self, pos):
+        """Decode and apply the record at pos. Returns (record type, next position)."""
+        data = self.buffer
+        code = data[pos]
+        record = code >> 3
+        argument = code & 7
+        pos += 1
+        state = self.state
+
+        if record == KEYFRAME:
+            return record, self.read_keyframe(pos)
+        if record == TICK:
+            if state is not None:
+                board = state.board
+                head = state.snake.head + state.offsets[argument & 3]
+                state.snake.push_head(head)
+                board.set_at(head, SNAKE)
+                if not argument & 4:
+                    board.set_at(state.snake.pop_tail(), EMPTY)
+                state.ticks += 1
+        elif record == GAME_OVER:
+            if state is not None:
+                state.game_over = True
+                state.won = bool(argument)
+        elif record in (FOOD_MOVED, OBSTACLE_ADDED, SCORE_CHANGED, LEVEL_CHANGED):
+            value, pos = read_varint(data, pos)
+            if state is None:
+                pass
+            elif record == FOOD_MOVED:
+                if state.food_index is not None and state.board.get_at(state.food_index) == FOOD:
+                    state.board.set_at(state.food_index, EMPTY)
+                state.food_index = value - 1 if value else None
+                if value:
+                    state.board.set_at(value - 1, FOOD)
+            elif record == OBSTACLE_ADDED:
+                state.board.set_at(value, OBSTACLE)
+                state.obstacles.append(list(divmod(value, self.width)))
+            elif record == SCORE_CHANGED:
+                state.score = value
+            else:
+                state.level = value
+        else:
+            raise ValueError(f"unknown frame record {code:#x}")
+        return record, pos
+
+    def read_keyframe(self, pos):
+        """Rebuild the whole game from the keyframe at pos (after its code byte)."""
+        data = self.buffer
+        if len(data) < pos + 4:
+            raise IncompleteRecord
+        if data[pos:pos + 4] != KEYFRAME_SYNC[1:]:
+            raise ValueError("corrupt keyframe")
+        pos += 4
+        values = []
+        for _ in range(8):
+            value, pos = read_varint(data, pos)
+            values.append(value)
+        ticks, score, level, flags, head, length, food, obstacle_count = values
+        obstacles = []
+        for _ in range(obstacle_count):
+            value, pos = read_varint(data, pos)
+            obstacles.append(value)
+        packed_end = pos + (length + 2) // 4
+        if len(data) < packed_end:
+            raise IncompleteRecord
+
+        state = self.state or SpectatorState(self.height, self.width)
+        state.clear()
+        offsets = state.offsets
+        cells = [head]
+        cell = head
+        for i in range(length - 1):
+            cell += offsets[(data[pos + (i >> 2)] >> ((i & 3) << 1)) & 3]
+            cells.append(cell)
+        state.snake = SnakeBody(self.width, cells)
+        board = state.board
+        for cell in cells:
+            board.set_at(cell, SNAKE)
+        for cell in obstacles:
+            board.set_at(cell, OBSTACLE)
+            state.obstacles.append(list(divmod(cell, self.width)))
+        if food:
+            state.food_index = food - 1
+            board.set_at(food - 1, FOOD)
+        state.ticks = ticks
+        state.score = score
+        state.level = level
+        state.game_over = bool(flags & 1)
+        state.won = bool(flags & 2)
+        self.state = state
+        return packed_end
+
+
+def latest_keyframe(data, height, width):
+    """Return the position of the last complete keyframe in a stream's records, or None."""
+    end = len(data)
+    while True:
+        pos = data.rfind(KEYFRAME_SYNC, 0, end)
+        if pos < 0:
+            return None
+        # The sync bytes can also occur inside other records; check that a keyframe decodes here
+        decoder = FrameDecoder()
+        decoder.height = height
+        decoder.width = width
+        decoder.feed(data[pos:])
+        try:
+            decoder.read_record(0)
+            return pos
+        except (IncompleteRecord, IndexError, ValueError):
+            end = pos
+
+
+class FrameBroadcaster:
+    """Publishes a game's frame stream to a file and to spectators on a TCP port.
+
+    The game loop calls publish() after each step. Spectators are served
+    with non-blocking sockets from the game loop itself: each new one gets
+    the header and a keyframe, then the same deltas as everyone else.
+    """
+
+    def __init__(self, height, width, path=None, port=None, host='127.0.0.1',
+                 keyframe_interval=KEYFRAME_INTERVAL):
+        """Open the stream file and/or start listening for spectators."""
+        self.header = encode_header(height, width)
+        self.encoder = FrameEncoder(width, keyframe_interval)
+        self.file = None
+        self.listener = None
+        self.spectators = []  # (socket, bytearray of unsent data)
+        self.bytes_sent = 0
+        if path:
+            self.file = open(path, 'wb')
+            self.file.write(self.header)
+        if port is not None:
+            self.listener = socket.create_server((host, port))
+            self.listener.setblocking(False)
+
+    @property
+    def port(self):
+        """The TCP port spectators connect to, or None."""
+        return self.listener.getsockname()[1] if self.listener else None
+
+    def publish(self, state):
+        """Send the state's changes since the last call to the file and every spectator."""
+        data = self.encoder.encode(state)
+        self.bytes_sent += len(data)
+        if self.file:
+            self.file.write(data)
+            self.file.flush()
+        if self.listener:
+            for _, pending in self.spectators:
+                pending += data
+            self.accept(state)
+            self.flush()
+
+    def accept(self, state):
+        """Take any waiting spectators, starting each with a keyframe of the current game."""
+        while True:
+            try:
+                sock, _ = self.listener.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            sock.setblocking(False)
+            self.spectators.append((sock, bytearray(self.header + self.encoder.keyframe(state))))
+
+    def flush(self):
+        """Send as much pending data as each spectator takes, dropping any that fell too far behind."""
+        connected = []
+        for sock, pending in self.spectators:
+            try:
+                if pending:
+                    del pending[:sock.send(pending)]
+            except (BlockingIOError, InterruptedError):
+                pass
+            except OSError as e:
+                if e.errno not in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    sock.close()
+                    continue
+            if len(pending) > MAX_SPECTATOR_BACKLOG:
+                sock.close()
+                continue
+            connected.append((sock, pending))
+        self.spectators = connected
+
+    def close(self):
+        """Close the stream file and all spectator connections."""
+        if self.file:
+            self.file.close()
+            self.file = None
+        for sock, _ in self.spectators:
+            sock.close()
+        self.spectators = []
+        if self.listener:
+            self.listener.close()
+            self.listener = None
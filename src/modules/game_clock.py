@@ -0,0 +1,92 @@
+"""
+Game Clock Module
+Fixed-timestep scheduler that ticks the simulation on a monotonic clock.
+"""
+
+import math
+import time
+
+# Most ticks run back to back before the schedule is resynchronized
+MAX_CATCH_UP_TICKS = 10
+
+# Most frames skipped in a row before a render is forced
+MAX_FRAME_SKIP = 5
+
+# Weight of the newest sample in the render time average
+RENDER_TIME_SMOOTHING = 0.2
+
+
+class GameClock:
+    """Schedules simulation ticks at fixed absolute times.
+
+    Ticks are due at start + n * interval regardless of when input arrives
+    or how long rendering takes, so the snake moves at the level's speed
+    even under heavy typing. When the loop falls behind, the due ticks are
+    run back to back and render frames are dropped instead.
+    """
+
+    def __init__(self, interval_ms, time_source=time.monotonic):
+        """Initialize the clock with a tick interval in milliseconds."""
+        self.interval = interval_ms / 1000.0
+        self.time_source = time_source
+        self.render_time = 0.0
+        self.ticks = 0
+        self.ticks_skipped = 0
+        self.frames_rendered = 0
+        self.frames_dropped = 0
+        self.skipped_in_a_row = 0
+        self.reset()
+
+    def reset(self):
+        """Restart the schedule from now, e.g. after a blocking screen."""
+        self.next_tick = self.time_source() + self.interval
+
+    def set_interval(self, interval_ms):
+        """Change the tick interval, keeping the time already waited."""
+        interval = interval_ms / 1000.0
+        self.next_tick += interval - self.interval
+        self.interval = interval
+
+    def ms_until_tick(self):
+        """Return whole milliseconds until the next tick is due (0 if due)."""
+        remaining = self.next_tick - self.time_source()
+        if remaining <= 0:
+            return 0
+        return max(1, math.ceil(remaining * 1000))
+
+    def due_ticks(self):
+        """Return how many ticks are due now and advance the schedule past them."""
+        now = self.time_source()
+        if now < self.next_tick:
+            return 0
+
+        due = int((now - self.next_tick) / self.interval) + 1
+        if due > MAX_CATCH_UP_TICKS:
+            # Far behind (e.g. the process was suspended): resynchronize
+            self.ticks_skipped += due - MAX_CATCH_UP_TICKS
+            due = MAX_CATCH_UP_TICKS
+            self.next_tick = now + self.interval
+        else:
+            self.next_tick += due * self.interval
+
+        self.ticks += due
+        return due
+
+    def should_render(self):
+        """Check if there is time to render before the next tick is due.
+
+        A frame is dropped when the average render time would push past the
+        next tick, but never more than MAX_FRAME_SKIP frames in a row.
+        """
+        remaining = self.next_tick - self.time_source()
+        if remaining < self.render_time and self.skipped_in_a_row < MAX_FRAME_SKIP:
+            self.skipped_in_a_row += 1
+            self.frames_dropped += 1
+            return False
+        self.skipped_in_a_row = 0
+        return True
+
+    def record_render(self, duration):
+        """Record how long a render took, in seconds."""
+        self.frames_rendered += 1
+        self.render_time += (duration - self.render_time) * RENDER_TIME_SMOOTHING
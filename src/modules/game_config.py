@@ -7,18 +7,31 @@ import os
 
 # Game Settings
 REFRESH_RATE_MS = 100  # Game refresh rate in milliseconds
+MIN_REFRESH_RATE_MS = 50  # Fastest refresh rate reached at high levels
+LEVEL_SPEEDUP_MS = 10  # Refresh rate decrease per level
 INITIAL_SNAKE_LENGTH = 3  # Starting length of the snake
 FOOD_POINTS = 10  # Points awarded for eating food
+POINTS_PER_LEVEL = 50  # Score needed to advance one level
+OBSTACLE_START_LEVEL = 3  # First level with obstacles
+OBSTACLES_PER_LEVEL = 2  # Obstacles added on each level up
+CHUNKED_BOARD_CELLS = 250000  # Boards with more cells are stored sparsely in chunks
 
 # Display Characters
 SNAKE_HEAD_CHAR = 'O'
 SNAKE_BODY_CHAR = 'o'
 FOOD_CHAR = '*'
+OBSTACLE_CHAR = '#'
 
 # File Paths
-SCORE_FILE = os.path.expanduser("~/.snake_game_high_score.json")
+SCORE_FILE = os.path.expanduser("~/.snake_game_high_score.json")  # Legacy, migrated into LEADERBOARD_DB
+LEADERBOARD_FILE = os.path.expanduser("~/.snake_game_leaderboard.json")  # Legacy, migrated into LEADERBOARD_DB
+LEADERBOARD_DB = os.path.expanduser("~/.snake_game_scores.db")
+LEADERBOARD_SIZE = 10  # Entries shown on the leaderboard screen
+HAMILTONIAN_CACHE_DIR = os.path.expanduser("~/.cache/snake_game/cycles")
 
 # Game Window Settings
 WINDOW_MARGIN_TOP = 2
 WINDOW_MARGIN_BOTTOM = 5
 WINDOW_MARGIN_HORIZONTAL = 2
+MIN_SCREEN_HEIGHT = 15  # Smaller terminals pause the game until they are resized
+MIN_SCREEN_WIDTH = 40
@@ -0,0 +1,288 @@
+"""
+Game Engine Module
+Headless, curses-free snake rules shared by both front ends.
+"""
+
+import random
+
+from .board import Board, EMPTY, SNAKE, OBSTACLE, FOOD
+from .game_config import (
+    REFRESH_RATE_MS, MIN_REFRESH_RATE_MS, LEVEL_SPEEDUP_MS, INITIAL_SNAKE_LENGTH,
+    FOOD_POINTS, POINTS_PER_LEVEL, OBSTACLE_START_LEVEL, OBSTACLES_PER_LEVEL, CHUNKED_BOARD_CELLS
+)
+from .snake_body import SnakeBody
+from .world import ChunkedBoard
+
+# Directions
+UP = 0
+DOWN = 1
+LEFT = 2
+RIGHT = 3
+
+DIRECTION_DELTAS = {
+    UP: (-1, 0),
+    DOWN: (1, 0),
+    LEFT: (0, -1),
+    RIGHT: (0, 1)
+}
+
+OPPOSITE_DIRECTIONS = {
+    UP: DOWN,
+    DOWN: UP,
+    LEFT: RIGHT,
+    RIGHT: LEFT
+}
+
+# Events reported by GameState.step()
+FOOD_EATEN = 'food_eaten'
+LEVEL_UP = 'level_up'
+COLLISION = 'collision'
+BOARD_FULL = 'board_full'
+
+# Returned by GameState.step() for the common tick without events, so it allocates nothing
+NO_EVENTS = ()
+
+
+def direction_offsets(width):
+    """Return the cell index offset of one step in each direction on a board of the given width."""
+    return tuple(dy * width + dx for dy, dx in (DIRECTION_DELTAS[d] for d in (UP, DOWN, LEFT, RIGHT)))
+
+
+def new_board(height, width, track_changes=False):
+    """Return an empty board, chunked if larger than CHUNKED_BOARD_CELLS."""
+    board_class = ChunkedBoard if height * width > CHUNKED_BOARD_CELLS else Board
+    return board_class(height, width, track_changes=track_changes)
+
+
+class GameState:
+    """Owns the snake, food, obstacles, score, level and RNG of one game.
+
+    The play area is height x width including the one-cell border, matching
+    the curses game window unless a larger world is shown through a
+    camera. Areas above CHUNKED_BOARD_CELLS use a sparse ChunkedBoard, so
+    a game starts and ticks in the same time on any world size. Call
+    step() once per tick; it returns the list of events that happened
+    during that tick.
+
+    The snake is a SnakeBody of packed cell indices and the food is kept as
+    food_index; step() works on cell indices only.
+    """
+
+    def __init__(self, height, width, seed=None, progression=True, track_changes=False):
+        """Initialize a game on a board of the given dimensions.
+
+        With progression disabled the level, speed and obstacles never
+        change, matching the modular version's rules.
+        """
+        self.height = height
+        self.width = width
+        self.progression = progression
+        self.track_changes = track_changes
+        self.reset(seed)
+
+    def reset(self, seed=None, size=None):
+        """Reset game state for a new game.
+
+        Without a seed a fresh one is drawn, so every game can be replayed
+        from self.seed. With size, a (height, width) pair, the new game is
+        played on an area of that size.
+        """
+        if size is not None:
+            self.height, self.width = size
+        self.offsets = direction_offsets(self.width)
+
+        if seed is None:
+            seed = random.getrandbits(32)
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+        # Snake starts in the middle, heading right
+        start_y = self.height // 2
+        start_x = self.width // 2
+        self.snake = SnakeBody.from_positions(
+            self.width, ([start_y, start_x - i] for i in range(INITIAL_SNAKE_LENGTH)))
+        self.direction = RIGHT
+        self.last_direction = RIGHT
+
+        # Occupancy grid mirrors the snake, food and obstacles
+        self.board = new_board(self.height, self.width, self.track_changes)
+        for cell in self.snake.indices():
+            self.board.set_at(cell, SNAKE)
+
+        self.score = 0
+        self.level = 1
+        self.ticks = 0
+        self.obstacles = []
+        self.game_over = False
+        self.won = False
+
+        # Generate first food
+        self.food = self.generate_food()
+        self.board.set(self.food[0], self.food[1], FOOD)
+
+    def resize(self, height, width):
+        """Change the play area to height x width without ending the game.
+
+        The area never shrinks past the snake, which keeps its cells. Obstacles
+        outside the new area (or next to its border) are dropped and food
+        outside it is placed again. Returns True if the size changed.
+        """
+        positions = [divmod(cell, self.width) for cell in self.snake.indices()]
+        height = max(height, max(y for y, _ in positions) + 2)
+        width = max(width, max(x for _, x in positions) + 2)
+        if (height, width) == (self.height, self.width):
+            return False
+        food = self.food
+
+        self.height = height
+        self.width = width
+        self.offsets = direction_offsets(width)
+        self.snake = SnakeBody(width, [y * width + x for y, x in positions], self.snake.capacity)
+        self.board = new_board(height, width, self.track_changes)
+        for cell in self.snake.indices():
+            self.board.set_at(cell, SNAKE)
+
+        # Obstacles keep the same distance from the walls as generate_obstacle()
+        self.obstacles = [[y, x] for y, x in self.obstacles
+                          if 2 <= y <= height - 3 and 2 <= x <= width - 3 and self.board.is_empty(y, x)]
+        for y, x in self.obstacles:
+            self.board.set(y, x, OBSTACLE)
+
+        if food is None or not (0 < food[0] < height - 1 and 0 < food[1] < width - 1) \
+                or not self.board.is_empty(food[0], food[1]):
+            food = self.generate_food()
+        self.food = food
+        if food is not None:
+            self.board.set(food[0], food[1], FOOD)
+        return True
+
+    @property
+    def food(self):
+        """Food position as [y, x], or None once the board is full."""
+        if self.food_index is None:
+            return None
+        return list(divmod(self.food_index, self.width))
+
+    @food.setter
+    def food(self, position):
+        """Move the food marker (the board is not updated)."""
+        self.food_index = None if position is None else position[0] * self.width + position[1]
+
+    def tick_interval(self):
+        """Return the tick interval in milliseconds for the current level."""
+        return max(MIN_REFRESH_RATE_MS, REFRESH_RATE_MS - (self.level - 1) * LEVEL_SPEEDUP_MS)
+
+    def set_direction(self, direction):
+        """Change direction unless it reverses the last move. Returns True if accepted."""
+        if direction == OPPOSITE_DIRECTIONS[self.last_direction]:
+            return False
+        self.direction = direction
+        return True
+
+    def calculate_level(self):
+        """Calculate current level based on score. Returns True on level up."""
+        if not self.progression:
+            return False
+        new_level = (self.score // POINTS_PER_LEVEL) + 1
+        if new_level > self.level:
+            self.level = new_level
+            self.add_obstacles()
+            return True
+        return False
+
+    def add_obstacles(self):
+        """Add obstacles as level increases."""
+        # Add obstacles starting from level 3
+        if self.level >= OBSTACLE_START_LEVEL and \
+                len(self.obstacles) < (self.level - OBSTACLE_START_LEVEL + 1) * OBSTACLES_PER_LEVEL:
+            for _ in range(OBSTACLES_PER_LEVEL):
+                obstacle = self.generate_obstacle()
+                if obstacle:
+                    self.obstacles.append(obstacle)
+                    self.board.set(obstacle[0], obstacle[1], OBSTACLE)
+
+    def generate_obstacle(self):
+        """Generate an obstacle at a random free position away from the walls."""
+        max_attempts = 100
+        for _ in range(max_attempts):
+            cell = self.board.random_free_cell(self.rng)
+            if cell is None:
+                return None
+
+            # Keep obstacles off the cells next to the border
+            obs_y, obs_x = cell
+            if 2 <= obs_y <= self.height - 3 and 2 <= obs_x <= self.width - 3:
+                return [obs_y, obs_x]
+        return None
+
+    def generate_food(self):
+        """Generate food at a random free position, or None if the board is full."""
+        cell = self.board.random_free_cell(self.rng)
+        if cell is None:
+            return None
+        return list(cell)
+
+    def move_snake(self):
+        """Return the next head position in the current direction."""
+        return list(divmod(self.snake.head + self.offsets[self.direction], self.width))
+
+    def check_collision(self, head):
+        """Check if snake collided with wall, itself, or obstacles."""
+        y, x = head
+
+        # Check wall collision
+        if y <= 0 or y >= self.height - 1 or x <= 0 or x >= self.width - 1:
+            return True
+
+        # Check self and obstacle collision
+        return self.board.is_blocked(y, x)
+
+    def step(self, action=None):
+        """Advance the game by one tick and return the events (NO_EVENTS if none).
+
+        action, if given, is a direction applied with set_direction() first.
+        """
+        if self.game_over:
+            return [COLLISION]
+
+        if action is not None:
+            self.set_direction(action)
+
+        # The border is wall on the board, so one cell lookup covers every collision
+        new_head = self.snake.head + self.offsets[self.direction]
+        board = self.board
+        if board.is_blocked_at(new_head):
+            self.game_over = True
+            return [COLLISION]
+
+        # Add new head
+        self.snake.push_head(new_head)
+        board.set_at(new_head, SNAKE)
+        events = NO_EVENTS
+
+        # Check if food eaten
+        if new_head == self.food_index:
+            self.score += FOOD_POINTS
+            events = [FOOD_EATEN]
+            food = self.generate_food()
+            self.food = food
+            if food is not None:
+                board.set(food[0], food[1], FOOD)
+            # Calculate level progression
+            if self.calculate_level():
+                events.append(LEVEL_UP)
+            # Board full: the snake fills every free cell
+            if food is None:
+                self.won = True
+                self.game_over = True
+                events.append(BOARD_FULL)
+            # Snake grows (don't remove tail)
+        else:
+            # Remove tail (snake moves)
+            board.set_at(self.snake.pop_tail(), EMPTY)
+
+        # Update last direction
+        self.last_direction = self.direction
+        self.ticks += 1
+
+        return events
@@ -4,69 +4,230 @@ Handles all drawing and display operations.
 """
 
 import curses
-from .game_config import SNAKE_HEAD_CHAR, SNAKE_BODY_CHAR, FOOD_CHAR
+from .game_config import SNAKE_HEAD_CHAR, SNAKE_BODY_CHAR, FOOD_CHAR, OBSTACLE_CHAR
+from .board import SNAKE, OBSTACLE, FOOD
+from .world import Camera
 
 
 class GameRenderer:
-    """Handles rendering of game elements."""
+    """Handles rendering of game elements.
 
-    def __init__(self, stdscr, window, game_height, game_width):
+    In incremental mode only the cells recorded as dirty by the board, the
+    previous head and the HUD fields whose text changed are repainted each
+    frame. A full redraw happens on the first frame and after invalidate().
+
+    A board larger than the game window is shown through a Camera that
+    follows the snake's head; moving it forces a full redraw.
+
+    The title and instructions are placed once per layout(). The HUD text
+    is only formatted when score, high score, level or pause changed;
+    hud_hits and hud_misses count the frames that reused or rebuilt it,
+    and hud_writes the fields actually drawn.
+    """
+
+    def __init__(self, stdscr, window, game_height, game_width, incremental=True):
         """Initialize renderer with screen and window references."""
         self.stdscr = stdscr
         self.window = window
         self.game_height = game_height
         self.game_width = game_width
         self.height, self.width = stdscr.getmaxyx()
-
-    def draw_border(self, score, high_score, paused):
+        self.incremental = incremental
+        # Maps board positions inside the border to window positions
+        self.camera = Camera(game_height - 2, game_width - 2)
+        self.instructions = "Arrow Keys: Move | P: Pause | R: Restart | Q: Quit"
+        self.game_over_hint = "Press R to restart or Q to quit"
+
+        # Incremental rendering state
+        self.full_redraw = True
+        self.drawn_head = None
+        self.hud_text = {}
+        self.hud_key = None
+        self.layout()
+
+        # HUD cache statistics
+        self.hud_hits = 0
+        self.hud_misses = 0
+        self.hud_writes = 0
+
+    def layout(self):
+        """Place the title, instructions and pause indicator for the screen width.
+
+        Call again after changing instructions or the screen size.
+        """
+        # Text wider than the screen is cut off instead of starting off screen
+        self.static_text = [
+            (y, max(0, self.width // 2 - len(text) // 2), text[:self.width], attr)
+            for y, text, attr in ((0, " SNAKE GAME ", curses.A_BOLD), (1, self.instructions, curses.A_NORMAL))
+        ]
+        self.pause_x = self.width // 2 - len("*** PAUSED ***") // 2
+        self.invalidate()
+
+    def resize(self, game_height, game_width):
+        """Resize the game window after the terminal was resized, and lay the screen out again."""
+        self.height, self.width = self.stdscr.getmaxyx()
+        self.game_height = game_height
+        self.game_width = game_width
+        self.window.resize(game_height, game_width)
+        self.window.mvwin(2, 1)
+        self.camera = Camera(game_height - 2, game_width - 2)
+        self.layout()
+
+    def draw_message(self, text):
+        """Clear the screen and show one line of text in place of the game."""
+        self.stdscr.erase()
+        self.stdscr.addstr(0, 0, text[:self.stdscr.getmaxyx()[1] - 1])
+        self.stdscr.refresh()
+        self.invalidate()
+
+    def invalidate(self):
+        """Force a full redraw on the next frame (restart, resize, skin change)."""
+        self.full_redraw = True
+
+    def draw_frame(self, board, snake, food, score, high_score, paused, obstacles=(), level=None):
+        """Draw one frame, repainting only what changed when possible.
+
+        The level is shown next to the score unless it is None.
+        """
+        # Scrolling the view repaints it, so it jumps a quarter view at a time
+        head_y, head_x = divmod(snake.head, board.width)
+        if self.camera.follow(head_y, head_x, board.height, board.width):
+            self.invalidate()
+
+        if self.full_redraw or not self.incremental:
+            self.stdscr.clear()
+            self.window.clear()
+            self.hud_text = {}
+            self.hud_key = None
+            self.draw_border(score, high_score, paused, level)
+            self.draw_snake(snake)
+            self.draw_food(food)
+            self.draw_obstacles(obstacles)
+            board.take_dirty()
+            self.full_redraw = False
+        else:
+            self.draw_hud(score, high_score, paused, level)
+            self.draw_changes(board, snake.head)
+        self.drawn_head = snake.head
+        self.update()
+
+    def update(self):
+        """Send the frame to the terminal, batching both windows into a single update."""
+        self.stdscr.noutrefresh()
+        self.window.noutrefresh()
+        curses.doupdate()
+
+    def draw_border(self, score, high_score, paused, level=None):
         """Draw game border, title, and score."""
-        # Title
-        title = " SNAKE GAME "
-        self.stdscr.addstr(0, self.width // 2 - len(title) // 2, title, curses.A_BOLD)
+        # Title and instructions
+        for y, x, text, attr in self.static_text:
+            self.stdscr.addstr(y, x, text, attr)
+
+        # Score, high score and pause indicator
+        self.draw_hud(score, high_score, paused, level)
+
+        # Draw border
+        self.window.border()
 
-        # Instructions
-        instructions = "Arrow Keys: Move | P: Pause | R: Restart | Q: Quit"
-        self.stdscr.addstr(1, self.width // 2 - len(instructions) // 2, instructions)
+    def draw_hud(self, score, high_score, paused, level=None):
+        """Draw the score line and pause indicator, skipping unchanged text."""
+        key = (score, high_score, level, paused)
+        if key == self.hud_key:
+            self.hud_hits += 1
+            return
+        self.hud_key = key
+        self.hud_misses += 1
 
-        # Score
         score_text = f"Score: {score}"
-        self.stdscr.addstr(self.height - 2, 2, score_text)
+        if level is not None:
+            score_text += f" | Level: {level}"
+        self.draw_hud_text('score', self.height - 2, 2, score_text)
 
         high_score_text = f"High Score: {high_score}"
-        self.stdscr.addstr(self.height - 2, self.width - len(high_score_text) - 2, high_score_text)
+        self.draw_hud_text('high_score', self.height - 2, self.width - len(high_score_text) - 2, high_score_text)
+
+        pause_text = "*** PAUSED ***" if paused else ""
+        self.draw_hud_text('pause', self.height - 1, self.pause_x, pause_text, curses.A_BOLD)
+
+    def draw_hud_text(self, key, y, x, text, attr=curses.A_NORMAL):
+        """Draw a HUD field if its text or position changed, erasing the old text."""
+        previous = self.hud_text.get(key)
+        if previous == (y, x, text):
+            return
+        if previous is not None and previous[2]:
+            old_y, old_x, old_text = previous
+            self.stdscr.addstr(old_y, old_x, " " * len(old_text))
+        if text:
+            self.stdscr.addstr(y, x, text, attr)
+        self.hud_text[key] = (y, x, text)
+        self.hud_writes += 1
+
+    def draw_changes(self, board, head):
+        """Repaint the visible cells changed since the last frame and move the head marker to cell head."""
+        width = board.width
+        get_at = board.get_at
+        top, left = self.camera.top - 1, self.camera.left - 1
+        view_height, view_width = self.camera.height, self.camera.width
+        for index in board.take_dirty():
+            y, x = divmod(index, width)
+            # Window position; changes outside the view are dropped
+            win_y, win_x = y - top, x - left
+            if not (0 < win_y <= view_height and 0 < win_x <= view_width):
+                continue
+            state = get_at(index)
+            if state == SNAKE:
+                self.window.addch(win_y, win_x, SNAKE_BODY_CHAR)
+            elif state == FOOD:
+                self.window.addch(win_y, win_x, FOOD_CHAR, curses.A_BOLD)
+            elif state == OBSTACLE:
+                self.window.addch(win_y, win_x, OBSTACLE_CHAR, curses.A_BOLD)
+            else:
+                self.window.addch(win_y, win_x, ' ')
 
-        # Pause indicator
-        if paused:
-            pause_text = "*** PAUSED ***"
-            self.stdscr.addstr(self.height - 1, self.width // 2 - len(pause_text) // 2, pause_text, curses.A_BOLD)
+        # Demote the previous head to a body segment
+        if self.drawn_head is not None and self.drawn_head != head and get_at(self.drawn_head) == SNAKE:
+            old_y, old_x = divmod(self.drawn_head, width)
+            self.draw_cell(old_y, old_x, SNAKE_BODY_CHAR)
 
-        # Draw border
-        self.window.border()
+        head_y, head_x = divmod(head, width)
+        self.draw_cell(head_y, head_x, SNAKE_HEAD_CHAR, curses.A_BOLD)
+
+    def draw_cell(self, y, x, char, attr=curses.A_NORMAL):
+        """Draw a character at a board position if it is in view."""
+        if self.camera.is_visible(y, x):
+            self.window.addch(y - self.camera.top + 1, x - self.camera.left + 1, char, attr)
 
     def draw_snake(self, snake):
         """Draw the snake on the screen."""
-        for i, segment in enumerate(snake):
-            y, x = segment
+        for i, cell in enumerate(snake.indices()):
+            y, x = divmod(cell, snake.width)
             if i == 0:
                 # Head of snake
-                self.window.addch(y, x, SNAKE_HEAD_CHAR, curses.A_BOLD)
+                self.draw_cell(y, x, SNAKE_HEAD_CHAR, curses.A_BOLD)
             else:
                 # Body of snake
-                self.window.addch(y, x, SNAKE_BODY_CHAR)
+                self.draw_cell(y, x, SNAKE_BODY_CHAR)
 
     def draw_food(self, food):
-        """Draw food on the screen."""
+        """Draw food on the screen (there is none once the board is full)."""
+        if food is None:
+            return
         y, x = food
-        self.window.addch(y, x, FOOD_CHAR, curses.A_BOLD)
+        self.draw_cell(y, x, FOOD_CHAR, curses.A_BOLD)
 
-    def draw_game_over(self, score):
-        """Display game over screen."""
+    def draw_obstacles(self, obstacles):
+        """Draw obstacles on the screen."""
+        for y, x in obstacles:
+            self.draw_cell(y, x, OBSTACLE_CHAR, curses.A_BOLD)
+
+    def draw_game_over(self, score, won=False):
+        """Display game over screen, or the win screen if the board was filled."""
         self.window.clear()
         self.window.border()
 
-        game_over_text = "GAME OVER!"
+        game_over_text = "YOU WIN!" if won else "GAME OVER!"
         final_score_text = f"Final Score: {score}"
-        restart_text = "Press R to restart or Q to quit"
+        restart_text = self.game_over_hint
 
         mid_y = self.game_height // 2
         mid_x = self.game_width // 2
@@ -76,3 +237,6 @@ class GameRenderer:
         self.window.addstr(mid_y + 2, mid_x - len(restart_text) // 2, restart_text)
 
         self.window.refresh()
+
+        # The game over text covers the board, so the next frame starts over
+        self.invalidate()
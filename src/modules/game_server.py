@@ -0,0 +1,330 @@
+"""
+Game Server Module
+Hosts many game sessions in one asyncio process for thin terminal clients
+connected over a Unix socket or TCP loopback.
+
+Each session runs the headless GameState rules with its own input queue.
+Instead of one sleeping task or call_later() handle per session, all
+ticks are scheduled on a single hashed timer wheel driven by one task,
+so 1000 sessions cost one timer wake-up per wheel slot.
+
+Protocol: newline-delimited JSON. The server sends a hello, then a frame
+after every tick with the cells changed since the previous frame (or all
+occupied cells when full is set), and an over message when the game
+ends. Clients send one command per line: up, down, left, right, pause,
+restart or quit.
+
+Usage:
+    python -m src.modules.game_server --unix /tmp/snake.sock
+    python -m src.modules.game_server --port 7777
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+
+from .game_engine import GameState, UP, DOWN, LEFT, RIGHT
+from .input_queue import InputQueue
+
+# Timer wheel resolution: ticks fire within one slot of their due time
+TIMER_SLOT_MS = 5
+TIMER_SLOTS = 256
+
+# Bytes queued for a client before frames are skipped (the next one is full);
+# hello and over messages are always queued
+MAX_WRITE_BUFFER = 64 * 1024
+
+# Play area of each session (including the border), a standard 80x24 terminal
+DEFAULT_HEIGHT = 19
+DEFAULT_WIDTH = 78
+
+COMMAND_DIRECTIONS = {
+    'up': UP,
+    'down': DOWN,
+    'left': LEFT,
+    'right': RIGHT
+}
+
+
+def encode_message(message):
+    """Encode a protocol message as one line of compact JSON."""
+    return json.dumps(message, separators=(',', ':')).encode() + b'\n'
+
+
+class TimerWheel:
+    """Hashed timer wheel for items due after a delay.
+
+    Time is cut into slots of slot_ms milliseconds on a ring of slots
+    entries. An item due in d slots goes into the entry d ahead of the
+    cursor, with the number of full turns of the ring it must wait, so
+    scheduling and expiring are both constant time per item.
+    """
+
+    def __init__(self, slot_ms=TIMER_SLOT_MS, slots=TIMER_SLOTS, clock=time.monotonic):
+        """Initialize an empty wheel starting now."""
+        self.slot = slot_ms / 1000
+        self.ring = [[] for _ in range(slots)]
+        self.clock = clock
+        self.cursor = 0
+        self.origin = clock()
+        self.steps = 0  # Slots advanced since origin
+        self.count = 0
+
+    def schedule(self, item, delay):
+        """Add an item due after delay seconds (at least one slot from now)."""
+        steps = max(1, math.ceil(delay / self.slot - 1e-9))
+        size = len(self.ring)
+        self.ring[(self.cursor + steps) % size].append(((steps - 1) // size, item))
+        self.count += 1
+
+    def advance(self):
+        """Move to the next slot and return the items due in it."""
+        self.cursor = (self.cursor + 1) % len(self.ring)
+        self.steps += 1
+        entry = self.ring[self.cursor]
+        if not entry:
+            return []
+        due = []
+        waiting = []
+        for rounds, item in entry:
+            if rounds:
+                waiting.append((rounds - 1, item))
+            else:
+                due.append(item)
+        self.ring[self.cursor] = waiting
+        self.count -= len(due)
+        return due
+
+    def next_deadline(self):
+        """Return the clock time at which the next slot is due."""
+        return self.origin + (self.steps + 1) * self.slot
+
+
+class Session:
+    """One player's game, driven by the server's timer wheel.
+
+    send is called with each encoded message, and with frame=True for
+    frames. It may refuse a frame when the client is behind, returning
+    False, in which case the next frame is sent in full; every other
+    message must be queued.
+    """
+
+    def __init__(self, session_id, height, width, send, seed=None):
+        """Start a new game for a client."""
+        self.id = session_id
+        self.send = send
+        self.state = GameState(height, width, seed=seed, track_changes=True)
+        self.input_queue = InputQueue()
+        self.paused = False
+        self.scheduled = False
+        self.closed = False
+        self.needs_full_frame = True
+        self.frames_dropped = 0
+
+    def hello(self):
+        """Send the board size, then the first frame."""
+        self.send(encode_message({'t': 'hello', 'session': self.id,
+                                  'height': self.state.height, 'width': self.state.width}))
+        self.send_frame()
+
+    def command(self, command):
+        """Apply a client command. Returns False if the client quit."""
+        if command == 'quit':
+            return False
+        if command == 'pause':
+            self.paused = not self.paused
+        elif command == 'restart':
+            self.state.reset()
+            self.input_queue.clear()
+            self.paused = False
+            self.needs_full_frame = True
+            self.send_frame()
+        elif command in COMMAND_DIRECTIONS and not self.paused:
+            self.input_queue.push(COMMAND_DIRECTIONS[command], self.state.direction)
+        return True
+
+    def is_running(self):
+        """Check if the game should keep ticking."""
+        return not (self.closed or self.paused or self.state.game_over)
+
+    def tick(self):
+        """Advance the game by one tick and send the frame."""
+        self.state.step(self.input_queue.pop())
+        self.send_frame()
+        if self.state.game_over:
+            self.send(encode_message({'t': 'over', 'score': self.state.score, 'won': self.state.won}))
+
+    def send_frame(self):
+        """Send the cells changed since the last frame, or all occupied cells if needed."""
+        state = self.state
+        board = state.board
+        dirty = board.take_dirty()
+        full = self.needs_full_frame
+        if full:
+            cells = []
+            for cell in state.snake.indices():
+                cells += (cell, board.get_at(cell))
+            for y, x in state.obstacles:
+                cells += (y * state.width + x, board.get(y, x))
+            if state.food_index is not None:
+                cells += (state.food_index, board.get_at(state.food_index))
+        else:
+            cells = []
+            for cell in dirty:
+                cells += (cell, board.get_at(cell))
+
+        message = encode_message({'t': 'frame', 'tick': state.ticks, 'score': state.score,
+                                  'level': state.level, 'head': state.snake.head, 'full': full,
+                                  'cells': cells})
+        if self.send(message, frame=True):
+            self.needs_full_frame = False
+        else:
+            self.frames_dropped += 1
+            self.needs_full_frame = True
+
+
+class GameServer:
+    """Accepts clients and ticks every session from one timer wheel."""
+
+    def __init__(self, height=DEFAULT_HEIGHT, width=DEFAULT_WIDTH, slot_ms=TIMER_SLOT_MS):
+        """Initialize a server whose sessions play on height x width boards."""
+        self.height = height
+        self.width = width
+        self.wheel = TimerWheel(slot_ms)
+        self.sessions = {}
+        self.next_id = 1
+        self.driver = None
+
+        # Statistics
+        self.ticks = 0
+        self.max_lag = 0.0  # Worst lateness of a wheel slot, in seconds
+
+    def add_session(self, send, seed=None):
+        """Create a session sending its messages through send, and start its ticks."""
+        session = Session(self.next_id, self.height, self.width, send, seed)
+        self.next_id += 1
+        self.sessions[session.id] = session
+        session.hello()
+        self.schedule(session)
+        return session
+
+    def remove_session(self, session):
+        """Stop a session; the wheel drops it when it comes due."""
+        session.closed = True
+        self.sessions.pop(session.id, None)
+
+    def schedule(self, session):
+        """Put a session on the wheel for its next tick, unless it is there or stopped."""
+        if not session.scheduled and session.is_running():
+            session.scheduled = True
+            self.wheel.schedule(session, session.state.tick_interval() / 1000)
+
+    def command(self, session, command):
+        """Apply a client command and reschedule the session if it was resumed or restarted."""
+        if not session.command(command):
+            return False
+        self.schedule(session)
+        return True
+
+    def run_slot(self):
+        """Tick every session due in the next wheel slot."""
+        for session in self.wheel.advance():
+            session.scheduled = False
+            if session.is_running():
+                session.tick()
+                self.ticks += 1
+                self.schedule(session)
+
+    async def drive(self):
+        """Advance the wheel in real time, catching up on slots if running late."""
+        wheel = self.wheel
+        while True:
+            delay = wheel.next_deadline() - wheel.clock()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                self.max_lag = max(self.max_lag, -delay)
+            self.run_slot()
+
+    def start(self):
+        """Start the timer wheel task (inside a running event loop)."""
+        if self.driver is None:
+            self.wheel.origin = self.wheel.clock() - self.wheel.steps * self.wheel.slot
+            self.driver = asyncio.ensure_future(self.drive())
+
+    async def stop(self):
+        """Stop the timer wheel task."""
+        if self.driver is not None:
+            self.driver.cancel()
+            try:
+                await self.driver
+            except asyncio.CancelledError:
+                pass
+            self.driver = None
+
+    async def handle_client(self, reader, writer):
+        """Run one client connection: send frames, apply commands until quit or disconnect."""
+        transport = writer.transport
+
+        def send(data, frame=False):
+            if transport.is_closing() or (frame and transport.get_write_buffer_size() > MAX_WRITE_BUFFER):
+                return False
+            writer.write(data)
+            return True
+
+        session = self.add_session(send)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line or not self.command(session, line.decode(errors='replace').strip().lower()):
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self.remove_session(session)
+            writer.close()
+
+    async def serve_unix(self, path):
+        """Listen on a Unix socket. Returns the asyncio server."""
+        self.start()
+        return await asyncio.start_unix_server(self.handle_client, path)
+
+    async def serve_tcp(self, host='127.0.0.1', port=0):
+        """Listen on TCP (loopback by default). Returns the asyncio server."""
+        self.start()
+        return await asyncio.start_server(self.handle_client, host, port)
+
+
+def main(argv=None):
+    """Run a game server until interrupted."""
+    parser = argparse.ArgumentParser(description="Host many snake game sessions in one process.")
+    parser.add_argument('--unix', metavar='PATH', help="listen on a Unix socket")
+    parser.add_argument('--host', default='127.0.0.1', help="TCP address to listen on (default: loopback)")
+    parser.add_argument('--port', type=int, default=7777, help="TCP port (default: 7777)")
+    parser.add_argument('--height', type=int, default=DEFAULT_HEIGHT, help="board height of each session")
+    parser.add_argument('--width', type=int, default=DEFAULT_WIDTH, help="board width of each session")
+    args = parser.parse_args(argv)
+
+    async def serve():
+        server = GameServer(args.height, args.width)
+        if args.unix:
+            listener = await server.serve_unix(args.unix)
+            print(f"Serving on {args.unix}")
+        else:
+            listener = await server.serve_tcp(args.host, args.port)
+            print(f"Serving on {args.host}:{args.port}")
+        async with listener:
+            await listener.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
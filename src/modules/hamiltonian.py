@@ -0,0 +1,599 @@
+"""
+Hamiltonian Module
+A solver that follows a closed path through the free cells of the board,
+taking safe shortcuts toward the food while the snake is short.
+
+The cycle is built from a spanning tree of 2x2 blocks of cells: every
+block alone is a small clockwise loop, and each tree edge between two
+neighbouring blocks merges their loops, giving one loop over the cells of
+all blocks. Blocks holding an obstacle are left out, and the leftover
+cells (around obstacles, or an odd last row or column) are spliced in
+pairs into neighbouring cycle edges where possible. The tree is a
+minimum spanning tree over a fixed edge order, so a new obstacle only
+changes the cycle near the block it lands in.
+
+When the interior has an odd number of cells no cycle covers them all,
+and one corner cell is left out; when food lands there the solver swaps
+it in for the cycle cell diagonally next to it. Such a board still
+cannot always be filled. It is a checkerboard with one more cell of the
+corners' colour, and with two free cells left, food on that colour can
+never be followed by the last one: that happens in at least half of the
+games. Food the solver cannot reach for STALL_LAPS laps is taken
+anyway, so those games end instead of circling forever.
+
+Cycles are cached in memory and on disk, keyed by board size and
+obstacle layout, so starting on a known terminal size is instant.
+"""
+
+import hashlib
+import os
+import time
+from array import array
+
+from .autopilot import BLOCKED_TABLE, Autopilot, bfs_path, is_passable, direction_between, direction_offset
+from .persistence import atomic_write
+
+# Bump when the construction changes, so old cache files are not used
+ALGORITHM_VERSION = 1
+
+# Cache files start with these bytes and a SHA-1 of the cycle data
+CACHE_MAGIC = b'SNKC'
+
+# Cache files kept; the least recently written are removed beyond this
+CACHE_MAX_FILES = 64
+
+# Free cells kept between head and tail when taking a shortcut
+SHORTCUT_MARGIN = 4
+
+# Shortcuts are only taken while the snake covers less of the cycle than this
+SHORTCUT_MAX_FILL = 0.5
+
+# Laps of the cycle without eating after which the solver counts as stalled
+STALL_LAPS = 2
+
+
+class HamiltonianCycle:
+    """A closed path through the free cells of one board layout."""
+
+    def __init__(self, height, width, order):
+        """Initialize a cycle from its cell indices in path order."""
+        self.height = height
+        self.width = width
+        self.order = order
+        self.position = array('i', [-1]) * (height * width)
+        for i, cell in enumerate(order):
+            self.position[cell] = i
+
+    def __len__(self):
+        return len(self.order)
+
+    def next_cell(self, cell):
+        """Return the cell after a cell on the cycle."""
+        return self.order[(self.position[cell] + 1) % len(self.order)]
+
+    def distance(self, start, end):
+        """Return the number of steps along the cycle from start to end."""
+        return (self.position[end] - self.position[start]) % len(self.order)
+
+    def swap_in(self, cell):
+        """Return a copy of the cycle through an off-cycle cell, and the cell to enter it from.
+
+        cell replaces the cycle cell between two of its neighbours u and
+        v that are two steps apart on the cycle, taking the path
+        u -> cell -> v. Returns None if it has no such neighbours.
+        """
+        width = self.width
+        order = self.order
+        length = len(order)
+        for entry in (cell - width, cell + width, cell - 1, cell + 1):
+            i = self.position[entry]
+            if i != -1 and abs(order[(i + 2) % length] - cell) in (1, width):
+                swapped = array('i', order)
+                swapped[(i + 1) % length] = cell
+                return HamiltonianCycle(self.height, width, swapped), entry
+        return None
+
+    def to_bytes(self):
+        """Serialize the cycle for the on-disk cache."""
+        data = self.order.tobytes()
+        return CACHE_MAGIC + hashlib.sha1(data).digest() + data
+
+    @classmethod
+    def from_bytes(cls, height, width, data):
+        """Load a cycle written by to_bytes(), checking it was not damaged."""
+        header = len(CACHE_MAGIC) + 20
+        body = data[header:]
+        if data[:len(CACHE_MAGIC)] != CACHE_MAGIC or hashlib.sha1(body).digest() != data[len(CACHE_MAGIC):header]:
+            raise ValueError("damaged cycle cache file")
+        order = array('i')
+        order.frombytes(body)
+        if order and (min(order) < 0 or max(order) >= height * width):
+            raise ValueError("cached cycle does not fit the board")
+        return cls(height, width, order)
+
+
+def build_cycle(height, width, obstacles=()):
+    """Build a Hamiltonian cycle over the free interior cells of a board.
+
+    Returns the cell indices in path order; cells that cannot be fitted
+    in are left out. Returns an empty array if no cycle fits.
+    """
+    size = height * width
+    blocked = bytearray(size)
+    for y in range(height):
+        for x in range(width):
+            if y == 0 or y == height - 1 or x == 0 or x == width - 1:
+                blocked[y * width + x] = 1
+    for y, x in obstacles:
+        blocked[y * width + x] = 1
+
+    rows = (height - 2) // 2
+    cols = (width - 2) // 2
+
+    def top_left(block):
+        by, bx = divmod(block, cols)
+        return (1 + 2 * by) * width + 1 + 2 * bx
+
+    usable = [not any(blocked[cell] for cell in (tl, tl + 1, tl + width, tl + width + 1))
+              for tl in map(top_left, range(rows * cols))]
+
+    # Kruskal over a fixed order: horizontal edges row by row, then vertical
+    # edges column by column, giving a comb-shaped tree
+    parent = list(range(rows * cols))
+
+    def find(block):
+        while parent[block] != block:
+            parent[block] = parent[parent[block]]
+            block = parent[block]
+        return block
+
+    edges = [(b, b + 1) for b in range(rows * cols) if b % cols < cols - 1]
+    edges += [(by * cols + bx, (by + 1) * cols + bx) for bx in range(cols) for by in range(rows - 1)]
+    tree = []
+    for a, b in edges:
+        if usable[a] and usable[b]:
+            root_a, root_b = find(a), find(b)
+            if root_a != root_b:
+                parent[root_a] = root_b
+                tree.append((a, b))
+
+    # Keep the largest connected group of blocks
+    sizes = {}
+    for block in range(rows * cols):
+        if usable[block]:
+            root = find(block)
+            sizes[root] = sizes.get(root, 0) + 1
+    if not sizes:
+        return array('i')
+    main_root = max(sizes, key=sizes.get)
+
+    # Clockwise loop around each block, then merge loops along tree edges
+    succ = array('i', [-1]) * size
+    for block in range(rows * cols):
+        if usable[block] and find(block) == main_root:
+            tl = top_left(block)
+            tr, bl, br = tl + 1, tl + width, tl + width + 1
+            succ[tl], succ[tr], succ[br], succ[bl] = tr, br, bl, tl
+    for a, b in tree:
+        if find(a) != main_root:
+            continue
+        a_tl, b_tl = top_left(a), top_left(b)
+        if b == a + 1:
+            # a left of b: a.TR -> b.TL and b.BL -> a.BR
+            succ[a_tl + 1] = b_tl
+            succ[b_tl + width] = a_tl + width + 1
+        else:
+            # a above b: a.BR -> b.TR and b.TL -> a.BL
+            succ[a_tl + width + 1] = b_tl + 1
+            succ[b_tl] = a_tl + width
+
+    absorb_leftover_cells(succ, blocked, width)
+
+    start = next(cell for cell in range(size) if succ[cell] != -1)
+    order = array('i', [start])
+    cell = succ[start]
+    while cell != start:
+        order.append(cell)
+        cell = succ[cell]
+    return order
+
+
+def absorb_leftover_cells(succ, blocked, width):
+    """Splice pairs of neighbouring free cells left off the cycle into it.
+
+    Two such cells a and b next to a cycle edge u -> v (u next to a, v next
+    to b) turn it into u -> a -> b -> v.
+    """
+    offsets = (-width, width, -1, 1)
+    leftover = [cell for cell in range(len(succ)) if not blocked[cell] and succ[cell] == -1]
+    changed = True
+    while changed:
+        changed = False
+        for a in leftover:
+            if succ[a] != -1:
+                continue
+            for b in (a + offset for offset in offsets):
+                if blocked[b] or succ[b] != -1:
+                    continue
+                for u in (a + offset for offset in offsets):
+                    v = succ[u] if not blocked[u] else -1
+                    if v != -1 and abs(v - b) in (1, width):
+                        succ[u], succ[a], succ[b] = a, b, v
+                        changed = True
+                        break
+                if succ[a] != -1:
+                    break
+
+
+class HamiltonianSolver:
+    """Chooses a direction for each tick by following a Hamiltonian cycle.
+
+    Offers the same interface as Autopilot, so the front end can use
+    either.
+    """
+
+    def __init__(self, cache_dir=None, persistence=None):
+        """Initialize the solver, caching cycles under cache_dir if given.
+
+        New cache files are written by the persistence worker if given,
+        otherwise immediately.
+        """
+        self.cache_dir = cache_dir
+        self.persistence = persistence
+        self.cycles = {}
+        self.fallback = Autopilot()
+        self.reset()
+
+        # Statistics
+        self.ticks = 0
+        self.shortcuts = 0
+        self.detours = 0
+        self.swaps = 0
+        self.stalls = 0
+        self.recovery_ticks = 0
+        self.cycles_built = 0
+        self.cache_hits = 0
+        self.last_search_time = 0.0
+        self.max_search_time = 0.0
+        self.total_search_time = 0.0
+
+    def reset(self):
+        """Forget the current game's cycle and detour."""
+        self.cycle = None
+        self.previous_cycle = None
+        self.board = None
+        self.obstacle_count = 0
+        self.in_order = False
+        self.detour = []  # Off-cycle cells still to walk, last one first
+        self.pocket = None
+        self.pocket_food = None
+        self.swap = None  # (food, swap_in() result) for food off the cycle
+        self.score = 0
+        self.last_meal = 0  # Tick the score last changed
+        self.stalled = False
+
+    def average_search_time(self):
+        """Return the mean time spent choosing a direction, in seconds."""
+        if not self.ticks:
+            return 0.0
+        return self.total_search_time / self.ticks
+
+    def next_direction(self, state):
+        """Return the direction to take on the coming tick."""
+        start = time.perf_counter()
+        direction = self.choose(state)
+        elapsed = time.perf_counter() - start
+
+        self.ticks += 1
+        self.last_search_time = elapsed
+        self.total_search_time += elapsed
+        if elapsed > self.max_search_time:
+            self.max_search_time = elapsed
+        return direction
+
+    def cache_key(self, height, width, obstacles):
+        """Return the cache file name for a board layout."""
+        layout = f"{ALGORITHM_VERSION}:{height}x{width}:{sorted(obstacles)}"
+        digest = hashlib.sha1(layout.encode()).hexdigest()[:16]
+        return f"{height}x{width}-{digest}.cycle"
+
+    def cycle_for(self, height, width, obstacles):
+        """Return the cycle for a layout from memory, the disk cache or a new build."""
+        key = self.cache_key(height, width, obstacles)
+        cycle = self.cycles.get(key)
+        if cycle is not None:
+            return cycle
+
+        path = os.path.join(self.cache_dir, key) if self.cache_dir else None
+        if path:
+            try:
+                with open(path, 'rb') as f:
+                    cycle = HamiltonianCycle.from_bytes(height, width, f.read())
+                self.cache_hits += 1
+            except (OSError, ValueError):
+                cycle = None
+
+        if cycle is None:
+            cycle = HamiltonianCycle(height, width, build_cycle(height, width, obstacles))
+            self.cycles_built += 1
+            if path and len(cycle):
+                self.save_cycle(path, cycle.to_bytes())
+
+        self.cycles[key] = cycle
+        return cycle
+
+    def save_cycle(self, path, data):
+        """Write a cycle to the disk cache, in the background if possible."""
+        def write():
+            os.makedirs(self.cache_dir, exist_ok=True)
+            atomic_write(path, data)
+            self.prune_cache()
+
+        if self.persistence:
+            self.persistence.submit(write, key=path, description=f"Caching the cycle {path}")
+        else:
+            try:
+                write()
+            except OSError:
+                pass
+
+    def prune_cache(self):
+        """Remove the least recently written cache files beyond CACHE_MAX_FILES."""
+        paths = [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)
+                 if name.endswith('.cycle')]
+        if len(paths) <= CACHE_MAX_FILES:
+            return
+        paths.sort(key=os.path.getmtime)
+        for path in paths[:-CACHE_MAX_FILES]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def body_in_order(self, state):
+        """Check that the snake's cells on the cycle run from tail to head in cycle order."""
+        position = self.cycle.position
+        length = len(self.cycle)
+        previous = None
+        total = 0
+        for cell in state.snake.reversed_indices():
+            current = position[cell]
+            if current == -1:
+                # Off the cycle (a detour or a changed layout); never entered again
+                continue
+            if previous is not None:
+                step = (current - previous) % length
+                if step == 0:
+                    return False
+                total += step
+            previous = current
+        return total < length
+
+    def choose(self, state):
+        """Follow the cycle, taking shortcuts and food detours when safe."""
+        board = state.board
+        width = board.width
+
+        # Pick the cycle for a new game or new obstacles
+        if board is not self.board or len(state.obstacles) != self.obstacle_count:
+            self.previous_cycle = self.cycle if board is self.board else None
+            self.board = board
+            self.obstacle_count = len(state.obstacles)
+            self.cycle = self.cycle_for(state.height, width, [tuple(o) for o in state.obstacles])
+            self.in_order = bool(len(self.cycle)) and self.body_in_order(state)
+            self.detour = []
+            self.pocket_food = None
+            self.swap = None
+            self.score = state.score
+            self.last_meal = state.ticks
+            self.stalled = False
+        elif not self.in_order and not self.stalled and len(self.cycle):
+            self.in_order = self.body_in_order(state)
+
+        cycle = self.cycle
+        cells = board.cells
+        head = state.snake.head
+        food = state.food_index
+        if not len(cycle):
+            return self.fallback.next_direction(state)
+
+        # The food on the last free cell: eating it fills the board
+        if food is not None and abs(food - head) in (1, width) and not board.free_count():
+            return direction_between(head, food, width)
+
+        # Food out of reach for whole laps: head for it through recover()
+        if state.score != self.score:
+            self.score = state.score
+            self.last_meal = state.ticks
+            self.stalled = False
+        elif not self.stalled and state.ticks - self.last_meal > STALL_LAPS * len(cycle):
+            self.stalled = True
+            self.in_order = False
+            self.stalls += 1
+        if not self.in_order:
+            return self.recover(state, head)
+
+        position = cycle.position
+
+        # Walk the rest of a detour planned when leaving the cycle
+        if position[head] == -1:
+            if self.detour and is_passable(cells, self.detour[-1]):
+                return direction_between(head, self.detour.pop(), width)
+            self.detour = []
+            self.in_order = False
+            return self.recover(state, head)
+
+        tail = None
+        for tail in state.snake.reversed_indices():
+            if position[tail] != -1:
+                break
+        room = cycle.distance(head, tail)
+
+        if food is not None and position[food] == -1:
+            # Food on a cell the cycle leaves out next to it: take a cycle through the food
+            if self.swap is None or self.swap[0] != food:
+                self.swap = (food, cycle.swap_in(food))
+            swap = self.swap[1]
+            # The tail must stay clear of the cell after the food, which is reached without moving it
+            if swap and swap[1] == head and room > 2:
+                self.cycle = swap[0]
+                self.swap = None
+                self.swaps += 1
+                return direction_between(head, food, width)
+
+            # Food on cells the cycle misses: go through them and back to the cycle
+            detour = self.plan_detour(cells, head, food, room)
+            if detour and self.tail_reachable(state, detour[0], detour[1:]):
+                self.detour = detour
+                self.detours += 1
+                return direction_between(head, self.detour.pop(), width)
+
+        best = cycle.next_cell(head)
+        if food is not None and position[food] != -1 and len(state.snake) < SHORTCUT_MAX_FILL * len(cycle):
+            # Jump ahead along the cycle, but never past the food or near the tail
+            food_distance = cycle.distance(head, food)
+            best_distance = 1
+            for neighbor in (head - width, head + width, head - 1, head + 1):
+                if position[neighbor] == -1 or not is_passable(cells, neighbor):
+                    continue
+                distance = cycle.distance(head, neighbor)
+                if best_distance < distance <= food_distance and distance < room - SHORTCUT_MARGIN:
+                    best = neighbor
+                    best_distance = distance
+            if best_distance > 1:
+                self.shortcuts += 1
+
+        if not is_passable(cells, best):
+            self.in_order = False
+            return self.recover(state, head)
+        return direction_between(head, best, width)
+
+    def plan_detour(self, cells, head, food, room):
+        """Plan a path from the head through off-cycle cells to the food and back.
+
+        The path re-joins the cycle ahead of the head and short of the
+        tail, so the cells it skips are free and the body stays in cycle
+        order. Returns the path (last cell first) or an empty list.
+        """
+        cycle = self.cycle
+        position = cycle.position
+        width = cycle.width
+        offsets = (-width, width, -1, 1)
+
+        # Free off-cycle cells connected to the food, found once per food
+        if self.pocket_food != food:
+            self.pocket_food = food
+            self.pocket = {food}
+            stack = [food]
+            while stack:
+                cell = stack.pop()
+                for offset in offsets:
+                    neighbor = cell + offset
+                    if neighbor not in self.pocket and position[neighbor] == -1 and is_passable(cells, neighbor):
+                        self.pocket.add(neighbor)
+                        stack.append(neighbor)
+
+        pocket = self.pocket
+        if not any(head + offset in pocket for offset in offsets):
+            return []
+
+        def search(starts, is_goal, avoid):
+            """Breadth-first search inside the pocket. Returns the path, first cell first."""
+            came_from = {cell: None for cell in starts}
+            frontier = list(starts)
+            while frontier:
+                next_frontier = []
+                for cell in frontier:
+                    if is_goal(cell):
+                        path = []
+                        while cell is not None:
+                            path.append(cell)
+                            cell = came_from[cell]
+                        return path[::-1]
+                    for offset in offsets:
+                        neighbor = cell + offset
+                        if neighbor in pocket and neighbor not in came_from and neighbor not in avoid \
+                                and is_passable(cells, neighbor):
+                            came_from[neighbor] = cell
+                            next_frontier.append(neighbor)
+                frontier = next_frontier
+            return []
+
+        starts = [head + offset for offset in offsets
+                  if head + offset in pocket and is_passable(cells, head + offset)]
+        to_food = search(starts, lambda cell: cell == food, ())
+        if not to_food:
+            return []
+
+        def exit_cell(cell):
+            """Return a safe cycle cell next to cell to re-join the cycle at, or None."""
+            for offset in offsets:
+                neighbor = cell + offset
+                if neighbor != head and position[neighbor] != -1 and is_passable(cells, neighbor) \
+                        and 0 < cycle.distance(head, neighbor) < room - SHORTCUT_MARGIN:
+                    return neighbor
+            return None
+
+        back = search([food], lambda cell: exit_cell(cell) is not None, set(to_food[:-1]))
+        if not back:
+            return []
+        path = to_food + back[1:] + [exit_cell(back[-1])]
+        return path[::-1]
+
+    def cycle_is_clear(self, state, head):
+        """Check that following the cycle from head never reaches a body cell before it is vacated."""
+        cycle = self.cycle
+        length = len(state.snake)
+        body = {cell: i for i, cell in enumerate(state.snake.indices())}
+        cell = head
+        for step in range(1, length + 1):
+            cell = cycle.next_cell(cell)
+            i = body.get(cell)
+            # Body cell i leaves after length - i ticks, later if food is eaten meanwhile
+            if i is not None and step <= length - i + SHORTCUT_MARGIN:
+                return False
+        return True
+
+    def recover(self, state, head):
+        """Steer back onto the cycle while the body is out of cycle order.
+
+        After new obstacles, the cycle the body was laid along is followed
+        until the new one is clear of the body for a full snake length.
+        Once stalled, the fallback autopilot's path to the food is taken
+        instead. Every move taken here must keep the tail reachable from
+        the head.
+        """
+        self.recovery_ticks += 1
+        cycle = self.cycle
+        cells = state.board.cells
+        width = state.width
+        if self.stalled:
+            direction = self.fallback.next_direction(state)
+            cell = head + direction_offset(direction, width)
+            if is_passable(cells, cell) and self.tail_reachable(state, cell):
+                return direction
+        previous = self.previous_cycle
+        if previous is not None and cycle.position[head] != -1 and self.cycle_is_clear(state, head):
+            previous = self.previous_cycle = None
+
+        candidates = []
+        if previous is not None and previous.position[head] != -1:
+            candidates.append(previous.next_cell(head))
+        if cycle.position[head] != -1:
+            candidates.append(cycle.next_cell(head))
+        candidates += [neighbor for neighbor in (head - width, head + width, head - 1, head + 1)
+                       if cycle.position[neighbor] != -1]
+        for cell in candidates:
+            if is_passable(cells, cell) and self.tail_reachable(state, cell):
+                return direction_between(head, cell, width)
+        return self.fallback.survival_direction(state, head)
+
+    def tail_reachable(self, state, cell, avoid=()):
+        """Check that the tail can still be reached after the head moves to cell, not entering the avoid cells."""
+        board = state.board
+        blocked = board.cells.translate(BLOCKED_TABLE)
+        for other in avoid:
+            blocked[other] = 1
+        tail = state.snake.tail
+        blocked[tail] = 0
+        return bool(bfs_path(blocked, board.width, cell, tail))
@@ -0,0 +1,74 @@
+"""
+Input Queue Module
+Buffers direction changes so quick key sequences are applied one per tick.
+"""
+
+import time
+from collections import deque
+
+from .game_engine import OPPOSITE_DIRECTIONS
+
+# Direction changes kept waiting for upcoming ticks
+INPUT_QUEUE_SIZE = 3
+
+
+class InputQueue:
+    """Bounded queue of direction changes with input latency tracking.
+
+    Each key is checked against the direction it will follow (the newest
+    queued turn, or the current direction when the queue is empty), so
+    UP then LEFT within one tick becomes two turns on two ticks instead of
+    the second key overwriting or being rejected against the first.
+    """
+
+    def __init__(self, maxlen=INPUT_QUEUE_SIZE, time_source=time.monotonic):
+        """Initialize an empty queue."""
+        self.time_source = time_source
+        self.pending = deque(maxlen=maxlen)
+        self.maxlen = maxlen
+        self.dropped = 0
+
+        # Input-to-movement latency, in seconds
+        self.latency_count = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.latency_last = 0.0
+
+    def clear(self):
+        """Forget all pending direction changes."""
+        self.pending.clear()
+
+    def push(self, direction, current_direction):
+        """Queue a direction change. Returns True if it was accepted.
+
+        Repeats of the direction the snake will already be moving in,
+        180-degree reversals and keys beyond the queue size are ignored.
+        """
+        previous = self.pending[-1][0] if self.pending else current_direction
+        if direction == previous or direction == OPPOSITE_DIRECTIONS[previous]:
+            return False
+        if len(self.pending) == self.maxlen:
+            self.dropped += 1
+            return False
+        self.pending.append((direction, self.time_source()))
+        return True
+
+    def pop(self):
+        """Return the next direction change for this tick, or None."""
+        if not self.pending:
+            return None
+        direction, pressed_at = self.pending.popleft()
+
+        latency = self.time_source() - pressed_at
+        self.latency_count += 1
+        self.latency_total += latency
+        self.latency_last = latency
+        if latency > self.latency_max:
+            self.latency_max = latency
+        return direction
+
+    def average_latency(self):
+        """Return the mean input-to-movement latency in seconds."""
+        if not self.latency_count:
+            return 0.0
+        return self.latency_total / self.latency_count
@@ -0,0 +1,136 @@
+"""
+Leaderboard Store Module
+Keeps every finished game in a SQLite database shared by all sessions.
+
+The database runs in WAL mode, so readers never block the writer and
+concurrent games on the same host each append their own row instead of
+rewriting a shared file. Indexes on score, (level, score) and date keep
+top-K, per-level and per-date queries fast as the history grows.
+"""
+
+import json
+import sqlite3
+from datetime import datetime, timedelta
+
+from .score_manager import ScoreManager
+
+# Seconds a writer waits for another session's transaction to finish
+BUSY_TIMEOUT = 5.0
+
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    score INTEGER NOT NULL,
+    level INTEGER,
+    date TEXT
+);
+CREATE INDEX IF NOT EXISTS scores_by_score ON scores (score DESC);
+CREATE INDEX IF NOT EXISTS scores_by_level ON scores (level, score DESC);
+CREATE INDEX IF NOT EXISTS scores_by_date ON scores (date);
+CREATE TABLE IF NOT EXISTS imports (
+    path TEXT PRIMARY KEY,
+    date TEXT NOT NULL
+);
+"""
+
+
+class LeaderboardStore:
+    """Full score history with indexed leaderboard queries."""
+
+    def __init__(self, path):
+        """Open (and create if needed) the database at path.
+
+        The connection may be used from another thread (the persistence
+        worker), one thread at a time.
+        """
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT, isolation_level=None,
+                                    check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
+
+    def add_score(self, score, level, date=None):
+        """Record a finished game. Returns the new row id."""
+        if date is None:
+            date = datetime.now().strftime(DATE_FORMAT)
+        cursor = self.conn.execute(
+            "INSERT INTO scores (score, level, date) VALUES (?, ?, ?)", (score, level, date))
+        return cursor.lastrowid
+
+    def top(self, k=10, level=None):
+        """Return the k best games, optionally only those that ended on a level."""
+        if level is None:
+            rows = self.conn.execute(
+                "SELECT score, level, date FROM scores ORDER BY score DESC, id LIMIT ?", (k,))
+        else:
+            rows = self.conn.execute(
+                "SELECT score, level, date FROM scores WHERE level = ? "
+                "ORDER BY score DESC, id LIMIT ?", (level, k))
+        return [dict(row) for row in rows]
+
+    def on_date(self, day, k=None):
+        """Return the games played on a 'YYYY-MM-DD' day, best first."""
+        start = datetime.strptime(day, '%Y-%m-%d')
+        end = start + timedelta(days=1)
+        rows = self.conn.execute(
+            "SELECT score, level, date FROM scores WHERE date >= ? AND date < ? "
+            "ORDER BY score DESC, id LIMIT ?",
+            (start.strftime(DATE_FORMAT), end.strftime(DATE_FORMAT), -1 if k is None else k))
+        return [dict(row) for row in rows]
+
+    def high_score(self):
+        """Return the best score ever recorded, or 0."""
+        row = self.conn.execute("SELECT MAX(score) FROM scores").fetchone()
+        return row[0] or 0
+
+    def count(self):
+        """Return the number of recorded games."""
+        return self.conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+    def import_once(self, path, rows):
+        """Insert (score, level, date) rows unless path was already imported.
+
+        The check and the inserts share one write transaction, so two
+        sessions starting together import a legacy file only once.
+        """
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = self.conn.execute(
+                "INSERT OR IGNORE INTO imports (path, date) VALUES (?, ?)",
+                (path, datetime.now().strftime(DATE_FORMAT)))
+            if cursor.rowcount:
+                self.conn.executemany(
+                    "INSERT INTO scores (score, level, date) VALUES (?, ?, ?)", rows)
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        return bool(cursor.rowcount)
+
+    def migrate_leaderboard_file(self, path):
+        """Import the top 10 JSON file written by earlier versions. Returns True if imported."""
+        try:
+            with open(path, 'r') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if not isinstance(entries, list):
+            return False  # Valid JSON, but not a leaderboard: skip it like a corrupt file
+        rows = [(entry['score'], entry.get('level'), entry.get('date'))
+                for entry in entries if isinstance(entry, dict) and 'score' in entry]
+        return self.import_once(path, rows)
+
+    def migrate_high_score_file(self, path):
+        """Import the modular version's high score file. Returns True if imported."""
+        high_score = ScoreManager(path).load_high_score()
+        if not high_score:
+            return False
+        return self.import_once(path, [(high_score, None, None)])
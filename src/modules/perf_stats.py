@@ -0,0 +1,127 @@
+"""
+Performance Stats Module
+Rolling timing statistics for each phase of the game loop, with a
+JSON-lines export for offline analysis.
+"""
+
+import time
+from collections import deque
+
+from .persistence import atomic_write
+
+# Samples kept per phase for the rolling statistics
+ROLLING_WINDOW = 600
+
+# Raw samples kept for the JSON-lines export
+SAMPLE_LOG_SIZE = 200000
+
+# Histogram bucket upper edges in milliseconds
+HISTOGRAM_EDGES_MS = [0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500]
+
+
+class RollingStats:
+    """Keeps the most recent samples of one phase, in seconds."""
+
+    def __init__(self, window=ROLLING_WINDOW):
+        """Initialize an empty window."""
+        self.samples = deque(maxlen=window)
+        self.count = 0
+
+    def add(self, seconds):
+        """Add a sample."""
+        self.samples.append(seconds)
+        self.count += 1
+
+    def mean(self):
+        """Return the mean of the window in seconds."""
+        if not self.samples:
+            return 0.0
+        return sum(self.samples) / len(self.samples)
+
+    def percentile(self, percent):
+        """Return a percentile of the window in seconds."""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(len(ordered) * percent / 100))
+        return ordered[index]
+
+    def histogram(self):
+        """Return sample counts per bucket of HISTOGRAM_EDGES_MS, plus one overflow bucket."""
+        counts = [0] * (len(HISTOGRAM_EDGES_MS) + 1)
+        for seconds in self.samples:
+            ms = seconds * 1000
+            for i, edge in enumerate(HISTOGRAM_EDGES_MS):
+                if ms <= edge:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+        return counts
+
+    def summary(self):
+        """Return the window statistics in milliseconds."""
+        return {
+            'count': self.count,
+            'mean_ms': self.mean() * 1000,
+            'p50_ms': self.percentile(50) * 1000,
+            'p95_ms': self.percentile(95) * 1000,
+            'p99_ms': self.percentile(99) * 1000,
+            'max_ms': max(self.samples) * 1000 if self.samples else 0.0,
+            'histogram': self.histogram(),
+        }
+
+
+class PerfMonitor:
+    """Collects per-phase timings (tick, render, idle, input latency) of the game loop."""
+
+    def __init__(self, time_source=time.monotonic):
+        """Initialize an empty monitor."""
+        self.time_source = time_source
+        self.started = time_source()
+        self.phases = {}
+        self.samples = deque(maxlen=SAMPLE_LOG_SIZE)
+        self.tick_times = deque(maxlen=ROLLING_WINDOW)
+
+    def record(self, phase, seconds):
+        """Record how long one occurrence of a phase took."""
+        stats = self.phases.get(phase)
+        if stats is None:
+            stats = self.phases[phase] = RollingStats()
+        stats.add(seconds)
+        self.samples.append((self.time_source() - self.started, phase, seconds))
+
+    def record_tick(self, seconds):
+        """Record a simulation tick and when it happened."""
+        self.tick_times.append(self.time_source())
+        self.record('tick', seconds)
+
+    def mean_ms(self, phase):
+        """Return the rolling mean of a phase in milliseconds."""
+        stats = self.phases.get(phase)
+        return stats.mean() * 1000 if stats else 0.0
+
+    def tick_rate(self, span=1.0):
+        """Return the ticks per second measured over the last span seconds."""
+        now = self.time_source()
+        count = 0
+        for tick_time in reversed(self.tick_times):
+            if now - tick_time > span:
+                break
+            count += 1
+        return count / span
+
+    def summary(self):
+        """Return the statistics of every phase."""
+        return {phase: stats.summary() for phase, stats in self.phases.items()}
+
+    def dump(self, path):
+        """Write a summary line and then one line per raw sample as JSON lines."""
+        import json  # Only needed on exit, so kept off the startup path
+
+        lines = [json.dumps({'type': 'summary', 'phases': self.summary(),
+                             'histogram_edges_ms': HISTOGRAM_EDGES_MS})]
+        for offset, phase, seconds in self.samples:
+            lines.append(json.dumps({'type': 'sample', 't': round(offset, 6), 'phase': phase,
+                                     'ms': round(seconds * 1000, 4)}))
+        atomic_write(path, '\n'.join(lines) + '\n')
@@ -0,0 +1,133 @@
+"""
+Persistence Module
+Runs score, leaderboard and replay writes on a background thread so the
+game never waits on disk I/O, and writes files atomically.
+"""
+
+import os
+import stat
+import threading
+from collections import OrderedDict
+
+# Seconds main_wrapper waits for pending writes on exit
+FLUSH_TIMEOUT = 10.0
+
+# Failed jobs kept for reporting; older ones are only counted
+MAX_FAILURES = 20
+
+
+def atomic_write(path, data):
+    """Write data (str or bytes) to path via a temporary file and a rename.
+
+    Readers see either the old file or the complete new one, never a
+    partly written file, even if the game is killed mid-write.
+    """
+    # tempfile is slow to import and only needed once something is saved
+    import tempfile
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb' if isinstance(data, bytes) else 'w') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file private; keep the permissions of the file it replaces
+        try:
+            mode = stat.S_IMODE(os.stat(path).st_mode)
+        except OSError:
+            mode = 0o644
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+class PersistenceWorker:
+    """Background thread that runs queued write jobs in submission order.
+
+    A job submitted with a key replaces a pending job with the same key,
+    so repeated saves of one file collapse into a single write of the
+    latest data. Jobs without a key always run. A job that raises does
+    not stop the worker; the failure is kept in failures, described by
+    the description it was submitted with, for the game to report once
+    the terminal is back.
+    """
+
+    def __init__(self, name='snake-persistence'):
+        """Start the worker thread."""
+        self.pending = OrderedDict()
+        self.condition = threading.Condition()
+        self.job_count = 0
+        self.busy = False
+        self.closed = False
+
+        # Statistics
+        self.completed = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.last_error = None
+        self.failures = []
+
+        self.thread = threading.Thread(target=self.run, name=name, daemon=True)
+        self.thread.start()
+
+    def submit(self, job, key=None, description=None):
+        """Queue a callable to run on the worker thread.
+
+        description names the job in failure reports.
+        """
+        with self.condition:
+            if self.closed:
+                raise RuntimeError("persistence worker is closed")
+            if key is None:
+                self.job_count += 1
+                key = ('job', self.job_count)
+            elif key in self.pending:
+                # Latest data wins and is written after everything queued so far
+                del self.pending[key]
+                self.coalesced += 1
+            self.pending[key] = (job, description)
+            self.condition.notify_all()
+
+    def run(self):
+        """Run queued jobs until closed and drained."""
+        while True:
+            with self.condition:
+                while not self.pending and not self.closed:
+                    self.condition.wait()
+                if not self.pending:
+                    return
+                _, (job, description) = self.pending.popitem(last=False)
+                self.busy = True
+
+            try:
+                job()
+            except Exception as e:
+                # Persistence is best effort: the game goes on and the failure is reported on exit
+                self.errors += 1
+                self.last_error = e
+                if len(self.failures) < MAX_FAILURES:
+                    self.failures.append(f"{description or 'background write'} failed: {e!r}")
+
+            with self.condition:
+                self.busy = False
+                self.completed += 1
+                self.condition.notify_all()
+
+    def flush(self, timeout=None):
+        """Wait until every queued job has run. Returns False on timeout."""
+        with self.condition:
+            return self.condition.wait_for(lambda: not self.pending and not self.busy, timeout)
+
+    def close(self, timeout=FLUSH_TIMEOUT):
+        """Finish the queued jobs and stop the thread. Returns False on timeout."""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.thread.join(timeout)
+        return not self.thread.is_alive()
@@ -0,0 +1,185 @@
+"""
+Replay Module
+Records games as a seed plus per-tick direction changes, and replays them.
+
+A replay file is the magic bytes b'SNKR', a version byte, a header of
+unsigned LEB128 varints (height, width, progression, seed, ticks, score,
+level, game over, turn count) and one varint per turn holding the tick
+delta since the previous turn shifted left by two bits, OR-ed with the
+direction. A turn usually takes one or two bytes.
+"""
+
+import argparse
+import sys
+import time
+
+from .game_engine import GameState
+from .persistence import atomic_write
+
+MAGIC = b'SNKR'
+VERSION = 1
+
+
+def encode_varint(value, out):
+    """Append an unsigned integer to a bytearray as a LEB128 varint."""
+    if value < 0:
+        raise ValueError("varints must be non-negative")
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_varint(data, pos):
+    """Read a LEB128 varint from data at pos. Returns (value, next position)."""
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError("truncated replay data")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class ReplayRecorder:
+    """Collects the direction changes applied to one game."""
+
+    def __init__(self, state):
+        """Start recording a game that has just been reset."""
+        if not isinstance(state.seed, int) or state.seed < 0:
+            raise ValueError("only games with a non-negative integer seed can be recorded")
+        self.height = state.height
+        self.width = state.width
+        self.progression = state.progression
+        self.seed = state.seed
+        self.turns = bytearray()
+        self.turn_count = 0
+        self.last_tick = 0
+
+    def record_turn(self, tick, direction):
+        """Record the direction passed to step() on the given tick."""
+        encode_varint(((tick - self.last_tick) << 2) | direction, self.turns)
+        self.last_tick = tick
+        self.turn_count += 1
+
+    def to_bytes(self, state):
+        """Return the replay of the game so far, ending at the state's current tick."""
+        data = bytearray(MAGIC)
+        data.append(VERSION)
+        for value in (self.height, self.width, int(self.progression), self.seed,
+                      state.ticks, state.score, state.level, int(state.game_over),
+                      self.turn_count):
+            encode_varint(value, data)
+        data += self.turns
+        return bytes(data)
+
+    def save(self, path, state):
+        """Write the replay to a file."""
+        atomic_write(path, self.to_bytes(state))
+
+
+class Replay:
+    """A decoded replay that can be re-simulated without a terminal."""
+
+    def __init__(self, height, width, progression, seed, ticks, score, level, game_over, turns):
+        """Initialize a replay from its header fields and (tick, direction) turns."""
+        self.height = height
+        self.width = width
+        self.progression = progression
+        self.seed = seed
+        self.ticks = ticks
+        self.score = score
+        self.level = level
+        self.game_over = game_over
+        self.turns = turns
+        self.turn_map = dict(turns)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Decode a replay from bytes."""
+        if data[:4] != MAGIC:
+            raise ValueError("not a snake replay")
+        if data[4] != VERSION:
+            raise ValueError(f"unsupported replay version {data[4]}")
+
+        pos = 5
+        header = []
+        for _ in range(9):
+            value, pos = decode_varint(data, pos)
+            header.append(value)
+        height, width, progression, seed, ticks, score, level, game_over, turn_count = header
+
+        turns = []
+        tick = 0
+        for _ in range(turn_count):
+            value, pos = decode_varint(data, pos)
+            tick += value >> 2
+            turns.append((tick, value & 3))
+
+        return cls(height, width, bool(progression), seed, ticks, score, level, bool(game_over), turns)
+
+    @classmethod
+    def load(cls, path):
+        """Load a replay from a file."""
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+    def new_state(self, track_changes=False):
+        """Return a fresh GameState set up like the recorded game."""
+        return GameState(self.height, self.width, seed=self.seed,
+                         progression=self.progression, track_changes=track_changes)
+
+    def turn_at(self, tick):
+        """Return the direction recorded for a tick, or None."""
+        return self.turn_map.get(tick)
+
+    def is_finished(self, state):
+        """Check if a state replaying this game has reached the end of the recording."""
+        if state.game_over:
+            return True
+        if self.game_over:
+            # The recorded game ends in a collision; stop if it never comes
+            return state.ticks > self.ticks
+        return state.ticks >= self.ticks
+
+    def simulate(self):
+        """Re-run the game headlessly at full speed and return the final state."""
+        state = self.new_state()
+        turn_map = self.turn_map
+        while not self.is_finished(state):
+            state.step(turn_map.get(state.ticks))
+        return state
+
+    def verify(self):
+        """Check that re-simulating reproduces the recorded result."""
+        state = self.simulate()
+        return (state.ticks, state.score, state.level, state.game_over) == \
+            (self.ticks, self.score, self.level, self.game_over)
+
+
+def main(argv=None):
+    """Re-simulate replay files headlessly and report their results."""
+    parser = argparse.ArgumentParser(description="Verify and time snake game replays.")
+    parser.add_argument('replays', nargs='+', help="replay files to simulate")
+    args = parser.parse_args(argv)
+
+    ok = True
+    for path in args.replays:
+        replay = Replay.load(path)
+        start = time.perf_counter()
+        state = replay.simulate()
+        elapsed = time.perf_counter() - start
+        matches = (state.ticks, state.score, state.level) == (replay.ticks, replay.score, replay.level)
+        ok = ok and matches
+        rate = state.ticks / elapsed if elapsed > 0 else float('inf')
+        print(f"{path}: {state.ticks} ticks, score {state.score}, level {state.level}, "
+              f"{rate:,.0f} ticks/s, {'OK' if matches else 'MISMATCH'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
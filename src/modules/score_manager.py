@@ -1,6 +1,6 @@
 """
 Score Manager Module
-Handles loading and saving high scores.
+Reads the legacy high score file, migrated into the leaderboard database.
 """
 
 import json
@@ -8,7 +8,7 @@ import os
 
 
 class ScoreManager:
-    """Manages high score persistence."""
+    """Reads the high score file written by earlier versions of the game."""
 
     def __init__(self, score_file):
         """Initialize score manager with file path."""
@@ -24,11 +24,3 @@ class ScoreManager:
         except Exception:
             pass
         return 0
-
-    def save_high_score(self, score):
-        """Save high score to file."""
-        try:
-            with open(self.score_file, 'w') as f:
-                json.dump({'high_score': score}, f)
-        except Exception:
-            pass
@@ -0,0 +1,125 @@
+"""
+Snake Body Module
+Compact store for the snake's segments.
+
+Segments are kept as flat cell indices (y * width + x) in a preallocated
+array('I') used as a ring buffer, 4 bytes per segment instead of a deque
+of two-element lists. Moving the snake writes one slot at the head and
+drops one at the tail, so a tick allocates nothing; the buffer only
+reallocates, doubling, when the snake outgrows it.
+"""
+
+from array import array
+
+# Segments the buffer holds before it first grows (a power of two)
+INITIAL_CAPACITY = 256
+
+
+class SnakeBody:
+    """Ring buffer of packed cell indices, head first.
+
+    Indexing and iteration return [y, x] lists like the rest of the game
+    state (food, obstacles); hot paths use head, tail and indices()
+    instead, which work on the packed cell indices directly.
+    """
+
+    def __init__(self, width, cells=(), capacity=INITIAL_CAPACITY):
+        """Initialize a body for a board of the given width from cell indices, head first."""
+        self.width = width
+        while capacity < len(cells):
+            capacity *= 2
+        self.buffer = array('I', bytes(4 * capacity))
+        self.mask = capacity - 1
+        self.head_slot = 0
+        self.length = 0
+        for cell in reversed(cells):
+            self.push_head(cell)
+
+    @classmethod
+    def from_positions(cls, width, positions):
+        """Build a body from [y, x] positions, head first."""
+        return cls(width, [y * width + x for y, x in positions])
+
+    @property
+    def capacity(self):
+        """Number of segments the buffer holds before growing."""
+        return self.mask + 1
+
+    @property
+    def head(self):
+        """Cell index of the head."""
+        return self.buffer[self.head_slot]
+
+    @property
+    def tail(self):
+        """Cell index of the last segment."""
+        return self.buffer[(self.head_slot + self.length - 1) & self.mask]
+
+    def push_head(self, cell):
+        """Add a new head segment, growing the buffer if it is full."""
+        if self.length > self.mask:
+            self.grow()
+        self.head_slot = (self.head_slot - 1) & self.mask
+        self.buffer[self.head_slot] = cell
+        self.length += 1
+
+    def pop_tail(self):
+        """Remove the last segment and return its cell index."""
+        self.length -= 1
+        return self.buffer[(self.head_slot + self.length) & self.mask]
+
+    def grow(self):
+        """Double the buffer, unrolling the ring so the head is in slot 0."""
+        head = self.head_slot
+        buffer = self.buffer
+        grown = array('I', bytes(8 * len(buffer)))
+        grown[:len(buffer) - head] = buffer[head:]
+        grown[len(buffer) - head:len(buffer)] = buffer[:head]
+        self.buffer = grown
+        self.mask = len(grown) - 1
+        self.head_slot = 0
+
+    def clear(self):
+        """Remove every segment, keeping the buffer."""
+        self.head_slot = 0
+        self.length = 0
+
+    def indices(self):
+        """Iterate over the segments' cell indices, head first."""
+        buffer = self.buffer
+        mask = self.mask
+        head = self.head_slot
+        for i in range(self.length):
+            yield buffer[(head + i) & mask]
+
+    def reversed_indices(self):
+        """Iterate over the segments' cell indices, tail first."""
+        buffer = self.buffer
+        mask = self.mask
+        head = self.head_slot
+        for i in range(self.length - 1, -1, -1):
+            yield buffer[(head + i) & mask]
+
+    def __len__(self):
+        """Return the number of segments."""
+        return self.length
+
+    def __getitem__(self, i):
+        """Return segment i (negative counts from the tail) as [y, x]."""
+        if i < 0:
+            i += self.length
+        if not 0 <= i < self.length:
+            raise IndexError("snake segment index out of range")
+        return list(divmod(self.buffer[(self.head_slot + i) & self.mask], self.width))
+
+    def __iter__(self):
+        """Iterate over the segments as [y, x], head first."""
+        width = self.width
+        for cell in self.indices():
+            yield list(divmod(cell, width))
+
+    def __reversed__(self):
+        """Iterate over the segments as [y, x], tail first."""
+        width = self.width
+        for cell in self.reversed_indices():
+            yield list(divmod(cell, width))
@@ -0,0 +1,231 @@
+"""
+Snake Environment Module
+Reinforcement-learning environments over the game rules, with NumPy observations.
+
+The interface follows Gymnasium: reset(seed) returns (observation, info)
+and step(action) returns (observation, reward, terminated, truncated, info).
+Gymnasium itself is not needed. Requires NumPy, which is not needed to
+play the game.
+"""
+
+try:
+    import numpy as np
+except ImportError as e:  # pragma: no cover - depends on environment
+    raise ImportError("The snake environment requires NumPy: pip install numpy") from e
+
+from .batch_engine import BatchGameState, FOOD_EATEN_FLAG, LEVEL_UP_FLAG, COLLISION_FLAG, BOARD_FULL_FLAG
+from .board import SNAKE, OBSTACLE, FOOD, WALL
+from .game_config import FOOD_POINTS, CHUNKED_BOARD_CELLS
+from .game_engine import GameState, COLLISION
+
+# Observation channels
+HEAD_CHANNEL = 0
+BODY_CHANNEL = 1
+FOOD_CHANNEL = 2
+OBSTACLE_CHANNEL = 3
+NUM_CHANNELS = 4
+
+# Actions are the engine's directions: UP, DOWN, LEFT, RIGHT
+NUM_ACTIONS = 4
+
+# Default rewards
+FOOD_REWARD = 1.0  # per FOOD_POINTS scored
+LEVEL_UP_REWARD = 1.0  # per level gained
+COLLISION_REWARD = -1.0
+
+# Channel values of each cell state, one row per state (the head is set separately)
+STATE_CHANNELS = np.zeros((WALL + 1, NUM_CHANNELS), dtype=np.uint8)
+STATE_CHANNELS[SNAKE, BODY_CHANNEL] = 1
+STATE_CHANNELS[FOOD, FOOD_CHANNEL] = 1
+STATE_CHANNELS[OBSTACLE, OBSTACLE_CHANNEL] = 1
+
+
+class SnakeEnv:
+    """One game of the GameState rules as a reinforcement-learning environment.
+
+    The observation is a (NUM_CHANNELS, height, width) uint8 array marking
+    the head, the rest of the body, the food and the obstacles. It is
+    allocated once: every step() updates only the cells the board reports
+    as changed and returns the same array, so callers that keep an
+    observation past the next step must copy it. info is likewise one
+    dictionary updated in place.
+
+    The reward is food_reward for every FOOD_POINTS scored, level_up_reward
+    for every level gained and collision_reward when the snake crashes.
+    With max_steps, a game still running after that many ticks is truncated.
+    """
+
+    def __init__(self, height=20, width=20, progression=True, max_steps=None,
+                 food_reward=FOOD_REWARD, level_up_reward=LEVEL_UP_REWARD, collision_reward=COLLISION_REWARD):
+        """Initialize an environment on a board of the given dimensions, including the border."""
+        if height * width > CHUNKED_BOARD_CELLS:
+            raise ValueError(f"board of {height}x{width} cells is too large for an environment")
+        self.height = height
+        self.width = width
+        self.max_steps = max_steps
+        self.food_reward = food_reward
+        self.level_up_reward = level_up_reward
+        self.collision_reward = collision_reward
+        self.observation_shape = (NUM_CHANNELS, height, width)
+        self.num_actions = NUM_ACTIONS
+
+        self.state = GameState(height, width, progression=progression, track_changes=True)
+        self.observation = np.zeros(self.observation_shape, dtype=np.uint8)
+        # Channels by flat cell index, a view of the observation
+        self.cells = self.observation.reshape(NUM_CHANNELS, height * width)
+        self.head = None
+        self.info = {}
+
+    def reset(self, seed=None):
+        """Start a new game and return (observation, info)."""
+        state = self.state
+        state.reset(seed)
+        state.board.take_dirty()
+
+        board_cells = np.frombuffer(state.board.cells, dtype=np.uint8)
+        cells = self.cells
+        np.equal(board_cells, SNAKE, out=cells[BODY_CHANNEL])
+        np.equal(board_cells, FOOD, out=cells[FOOD_CHANNEL])
+        np.equal(board_cells, OBSTACLE, out=cells[OBSTACLE_CHANNEL])
+        cells[HEAD_CHANNEL].fill(0)
+        self.head = state.snake.head
+        cells[HEAD_CHANNEL, self.head] = 1
+        cells[BODY_CHANNEL, self.head] = 0
+        return self.observation, self.update_info(())
+
+    def step(self, action):
+        """Move the snake in the direction action and return (observation, reward, terminated, truncated, info)."""
+        state = self.state
+        if state.game_over:
+            raise RuntimeError("the game is over; call reset() to start a new one")
+        score = state.score
+        level = state.level
+        events = state.step(action)
+
+        # Repaint the changed cells, then move the head marker
+        cells = self.cells
+        board_cells = state.board.cells
+        for index in state.board.take_dirty():
+            cells[:, index] = STATE_CHANNELS[board_cells[index]]
+        head = state.snake.head
+        if head != self.head:
+            cells[HEAD_CHANNEL, self.head] = 0
+            cells[BODY_CHANNEL, self.head] = board_cells[self.head] == SNAKE
+            cells[HEAD_CHANNEL, head] = 1
+            cells[BODY_CHANNEL, head] = 0
+            self.head = head
+
+        reward = (state.score - score) / FOOD_POINTS * self.food_reward + \
+            (state.level - level) * self.level_up_reward
+        if COLLISION in events:
+            reward += self.collision_reward
+        terminated = state.game_over
+        truncated = not terminated and self.max_steps is not None and state.ticks >= self.max_steps
+        return self.observation, reward, terminated, truncated, self.update_info(events)
+
+    def update_info(self, events):
+        """Refresh and return the info dictionary."""
+        state = self.state
+        info = self.info
+        info['score'] = state.score
+        info['level'] = state.level
+        info['ticks'] = state.ticks
+        info['won'] = state.won
+        info['events'] = events
+        return info
+
+
+class VectorSnakeEnv:
+    """num_envs games stepped together on a BatchGameState.
+
+    Observations are one preallocated (num_envs, NUM_CHANNELS, height,
+    width) uint8 array, refilled in place from the batch boards after
+    every step; rewards, terminated and truncated are preallocated arrays
+    too, so all of them must be copied to be kept past the next step.
+    Rewards follow SnakeEnv.
+
+    A game that ends is restarted within the same step(), so its
+    observation already shows the next game; the final score, level and
+    ticks of the finished game are in info['final_score'],
+    info['final_level'] and info['final_ticks'].
+    """
+
+    def __init__(self, num_envs, height=20, width=20, seed=None, max_steps=None,
+                 food_reward=FOOD_REWARD, level_up_reward=LEVEL_UP_REWARD, collision_reward=COLLISION_REWARD):
+        """Initialize num_envs environments on boards of the given dimensions, including the border."""
+        self.num_envs = num_envs
+        self.height = height
+        self.width = width
+        self.max_steps = max_steps
+        self.food_reward = food_reward
+        self.level_up_reward = level_up_reward
+        self.collision_reward = collision_reward
+        self.observation_shape = (NUM_CHANNELS, height, width)
+        self.num_actions = NUM_ACTIONS
+
+        self.batch = BatchGameState(num_envs, height, width, seed)
+        self.observations = np.zeros((num_envs,) + self.observation_shape, dtype=np.uint8)
+        # Channels by flat cell index, a view of the observations
+        self.cells = self.observations.reshape(num_envs, NUM_CHANNELS, height * width)
+        self.rewards = np.zeros(num_envs, dtype=np.float32)
+        self.terminated = np.zeros(num_envs, dtype=bool)
+        self.truncated = np.zeros(num_envs, dtype=bool)
+        self.envs = np.arange(num_envs)
+
+        batch = self.batch
+        self.info = {
+            'score': batch.score,
+            'level': batch.level,
+            'ticks': batch.ticks,
+            'final_score': batch.final_score,
+            'final_level': batch.final_level,
+            'final_ticks': batch.final_ticks
+        }
+        self.refresh()
+
+    def reset(self, seed=None):
+        """Start a new game in every environment and return (observations, info)."""
+        if seed is not None:
+            self.batch.rng = np.random.default_rng(seed)
+        self.batch.reset_boards(self.envs)
+        self.refresh()
+        return self.observations, self.info
+
+    def step(self, actions):
+        """Advance every environment by one tick and return (observations, rewards, terminated, truncated, info).
+
+        actions holds one direction per environment.
+        """
+        batch = self.batch
+        events = batch.step(actions)
+
+        rewards = self.rewards
+        rewards.fill(0)
+        rewards[(events & FOOD_EATEN_FLAG) != 0] += self.food_reward
+        rewards[(events & LEVEL_UP_FLAG) != 0] += self.level_up_reward
+        rewards[(events & COLLISION_FLAG) != 0] += self.collision_reward
+        np.not_equal(events & (COLLISION_FLAG | BOARD_FULL_FLAG), 0, out=self.terminated)
+
+        if self.max_steps is not None:
+            np.greater_equal(batch.ticks, self.max_steps, out=self.truncated)
+            truncated = np.flatnonzero(self.truncated)
+            if truncated.size:
+                batch.final_score[truncated] = batch.score[truncated]
+                batch.final_level[truncated] = batch.level[truncated]
+                batch.final_ticks[truncated] = batch.ticks[truncated]
+                batch.reset_boards(truncated)
+
+        self.refresh()
+        return self.observations, rewards, self.terminated, self.truncated, self.info
+
+    def refresh(self):
+        """Fill the observations from the batch boards."""
+        grid = self.batch.grid
+        cells = self.cells
+        np.equal(grid, SNAKE, out=cells[:, BODY_CHANNEL])
+        np.equal(grid, FOOD, out=cells[:, FOOD_CHANNEL])
+        np.equal(grid, OBSTACLE, out=cells[:, OBSTACLE_CHANNEL])
+        heads = self.batch.heads()
+        cells[:, HEAD_CHANNEL].fill(0)
+        cells[self.envs, HEAD_CHANNEL, heads] = 1
+        cells[self.envs, BODY_CHANNEL, heads] = 0
@@ -0,0 +1,277 @@
+"""
+Tournament Module
+Plays bot policies against the same seeded games on every CPU core and ranks them.
+
+Every policy plays one headless GameState game per seed with the rules of
+snake_game.py (levels, speed-ups and obstacles). Games are spread over a
+process pool; a worker receives only the policy name, seed and board size
+and sends back a small result tuple, never the game state. Results come
+back in task order, so a seed list always gives the same output.
+
+A policy is 'autopilot', 'hamiltonian', 'greedy' or a 'module:attribute'
+path to any class with reset() and next_direction(state), the interface
+of Autopilot.
+"""
+
+import argparse
+import importlib
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .autopilot import Autopilot
+from .board import SNAKE, OBSTACLE, WALL
+from .game_config import CHUNKED_BOARD_CELLS
+from .game_engine import GameState, UP, DOWN, LEFT, RIGHT, COLLISION, OPPOSITE_DIRECTIONS
+from .hamiltonian import HamiltonianSolver
+
+# Play area of a standard 80 x 24 terminal, as snake_game.py sizes it
+DEFAULT_HEIGHT = 19
+DEFAULT_WIDTH = 78
+
+# How a game ended
+CAUSE_WALL = 'wall'
+CAUSE_SELF = 'self'
+CAUSE_OBSTACLE = 'obstacle'
+CAUSE_BOARD_FULL = 'board_full'
+CAUSE_STALLED = 'stalled'  # No food eaten for stall_ticks ticks
+
+COLLISION_CAUSES = {
+    WALL: CAUSE_WALL,
+    SNAKE: CAUSE_SELF,
+    OBSTACLE: CAUSE_OBSTACLE
+}
+
+# Fields of a result tuple
+RESULT_FIELDS = ('policy', 'seed', 'score', 'level', 'ticks', 'cause')
+
+
+class GreedyBot:
+    """Baseline policy: step toward the food onto any free cell, without planning."""
+
+    def reset(self):
+        """Nothing to forget between games."""
+
+    def next_direction(self, state):
+        """Return the free direction that brings the head closest to the food."""
+        width = state.width
+        head_y, head_x = divmod(state.snake.head, width)
+        food = state.food
+        board = state.board
+        best_direction = state.direction
+        best_distance = None
+        for direction, (dy, dx) in ((UP, (-1, 0)), (DOWN, (1, 0)), (LEFT, (0, -1)), (RIGHT, (0, 1))):
+            if direction == OPPOSITE_DIRECTIONS[state.last_direction]:
+                continue
+            y, x = head_y + dy, head_x + dx
+            if board.is_blocked_at(y * width + x):
+                continue
+            distance = abs(food[0] - y) + abs(food[1] - x) if food else 0
+            if best_distance is None or distance < best_distance:
+                best_direction = direction
+                best_distance = distance
+        return best_direction
+
+
+POLICIES = {
+    'autopilot': Autopilot,
+    'greedy': GreedyBot,
+    'hamiltonian': HamiltonianSolver
+}
+
+# Policies that search the flat Board.cells array, which boards above
+# CHUNKED_BOARD_CELLS (kept sparse as a ChunkedBoard) do not have
+FLAT_BOARD_POLICIES = {'autopilot', 'hamiltonian'}
+
+# Policies created so far in this process, reused across its games
+_policy_cache = {}
+
+
+def load_policy(name):
+    """Return the policy class for a name or a 'module:attribute' path."""
+    if name in POLICIES:
+        return POLICIES[name]
+    module_name, sep, attribute = name.partition(':')
+    if not sep:
+        raise ValueError(f"unknown policy {name!r} (use {', '.join(sorted(POLICIES))} or module:attribute)")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def get_policy(name):
+    """Return this process's instance of a policy, reset for a new game."""
+    policy = _policy_cache.get(name)
+    if policy is None:
+        policy = _policy_cache[name] = load_policy(name)()
+    policy.reset()
+    return policy
+
+
+def play_game(policy_name, seed, height=DEFAULT_HEIGHT, width=DEFAULT_WIDTH, stall_ticks=None):
+    """Play one game of a policy and return its result tuple (see RESULT_FIELDS).
+
+    The game stops when no food was eaten for stall_ticks ticks (twice
+    the number of free cells unless given), so a policy circling forever
+    still finishes.
+    """
+    policy = get_policy(policy_name)
+    state = GameState(height, width, seed=seed)
+    if stall_ticks is None:
+        stall_ticks = 2 * (height - 2) * (width - 2)
+    board = state.board
+    last_meal = 0
+    score = 0
+
+    while True:
+        direction = policy.next_direction(state)
+        state.set_direction(direction)
+        target = state.snake.head + state.offsets[state.direction]
+        events = state.step()
+        if COLLISION in events:
+            cause = COLLISION_CAUSES[board.get_at(target)]
+            break
+        if state.won:
+            cause = CAUSE_BOARD_FULL
+            break
+        if state.score != score:
+            score = state.score
+            last_meal = state.ticks
+        elif state.ticks - last_meal >= stall_ticks:
+            cause = CAUSE_STALLED
+            break
+
+    return (policy_name, seed, state.score, state.level, state.ticks, cause)
+
+
+def _play_task(task):
+    """Run play_game() for a task tuple; the unit of work sent to pool workers."""
+    return play_game(*task)
+
+
+def run_tournament(policies, seeds, height=DEFAULT_HEIGHT, width=DEFAULT_WIDTH, stall_ticks=None, jobs=None):
+    """Play every policy on every seed and yield the result tuples in task order.
+
+    With jobs=1 the games are played in this process, otherwise on a pool
+    of that many processes (one per CPU core by default).
+    """
+    tasks = [(policy, seed, height, width, stall_ticks) for policy in policies for seed in seeds]
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            yield _play_task(task)
+        return
+
+    # Chunks amortize the inter-process round trips while keeping every worker busy
+    chunksize = max(1, len(tasks) // (jobs * 16))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(_play_task, tasks, chunksize=chunksize)
+
+
+def summarize(results):
+    """Return aggregate statistics per policy, best first.
+
+    Policies are ranked by mean score, then median score, then fewer mean ticks.
+    """
+    by_policy = {}
+    for result in results:
+        by_policy.setdefault(result[0], []).append(result)
+
+    summaries = []
+    for policy, games in by_policy.items():
+        scores = [game[2] for game in games]
+        causes = {}
+        for game in games:
+            causes[game[5]] = causes.get(game[5], 0) + 1
+        summaries.append({
+            'policy': policy,
+            'games': len(games),
+            'mean_score': statistics.mean(scores),
+            'median_score': statistics.median(scores),
+            'stdev_score': statistics.pstdev(scores),
+            'max_score': max(scores),
+            'mean_level': statistics.mean(game[3] for game in games),
+            'mean_ticks': statistics.mean(game[4] for game in games),
+            'causes': dict(sorted(causes.items()))
+        })
+    summaries.sort(key=lambda s: (-s['mean_score'], -s['median_score'], s['mean_ticks'], s['policy']))
+    for rank, summary in enumerate(summaries, 1):
+        summary['rank'] = rank
+    return summaries
+
+
+def parse_seeds(text):
+    """Parse a comma-separated seed list, where 'a-b' stands for every seed from a to b."""
+    seeds = []
+    for part in text.split(','):
+        first, sep, last = part.strip().partition('-')
+        if sep:
+            seeds.extend(range(int(first), int(last) + 1))
+        else:
+            seeds.append(int(first))
+    return seeds
+
+
+def main(argv=None):
+    """Run a tournament from the command line and print the ranking."""
+    parser = argparse.ArgumentParser(description="Rank snake bot policies over seeded headless games.")
+    parser.add_argument('policies', nargs='+',
+                        help=f"policies to play: {', '.join(sorted(POLICIES))} or module:attribute")
+    parser.add_argument('--games', type=int, default=1000, help="games per policy (default: 1000)")
+    parser.add_argument('--first-seed', type=int, default=0, help="seed of the first game (default: 0)")
+    parser.add_argument('--seeds', type=parse_seeds, help="explicit seed list, e.g. 1,5,10-20 (overrides --games)")
+    parser.add_argument('--size', type=int, nargs=2, metavar=('HEIGHT', 'WIDTH'), default=(DEFAULT_HEIGHT, DEFAULT_WIDTH),
+                        help=f"play area including the border (default: {DEFAULT_HEIGHT} {DEFAULT_WIDTH})")
+    parser.add_argument('--stall-ticks', type=int, help="end a game after this many ticks without food")
+    parser.add_argument('--jobs', type=int, help="worker processes (default: one per CPU core)")
+    parser.add_argument('--results', metavar='FILE', help="write one CSV line per game as results arrive")
+    args = parser.parse_args(argv)
+
+    try:
+        for policy in args.policies:
+            load_policy(policy)
+    except (ValueError, ImportError, AttributeError) as e:
+        parser.error(str(e))
+    seeds = args.seeds if args.seeds is not None else list(range(args.first_seed, args.first_seed + args.games))
+    height, width = args.size
+    flat = sorted(FLAT_BOARD_POLICIES.intersection(args.policies))
+    if flat and height * width > CHUNKED_BOARD_CELLS:
+        parser.error(f"--size {height} {width} is above {CHUNKED_BOARD_CELLS:,} cells, "
+                     f"too large for the {' and '.join(flat)} polic{'ies' if len(flat) > 1 else 'y'}")
+
+    results = []
+    start = time.perf_counter()
+    out = open(args.results, 'w') if args.results else None
+    try:
+        if out:
+            out.write(','.join(RESULT_FIELDS) + '\n')
+        total = len(seeds) * len(args.policies)
+        for result in run_tournament(args.policies, seeds, height, width, args.stall_ticks, args.jobs):
+            results.append(result)
+            if out:
+                out.write(','.join(str(field) for field in result) + '\n')
+            if sys.stderr.isatty():
+                print(f"\r{len(results)}/{total} games", end='', file=sys.stderr, flush=True)
+    finally:
+        if out:
+            out.close()
+    elapsed = time.perf_counter() - start
+    if sys.stderr.isatty():
+        print(file=sys.stderr)
+
+    ticks = sum(result[4] for result in results)
+    print(f"{len(results)} games, {ticks:,} ticks in {elapsed:.1f}s ({ticks / max(elapsed, 1e-9):,.0f} ticks/s)")
+    name_width = max(20, *(len(policy) for policy in args.policies))
+    print(f"{'rank':>4}  {'policy':{name_width}s} {'mean':>8} {'median':>8} {'stdev':>8} "
+          f"{'max':>6} {'level':>6} {'ticks':>8}  deaths")
+    for summary in summarize(results):
+        causes = ', '.join(f"{cause} {count}" for cause, count in summary['causes'].items())
+        print(f"{summary['rank']:>4}  {summary['policy']:{name_width}s} {summary['mean_score']:8.1f} "
+              f"{summary['median_score']:8.1f} {summary['stdev_score']:8.1f} {summary['max_score']:6d} "
+              f"{summary['mean_level']:6.2f} {summary['mean_ticks']:8.0f}  {causes}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
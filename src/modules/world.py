@@ -0,0 +1,198 @@
+"""
+World Module
+Sparse, chunked occupancy grid for worlds far larger than the terminal,
+and the camera that shows the part of the world around the snake.
+
+A 10,000 x 10,000 world has 100 million cells, but only the few the
+snake, food and obstacles occupy are ever stored: cells live in square
+chunks that are allocated on the first write and dropped again once
+empty. Collision checks, updates and food spawning stay constant time,
+so the tick cost depends on the snake, not on the world area.
+"""
+
+import random
+
+from .board import EMPTY, FOOD, WALL
+
+# Chunks are CHUNK_SIZE x CHUNK_SIZE cells, with CHUNK_SIZE = 1 << CHUNK_SHIFT
+CHUNK_SHIFT = 6
+CHUNK_SIZE = 1 << CHUNK_SHIFT
+CHUNK_MASK = CHUNK_SIZE - 1
+
+# Random cells tried when spawning before counting free cells chunk by chunk
+MAX_SPAWN_SAMPLES = 32
+
+
+class ChunkedBoard:
+    """Occupancy grid stored sparsely in chunks, with the Board interface.
+
+    Cell indices are y * width + x as for Board. The outer ring is WALL
+    without being stored. Instead of a free-cell index, which would need
+    every empty cell of the world, random_free_cell() samples random cells
+    and only falls back to counting free cells per chunk on a crowded
+    board.
+    """
+
+    def __init__(self, height, width, track_changes=False):
+        """Initialize an empty world of the given dimensions."""
+        self.height = height
+        self.width = width
+        self.track_changes = track_changes
+        self.chunk_columns = (width + CHUNK_MASK) >> CHUNK_SHIFT
+        self.clear()
+
+    def clear(self):
+        """Drop every chunk, leaving the world empty."""
+        self.chunks = {}  # Chunk number -> bytearray of CHUNK_SIZE * CHUNK_SIZE cells
+        self.counts = {}  # Chunk number -> occupied cells in it
+        self.occupied = 0
+        self.dirty = []
+
+    def chunk_key(self, y, x):
+        """Return the number of the chunk holding a position."""
+        return (y >> CHUNK_SHIFT) * self.chunk_columns + (x >> CHUNK_SHIFT)
+
+    def index(self, y, x):
+        """Return the flat cell index for a position."""
+        return y * self.width + x
+
+    def get(self, y, x):
+        """Return the state of the cell at a position."""
+        if y <= 0 or y >= self.height - 1 or x <= 0 or x >= self.width - 1:
+            return WALL
+        chunk = self.chunks.get((y >> CHUNK_SHIFT) * self.chunk_columns + (x >> CHUNK_SHIFT))
+        if chunk is None:
+            return EMPTY
+        return chunk[((y & CHUNK_MASK) << CHUNK_SHIFT) | (x & CHUNK_MASK)]
+
+    def get_at(self, index):
+        """Return the state of the cell at a flat index."""
+        y = index // self.width
+        return self.get(y, index - y * self.width)
+
+    def set_at(self, index, state):
+        """Set the state of the interior cell at a flat index."""
+        y = index // self.width
+        self.set(y, index - y * self.width, state)
+
+    def set(self, y, x, state):
+        """Set the state of an interior cell, allocating or dropping its chunk as needed."""
+        key = (y >> CHUNK_SHIFT) * self.chunk_columns + (x >> CHUNK_SHIFT)
+        offset = ((y & CHUNK_MASK) << CHUNK_SHIFT) | (x & CHUNK_MASK)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            if state == EMPTY:
+                return
+            chunk = self.chunks[key] = bytearray(CHUNK_SIZE * CHUNK_SIZE)
+            self.counts[key] = 0
+        old_state = chunk[offset]
+        if old_state == state:
+            return
+        chunk[offset] = state
+        if self.track_changes:
+            self.dirty.append(y * self.width + x)
+
+        if old_state == EMPTY:
+            self.counts[key] += 1
+            self.occupied += 1
+        elif state == EMPTY:
+            self.occupied -= 1
+            self.counts[key] -= 1
+            if not self.counts[key]:
+                del self.chunks[key]
+                del self.counts[key]
+
+    def is_empty(self, y, x):
+        """Check if the cell at a position is free."""
+        return self.get(y, x) == EMPTY
+
+    def is_blocked(self, y, x):
+        """Check if the cell at a position is occupied by the snake, an obstacle or the wall."""
+        state = self.get(y, x)
+        return state != EMPTY and state != FOOD
+
+    def is_blocked_at(self, index):
+        """Check if the cell at a flat index is occupied by the snake, an obstacle or the wall."""
+        state = self.get_at(index)
+        return state != EMPTY and state != FOOD
+
+    def free_count(self):
+        """Return the number of empty cells."""
+        return (self.height - 2) * (self.width - 2) - self.occupied
+
+    def random_free_cell(self, rng=random):
+        """Return a uniformly random empty (y, x) cell, or None if the world is full."""
+        free = self.free_count()
+        if free <= 0:
+            return None
+        rows = self.height - 2
+        columns = self.width - 2
+        for _ in range(MAX_SPAWN_SAMPLES):
+            y = 1 + rng.randrange(rows)
+            x = 1 + rng.randrange(columns)
+            if self.get(y, x) == EMPTY:
+                return y, x
+        return self.nth_free_cell(rng.randrange(free))
+
+    def nth_free_cell(self, n):
+        """Return the n-th empty cell in chunk order, skipping whole chunks by their counts."""
+        for chunk_y in range(0, self.height, CHUNK_SIZE):
+            y_range = range(max(chunk_y, 1), min(chunk_y + CHUNK_SIZE, self.height - 1))
+            for chunk_x in range(0, self.width, CHUNK_SIZE):
+                x_range = range(max(chunk_x, 1), min(chunk_x + CHUNK_SIZE, self.width - 1))
+                key = self.chunk_key(chunk_y, chunk_x)
+                free = len(y_range) * len(x_range) - self.counts.get(key, 0)
+                if n >= free:
+                    n -= free
+                    continue
+                for y in y_range:
+                    for x in x_range:
+                        if self.get(y, x) == EMPTY:
+                            if not n:
+                                return y, x
+                            n -= 1
+        return None
+
+    def take_dirty(self):
+        """Return the indices of cells changed since the last call and reset the list."""
+        dirty = self.dirty
+        self.dirty = []
+        return dirty
+
+
+class Camera:
+    """The height x width part of a board's interior shown in the game window.
+
+    The camera keeps the snake's head away from the edges of the view by
+    jumping to center it, so the view scrolls only every so often and a
+    full redraw is needed only then. On a board no larger than the view,
+    the view stays put and board and window positions coincide.
+    """
+
+    def __init__(self, height, width):
+        """Initialize a camera showing the top-left corner of the board interior."""
+        self.height = height
+        self.width = width
+        self.top = 1
+        self.left = 1
+
+    def follow(self, y, x, board_height, board_width):
+        """Recenter on (y, x) if it is near an edge of the view. Returns True if the view moved."""
+        top = self.top
+        margin = self.height // 4
+        if not top + margin <= y < top + self.height - margin:
+            top = max(1, min(y - self.height // 2, board_height - 1 - self.height))
+
+        left = self.left
+        margin = self.width // 4
+        if not left + margin <= x < left + self.width - margin:
+            left = max(1, min(x - self.width // 2, board_width - 1 - self.width))
+
+        moved = (top, left) != (self.top, self.left)
+        self.top = top
+        self.left = left
+        return moved
+
+    def is_visible(self, y, x):
+        """Check if a board position is inside the view."""
+        return 0 <= y - self.top < self.height and 0 <= x - self.left < self.width
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Snake Client - Terminal Based
+A thin curses client for the game server: sends key presses and draws
+the frames the server sends back. All game rules run on the server.
+"""
+
+import sys
+import os
+import argparse
+import curses
+import json
+import socket
+
+# Add the current directory to the path to import modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.board import EMPTY, SNAKE, OBSTACLE, FOOD
+
+# Keys mapped to server commands
+KEY_COMMANDS = {
+    curses.KEY_UP: 'up',
+    curses.KEY_DOWN: 'down',
+    curses.KEY_LEFT: 'left',
+    curses.KEY_RIGHT: 'right',
+    ord('p'): 'pause',
+    ord('P'): 'pause',
+    ord('r'): 'restart',
+    ord('R'): 'restart',
+    ord('q'): 'quit',
+    ord('Q'): 'quit'
+}
+
+# Characters for each cell state
+CELL_CHARS = {
+    EMPTY: (' ', curses.A_NORMAL),
+    SNAKE: ('o', curses.A_NORMAL),
+    FOOD: ('*', curses.A_BOLD),
+    OBSTACLE: ('#', curses.A_BOLD)
+}
+
+# Milliseconds to wait for a key between checks of the socket
+KEY_TIMEOUT_MS = 10
+
+
+class SnakeClient:
+    """Draws server frames in a curses window and forwards keys."""
+
+    def __init__(self, stdscr, sock):
+        """Initialize the client on a connected socket."""
+        self.stdscr = stdscr
+        self.sock = sock
+        self.sock.setblocking(False)
+        self.buffer = b''
+        self.outbox = b''  # Command bytes the socket could not take yet
+        self.window = None
+        self.width = 0
+        self.drawn_head = None
+        self.score = 0
+        self.level = 1
+        self.status = ""
+
+        curses.curs_set(0)
+        self.stdscr.timeout(KEY_TIMEOUT_MS)
+        self.stdscr.keypad(True)
+
+    def send(self, command):
+        """Send one command line to the server."""
+        self.outbox += command.encode() + b'\n'
+        self.flush()
+
+    def flush(self):
+        """Write as much of the queued commands as the non-blocking socket takes."""
+        if not self.outbox:
+            return
+        try:
+            sent = self.sock.send(self.outbox)
+        except BlockingIOError:
+            return
+        self.outbox = self.outbox[sent:]
+
+    def receive(self):
+        """Return the messages received since the last call, or None if the server closed."""
+        try:
+            data = self.sock.recv(65536)
+        except BlockingIOError:
+            return []
+        if not data:
+            return None
+        lines = (self.buffer + data).split(b'\n')
+        self.buffer = lines.pop()
+        return [json.loads(line) for line in lines if line]
+
+    def handle(self, message):
+        """Apply one server message to the screen."""
+        kind = message['t']
+        if kind == 'hello':
+            height = message['height']
+            self.width = message['width']
+            self.window = curses.newwin(height, self.width, 2, 0)
+            self.window.box()
+        elif kind == 'frame' and self.window is not None:
+            self.draw_frame(message)
+        elif kind == 'over':
+            # No frame follows, so show the status now
+            self.score = message['score']
+            self.status = f"GAME OVER - score {message['score']} - R: Restart, Q: Quit"
+            self.draw_status()
+            curses.doupdate()
+
+    def draw_frame(self, frame):
+        """Draw the cells of a frame, clearing the play area first for a full frame."""
+        window = self.window
+        if frame['full']:
+            window.erase()
+            window.box()
+            self.drawn_head = None
+            self.status = ""
+
+        width = self.width
+        cells = frame['cells']
+        for i in range(0, len(cells), 2):
+            y, x = divmod(cells[i], width)
+            char, attr = CELL_CHARS.get(cells[i + 1], CELL_CHARS[EMPTY])
+            window.addch(y, x, char, attr)
+
+        # Cells only carry states, so demote the previous head and mark the new one
+        if self.drawn_head is not None and self.drawn_head != frame['head']:
+            old_y, old_x = divmod(self.drawn_head, width)
+            window.addch(old_y, old_x, CELL_CHARS[SNAKE][0])
+        head_y, head_x = divmod(frame['head'], width)
+        window.addch(head_y, head_x, 'O', curses.A_BOLD)
+        self.drawn_head = frame['head']
+
+        self.score = frame['score']
+        self.level = frame['level']
+        self.draw_status()
+        window.noutrefresh()
+        curses.doupdate()
+
+    def draw_status(self):
+        """Draw the status line above the play area (shown at the next doupdate)."""
+        self.stdscr.move(0, 0)
+        self.stdscr.clrtoeol()
+        self.stdscr.addstr(0, 0, f"Score: {self.score} | Level: {self.level}  {self.status}")
+        self.stdscr.noutrefresh()
+
+    def run(self):
+        """Forward keys and draw frames until the user quits or the server goes away."""
+        while True:
+            key = self.stdscr.getch()
+            command = KEY_COMMANDS.get(key)
+            if command is not None:
+                self.send(command)
+                if command == 'quit':
+                    return
+            self.flush()
+            messages = self.receive()
+            if messages is None:
+                return
+            for message in messages:
+                self.handle(message)
+
+
+def connect(args):
+    """Open a socket to the server named by the command line arguments."""
+    if args.unix:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(args.unix)
+    else:
+        sock = socket.create_connection((args.host, args.port))
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return sock
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Play snake on a game server.")
+    parser.add_argument('--unix', metavar='PATH', help="connect to a Unix socket")
+    parser.add_argument('--host', default='127.0.0.1', help="server address (default: loopback)")
+    parser.add_argument('--port', type=int, default=7777, help="server TCP port (default: 7777)")
+    return parser.parse_args(argv)
+
+
+def main(stdscr, sock):
+    """Main entry point for the client."""
+    SnakeClient(stdscr, sock).run()
+
+
+def main_wrapper():
+    """Wrapper function for poetry script entry point."""
+    args = parse_args()
+    try:
+        sock = connect(args)
+    except OSError as e:
+        print(f"Could not connect to the server: {e}")
+        return
+    try:
+        curses.wrapper(main, sock)
+    except KeyboardInterrupt:
+        print("\nGame terminated by user.")
+    except OSError as e:
+        print(f"Lost the connection to the server: {e}")
+    except curses.error as e:
+        print(f"Could not draw the game (is the terminal large enough?): {e}")
+    finally:
+        sock.close()
+
+
+if __name__ == "__main__":
+    main_wrapper()
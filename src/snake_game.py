@@ -4,17 +4,64 @@
 A classic snake game implementation using Python's curses library.
 """
 
-import curses
-import random
-import json
+import sys
 import os
+import curses
+import time
+import types
 from collections import deque
-from datetime import datetime
+
+# Add the current directory to the path to import modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Only what the first frame needs is imported here; the leaderboard, replay,
+# arena, broadcast and Hamiltonian modules load when first used
+from modules.board import SNAKE, OBSTACLE, FOOD
+from modules.game_clock import GameClock
+from modules.game_config import (
+    REFRESH_RATE_MS, SCORE_FILE, LEADERBOARD_FILE, LEADERBOARD_DB, LEADERBOARD_SIZE, HAMILTONIAN_CACHE_DIR,
+    CHUNKED_BOARD_CELLS, MIN_SCREEN_HEIGHT, MIN_SCREEN_WIDTH
+)
+from modules.input_queue import InputQueue
+from modules.perf_stats import PerfMonitor
+from modules.persistence import PersistenceWorker, atomic_write
+from modules.game_engine import GameState, UP, DOWN, LEFT, RIGHT, LEVEL_UP
+from modules.world import Camera, ChunkedBoard
+
+# Seconds between updates of the performance overlay text
+OVERLAY_REFRESH = 0.25
+
+# Options of a plain start; without arguments they are used without loading argparse
+DEFAULT_OPTIONS = {
+    'record': None,
+    'replay': None,
+    'speed': 1.0,
+    'autopilot': False,
+    'hamiltonian': False,
+    'world': None,
+    'arena': 0,
+    'broadcast': None,
+    'broadcast_port': None,
+    'perf_log': None
+}
+
+# Arrow keys mapped to engine directions
+KEY_DIRECTIONS = {
+    curses.KEY_UP: UP,
+    curses.KEY_DOWN: DOWN,
+    curses.KEY_LEFT: LEFT,
+    curses.KEY_RIGHT: RIGHT
+}
 
 
 class SnakeGame:
     """Main Snake Game class handling game logic and rendering."""
 
+    # Fixed HUD text
+    TITLE = " SNAKE GAME "
+    INSTRUCTIONS = "Arrow Keys | Q: Quit | R: Restart | P: Pause | S: Skin | O: Stats | A: Auto"
+    PAUSE_TEXT = "*** PAUSED ***"
+
     # Snake skin options
     SKINS = {
         'classic': {'head': 'O', 'body': 'o'},
@@ -23,203 +70,523 @@ class SnakeGame:
         'dots': {'head': '●', 'body': '○'}
     }
 
-    def __init__(self, stdscr):
-        """Initialize the game with curses screen."""
+    def __init__(self, stdscr, record_file=None, replay=None, replay_speed=1.0, persistence=None,
+                 autopilot=False, hamiltonian=False, world_size=None, arena_bots=0, broadcast_file=None,
+                 broadcast_port=None):
+        """Initialize the game with curses screen.
+
+        With record_file set, each game is saved there as a replay. With a
+        Replay given, that game is played back at replay_speed times the
+        normal speed instead of taking arrow key input. Scores and replays
+        are written by the persistence worker, a new one unless given.
+        With autopilot set, the game starts steered by the autopilot, which
+        follows a Hamiltonian cycle instead of searching for the food if
+        hamiltonian is set. world_size, a (height, width) pair, plays on a
+        world of that size instead of one filling the terminal; a camera
+        following the head shows the part that fits. Replays are played on
+        the world they were recorded on. With arena_bots set, the player
+        shares the world with that many bot snakes. broadcast_file and
+        broadcast_port stream the game to spectators through a file and a
+        TCP port on the loopback interface.
+
+        A world filling the terminal is resized with it. Other worlds
+        (given, replayed, recorded, broadcast, arena or Hamiltonian ones)
+        keep their size and the camera shows the part that fits.
+        """
         self.stdscr = stdscr
-        self.score = 0
         self.high_score = 0
-        self.level = 1
-        self.obstacles = []
         self.current_skin = 'classic'
         self.paused = False
-        self.leaderboard_file = os.path.expanduser('~/.snake_game_leaderboard.json')
 
-        # Load leaderboard
-        self.leaderboard = self.load_leaderboard()
-        if self.leaderboard:
-            self.high_score = self.leaderboard[0]['score']
+        # Replay recording and playback
+        self.record_file = record_file
+        self.recorder = None
+        self.replay = replay
+        self.replay_speed = replay_speed
+
+        # Spectator frame stream, opened once the world size is known
+        self.broadcaster = None
+
+        # Loop timing statistics and the optional overlay showing them
+        self.perf = PerfMonitor()
+        self.show_overlay = False
+        self.overlay_text = ""
+        self.overlay_updated = 0.0
+
+        # Incremental rendering state
+        self.incremental_render = True
+        self.full_redraw = True
+        self.drawn_head = None
+        self.hud_text = {}
+        self.hud_key = None
+
+        # HUD cache statistics: frames that reused or rebuilt the score line, fields drawn
+        self.hud_hits = 0
+        self.hud_misses = 0
+        self.hud_writes = 0
+
+        # The leaderboard is loaded in the background once the first frame is up,
+        # and handed to the main loop through loaded_leaderboards
+        self.persistence = persistence or PersistenceWorker()
+        self.leaderboard_store = None
+        self.leaderboard = []
+        self.loaded_leaderboards = deque()
+
+        # Autopilot, created when first switched on (games it steered are not
+        # added to the leaderboard)
+        self.autopilot = None
+        if hamiltonian:
+            from modules.hamiltonian import HamiltonianSolver
+            self.autopilot = HamiltonianSolver(HAMILTONIAN_CACHE_DIR, self.persistence)
+        self.autopilot_enabled = False
+        if (autopilot or hamiltonian) and not replay:
+            self.enable_autopilot()
+        self.autopilot_used = False
+        self.autopilot_text = ""
 
         # Setup curses
         curses.curs_set(0)  # Hide cursor
         self.stdscr.nodelay(1)  # Non-blocking input
-        self.base_timeout = 100  # Base refresh rate in ms
-        self.stdscr.timeout(self.base_timeout)
+        self.base_timeout = REFRESH_RATE_MS  # Base refresh rate in ms
 
         # Get screen dimensions
         self.height, self.width = stdscr.getmaxyx()
+        self.layout_static_text()
+        self.too_small = False
+        self.resize_started = None
 
-        # Create game window
-        self.game_height = self.height - 5
-        self.game_width = self.width - 2
-        self.window = curses.newwin(self.game_height, self.game_width, 2, 1)
-        self.window.keypad(1)
-        self.window.timeout(self.base_timeout)
+        # The world fills the terminal unless given; the window shows as much as fits
+        self.world_follows_terminal = not (world_size or replay or record_file or hamiltonian or arena_bots
+                                           or broadcast_file or broadcast_port is not None)
+        if self.replay:
+            world_size = (self.replay.height, self.replay.width)
+        world_height, world_width = world_size or (self.height - 5, self.width - 2)
+        self.window = None
+        self.layout_window(world_height, world_width)
+
+        # Direction changes are buffered and applied one per tick
+        self.input_queue = InputQueue()
+
+        # Simulation ticks run on a fixed schedule, independent of input
+        self.clock = GameClock(self.base_timeout)
 
         # Initialize game state
+        self.arena = arena_bots > 0
+        if self.arena:
+            if replay or record_file or autopilot or hamiltonian or broadcast_file or broadcast_port is not None:
+                raise ValueError("Arena games cannot be recorded, replayed, broadcast or played by the autopilot")
+            from modules.arena import Arena
+            self.state = Arena(world_height, world_width, bots=arena_bots, track_changes=True)
+        else:
+            progression = self.replay.progression if self.replay else True
+            self.state = GameState(world_height, world_width, progression=progression, track_changes=True)
+        if broadcast_file or broadcast_port is not None:
+            from modules.frame_stream import FrameBroadcaster
+            self.broadcaster = FrameBroadcaster(world_height, world_width, broadcast_file, broadcast_port)
         self.reset_game()
 
+        # The autopilots search the flat grid of a single-snake game
+        self.autopilot_available = not isinstance(self.board, ChunkedBoard) and not self.arena
+        if (autopilot or hamiltonian) and not self.autopilot_available:
+            raise ValueError(f"The autopilot needs a world of at most {CHUNKED_BOARD_CELLS} cells")
+
+        # Load or build the cycle for this world size before the first tick
+        if hamiltonian:
+            self.autopilot.cycle_for(world_height, world_width, [])
+
+    @property
+    def snake(self):
+        """The player's body as a SnakeBody ring buffer of packed y * width + x cell indices, head first."""
+        return self.state.snake
+
+    @property
+    def food(self):
+        """Current food position, or None once the board is full."""
+        return self.state.food
+
+    @property
+    def obstacles(self):
+        """List of obstacle positions."""
+        return self.state.obstacles
+
+    @property
+    def board(self):
+        """Occupancy grid of the play area."""
+        return self.state.board
+
+    @property
+    def score(self):
+        """Current score."""
+        return self.state.score
+
+    @property
+    def level(self):
+        """Current level."""
+        return self.state.level
+
+    @property
+    def won(self):
+        """True if the last game ended with the board full."""
+        return self.state.won
+
     def reset_game(self):
         """Reset game state for a new game."""
-        # Snake starts in the middle
-        start_y = self.game_height // 2
-        start_x = self.game_width // 2
-
-        # Snake body (deque of [y, x] coordinates)
-        self.snake = deque([
-            [start_y, start_x],
-            [start_y, start_x - 1],
-            [start_y, start_x - 2]
-        ])
-
-        # Initial direction (right)
-        self.direction = curses.KEY_RIGHT
-        self.last_direction = self.direction
-
-        # Reset game state
-        self.score = 0
-        self.level = 1
+        # A new game fits the terminal again, even if the last snake kept the world larger
+        if self.world_follows_terminal and not self.too_small:
+            self.state.reset(size=(self.height - 5, self.width - 2))
+            self.layout_window(self.state.height, self.state.width)
+        else:
+            self.state.reset(self.replay.seed if self.replay else None)
+        self.input_queue.clear()
+        if self.autopilot:
+            self.autopilot.reset()
+        self.autopilot_used = False
         self.paused = False
-        self.obstacles = []
 
-        # Generate first food
-        self.food = self.generate_food()
+        # Record each game separately
+        if self.record_file:
+            from modules.replay import ReplayRecorder
+            self.recorder = ReplayRecorder(self.state)
+
+        # Spectators get a keyframe of the new game
+        if self.broadcaster:
+            self.broadcaster.publish(self.state)
 
-        # Update game speed
+        # Update game speed and restart the tick schedule
         self.update_speed()
+        self.clock.reset()
+
+        # New board, so repaint everything on the next frame
+        self.full_redraw = True
 
     def update_speed(self):
         """Update game speed based on level."""
-        # Speed increases with level (timeout decreases)
-        timeout = max(50, self.base_timeout - (self.level - 1) * 10)
-        self.window.timeout(timeout)
-        self.stdscr.timeout(timeout)
+        # Speed increases with level (tick interval decreases)
+        self.clock.set_interval(self.state.tick_interval() / self.replay_speed)
 
     def calculate_level(self):
         """Calculate current level based on score."""
-        new_level = (self.score // 50) + 1
-        if new_level > self.level:
-            self.level = new_level
+        if self.state.calculate_level():
             self.update_speed()
-            self.add_obstacles()
 
     def add_obstacles(self):
         """Add obstacles as level increases."""
-        # Add obstacles starting from level 3
-        if self.level >= 3 and len(self.obstacles) < (self.level - 2) * 2:
-            for _ in range(2):
-                obstacle = self.generate_obstacle()
-                if obstacle:
-                    self.obstacles.append(obstacle)
+        self.state.add_obstacles()
 
     def generate_obstacle(self):
-        """Generate an obstacle at a random position."""
-        max_attempts = 100
-        for _ in range(max_attempts):
-            obs_y = random.randint(2, self.game_height - 3)
-            obs_x = random.randint(2, self.game_width - 3)
-            obstacle = [obs_y, obs_x]
-
-            # Check if position is clear
-            if (obstacle not in self.snake and
-                    obstacle != self.food and
-                    obstacle not in self.obstacles):
-                return obstacle
-        return None
+        """Generate an obstacle at a random free position away from the walls."""
+        return self.state.generate_obstacle()
+
+    def open_leaderboard_store(self):
+        """Open the score database, importing the old JSON score files once.
+
+        Runs on the persistence thread, which also takes the sqlite3 import.
+        """
+        from modules.leaderboard_store import LeaderboardStore
+        store = LeaderboardStore(LEADERBOARD_DB)
+        store.migrate_leaderboard_file(LEADERBOARD_FILE)
+        store.migrate_high_score_file(SCORE_FILE)
+        self.leaderboard_store = store
+        self.load_leaderboard()
+
+    def get_leaderboard_store(self):
+        """Return the score database, opening it if that has not succeeded yet. Runs on the persistence thread."""
+        if self.leaderboard_store is None:
+            self.open_leaderboard_store()
+        return self.leaderboard_store
 
     def load_leaderboard(self):
-        """Load leaderboard from file."""
-        try:
-            if os.path.exists(self.leaderboard_file):
-                with open(self.leaderboard_file, 'r') as f:
-                    return json.load(f)
-        except Exception:
-            pass
-        return []
-
-    def save_leaderboard(self):
-        """Save leaderboard to file."""
-        try:
-            with open(self.leaderboard_file, 'w') as f:
-                json.dump(self.leaderboard, f, indent=2)
-        except Exception:
-            pass
+        """Load the top scores from the score database. Runs on the persistence thread."""
+        self.loaded_leaderboards.append(self.get_leaderboard_store().top(LEADERBOARD_SIZE))
+
+    def apply_loaded_leaderboards(self):
+        """Take the leaderboards loaded on the persistence thread. Runs on the main thread."""
+        while self.loaded_leaderboards:
+            leaderboard = self.loaded_leaderboards.popleft()
+            self.leaderboard = leaderboard
+            if leaderboard and leaderboard[0]['score'] > self.high_score:
+                self.high_score = leaderboard[0]['score']
+
+    def save_score(self, entry):
+        """Add a finished game to the score database. Runs on the persistence thread."""
+        self.get_leaderboard_store().add_score(entry['score'], entry['level'], entry['date'])
 
     def update_leaderboard(self, score):
         """Update leaderboard with new score."""
+        from datetime import datetime
         entry = {
             'score': score,
             'level': self.level,
             'date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         }
 
-        self.leaderboard.append(entry)
-        self.leaderboard.sort(key=lambda x: x['score'], reverse=True)
-        self.leaderboard = self.leaderboard[:10]  # Keep top 10
-        self.save_leaderboard()
+        # Show the score right away; the database write happens in the background
+        self.apply_loaded_leaderboards()
+        self.leaderboard = sorted(self.leaderboard + [entry], key=lambda x: x['score'],
+                                  reverse=True)[:LEADERBOARD_SIZE]
+        self.persistence.submit(lambda: self.save_score(entry), description=f"Saving the score {score}")
+        self.persistence.submit(self.load_leaderboard, key='load_leaderboard', description="Loading the leaderboard")
 
         if score > self.high_score:
             self.high_score = score
 
     def generate_food(self):
-        """Generate food at a random position not occupied by snake or obstacles."""
-        max_attempts = 1000
-        for _ in range(max_attempts):
-            food_y = random.randint(1, self.game_height - 2)
-            food_x = random.randint(1, self.game_width - 2)
-            food = [food_y, food_x]
-
-            if food not in self.snake and food not in self.obstacles:
-                return food
-        # Fallback: return any valid position
-        return [self.game_height // 2, self.game_width // 2]
+        """Generate food at a random free position, or None if the board is full."""
+        return self.state.generate_food()
 
-    def draw_border(self):
-        """Draw game border and title."""
-        # Title
-        title = " SNAKE GAME "
-        self.stdscr.addstr(0, self.width // 2 - len(title) // 2, title, curses.A_BOLD)
+    def render(self):
+        """Draw one frame, repainting only what changed since the last one."""
+        if self.too_small:
+            self.draw_too_small()
+            return
+
+        # Scrolling the view repaints it, so it jumps a quarter view at a time
+        head_y, head_x = divmod(self.snake.head, self.state.width)
+        if self.camera.follow(head_y, head_x, self.state.height, self.state.width):
+            self.full_redraw = True
 
-        # Instructions
-        instructions = "Arrow Keys | Q: Quit | R: Restart | P: Pause | S: Skin"
-        self.stdscr.addstr(1, self.width // 2 - len(instructions) // 2, instructions)
+        if self.full_redraw or not self.incremental_render:
+            self.stdscr.clear()
+            self.window.clear()
+            self.hud_text = {}
+            self.hud_key = None
+            self.draw_border()
+            if self.arena:
+                self.draw_view()
+            else:
+                self.draw_snake()
+                self.draw_food()
+                self.draw_obstacles()
+            self.board.take_dirty()
+            self.full_redraw = False
+        else:
+            self.draw_hud()
+            self.draw_changes()
+        self.drawn_head = self.snake.head
+
+        # Batch both windows into a single terminal update
+        self.stdscr.noutrefresh()
+        self.window.noutrefresh()
+        curses.doupdate()
+
+        if self.resize_started is not None:
+            self.perf.record('resize', time.monotonic() - self.resize_started)
+            self.resize_started = None
+
+    def layout_static_text(self):
+        """Place the title, instructions and pause indicator for the screen width."""
+        # Text wider than the screen is cut off instead of starting off screen
+        self.static_text = [
+            (y, max(0, self.width // 2 - len(text) // 2), text[:self.width], attr)
+            for y, text, attr in ((0, self.TITLE, curses.A_BOLD), (1, self.INSTRUCTIONS, curses.A_NORMAL))
+        ]
+        self.pause_x = self.width // 2 - len(self.PAUSE_TEXT) // 2
+
+    def layout_window(self, world_height, world_width):
+        """Size the game window and camera to show as much of a world as fits on the screen."""
+        self.game_height = min(world_height, self.height - 5)
+        self.game_width = min(world_width, self.width - 2)
+        if self.window is None:
+            self.window = curses.newwin(self.game_height, self.game_width, 2, 1)
+            self.window.keypad(1)
+        else:
+            self.window.resize(self.game_height, self.game_width)
+            self.window.mvwin(2, 1)
+
+        # Maps world positions inside the border to window positions
+        self.camera = Camera(self.game_height - 2, self.game_width - 2)
+
+    def handle_resize(self):
+        """Lay the screen out again after the terminal was resized, keeping the game going.
+
+        A world filling the terminal is resized to the new size (see
+        GameState.resize()). Below MIN_SCREEN_HEIGHT x MIN_SCREEN_WIDTH
+        the game pauses with a notice until the terminal grows again.
+        """
+        self.resize_started = time.monotonic()
+        self.height, self.width = self.stdscr.getmaxyx()
+        self.layout_static_text()
+        self.full_redraw = True
+        self.too_small = self.height < MIN_SCREEN_HEIGHT or self.width < MIN_SCREEN_WIDTH
+        if self.too_small:
+            return
+        if self.world_follows_terminal and self.state.resize(self.height - 5, self.width - 2) and self.autopilot:
+            self.autopilot.reset()
+        self.layout_window(self.state.height, self.state.width)
+
+    def enable_autopilot(self):
+        """Let the autopilot steer, creating it on first use."""
+        if self.autopilot is None:
+            from modules.autopilot import Autopilot
+            self.autopilot = Autopilot()
+        self.autopilot_enabled = True
+
+    def draw_too_small(self):
+        """Ask for a larger terminal in place of the game."""
+        self.stdscr.erase()
+        text = f"Terminal too small: resize to at least {MIN_SCREEN_WIDTH}x{MIN_SCREEN_HEIGHT}"
+        self.stdscr.addstr(0, 0, text[:self.width - 1])
+        self.stdscr.refresh()
 
-        # Score and level
-        score_text = f"Score: {self.score} | Level: {self.level} | Skin: {self.current_skin}"
-        self.stdscr.addstr(self.height - 2, 2, score_text)
+    def draw_border(self):
+        """Draw game border and title."""
+        # Title and instructions
+        for y, x, text, attr in self.static_text:
+            self.stdscr.addstr(y, x, text, attr)
 
-        high_score_text = f"High Score: {self.high_score}"
-        self.stdscr.addstr(self.height - 2, self.width - len(high_score_text) - 2, high_score_text)
+        # Score, level and pause indicator
+        self.draw_hud()
 
         # Draw border
         self.window.border()
 
-        # Show pause indicator if paused
-        if self.paused:
-            pause_text = "*** PAUSED ***"
-            self.stdscr.addstr(self.height - 1, self.width // 2 - len(pause_text) // 2, pause_text, curses.A_BOLD)
+    def draw_hud(self):
+        """Draw score, level and pause indicator, skipping unchanged text."""
+        # The score line is only formatted again when one of its values changed
+        snakes = self.state.alive_count() if self.arena else None
+        key = (self.score, self.high_score, self.level, self.current_skin, self.paused, snakes)
+        if key == self.hud_key:
+            self.hud_hits += 1
+        else:
+            self.hud_key = key
+            self.hud_misses += 1
+            score_text = f"Score: {self.score} | Level: {self.level} | Skin: {self.current_skin}"
+            if snakes is not None:
+                score_text += f" | Snakes: {snakes}"
+            self.draw_hud_text('score', self.height - 2, 2, score_text)
+
+            high_score_text = f"High Score: {self.high_score}"
+            self.draw_hud_text('high_score', self.height - 2, self.width - len(high_score_text) - 2, high_score_text)
+
+            # Show pause indicator if paused
+            pause_text = self.PAUSE_TEXT if self.paused else ""
+            self.draw_hud_text('pause', self.height - 1, self.pause_x, pause_text, curses.A_BOLD)
+
+        # Performance overlay on the free line below the game window
+        self.refresh_stats_text()
+        self.draw_hud_text('overlay', self.height - 3, 2, self.overlay_text if self.show_overlay else "")
+        self.draw_hud_text('autopilot', self.height - 1, 2, self.autopilot_text if self.autopilot_enabled else "")
+
+        # Where the head and food are when the world does not fit the window
+        if self.state.height > self.game_height or self.state.width > self.game_width:
+            head_y, head_x = divmod(self.snake.head, self.state.width)
+            position_text = f"Head {head_y},{head_x}"
+            if self.food is not None:
+                position_text += f" | Food {self.food[0]},{self.food[1]}"
+            self.draw_hud_text('position', self.height - 1, self.width - len(position_text) - 2, position_text)
+
+    def refresh_stats_text(self):
+        """Rebuild the overlay and autopilot status texts a few times per second."""
+        now = time.monotonic()
+        if now - self.overlay_updated < OVERLAY_REFRESH:
+            return
+        self.overlay_updated = now
+        self.overlay_text = (
+            f"tick {self.perf.mean_ms('tick'):.2f}ms | "
+            f"render {self.perf.mean_ms('render'):.2f}ms | "
+            f"latency {self.perf.mean_ms('input_latency'):.0f}ms | "
+            f"tps {self.perf.tick_rate():.1f}/{1 / self.clock.interval:.1f} | "
+            f"length {len(self.snake)} | "
+            f"hud {self.hud_hit_rate():.0%} cached"
+        )[:self.width - 4]
+        self.autopilot_text = f"AUTOPILOT {self.perf.mean_ms('autopilot'):.2f}ms/tick"
+
+    def hud_hit_rate(self):
+        """Return the fraction of frames that reused the formatted score line."""
+        frames = self.hud_hits + self.hud_misses
+        return self.hud_hits / frames if frames else 0.0
+
+    def draw_hud_text(self, key, y, x, text, attr=curses.A_NORMAL):
+        """Draw a HUD field if its text or position changed, erasing the old text."""
+        previous = self.hud_text.get(key)
+        if previous == (y, x, text):
+            return
+        if previous is not None and previous[2]:
+            old_y, old_x, old_text = previous
+            self.stdscr.addstr(old_y, old_x, " " * len(old_text))
+        if text:
+            self.stdscr.addstr(y, x, text, attr)
+        self.hud_text[key] = (y, x, text)
+        self.hud_writes += 1
+
+    def draw_changes(self):
+        """Repaint the visible cells changed since the last frame and move the head marker."""
+        skin = self.SKINS[self.current_skin]
+        board = self.board
+        width = board.width
+        top, left = self.camera.top - 1, self.camera.left - 1
+        view_height, view_width = self.camera.height, self.camera.width
+        for index in board.take_dirty():
+            y, x = divmod(index, width)
+            # Window position; changes outside the view are dropped
+            win_y, win_x = y - top, x - left
+            if not (0 < win_y <= view_height and 0 < win_x <= view_width):
+                continue
+            state = board.get(y, x)
+            if state == SNAKE:
+                self.window.addch(win_y, win_x, skin['body'])
+            elif state == FOOD:
+                self.window.addch(win_y, win_x, '*', curses.A_BOLD)
+            elif state == OBSTACLE:
+                self.window.addch(win_y, win_x, '#', curses.A_BOLD)
+            else:
+                self.window.addch(win_y, win_x, ' ')
+
+        # Demote the previous head to a body segment
+        head = self.snake.head
+        if self.drawn_head is not None and self.drawn_head != head:
+            old_y, old_x = divmod(self.drawn_head, width)
+            if board.get(old_y, old_x) == SNAKE and self.camera.is_visible(old_y, old_x):
+                self.window.addch(old_y - top, old_x - left, skin['body'])
+
+        head_y, head_x = divmod(head, width)
+        self.window.addch(head_y - top, head_x - left, skin['head'], curses.A_BOLD)
+
+    def draw_cell(self, y, x, char, attr=curses.A_NORMAL):
+        """Draw a character at a world position if it is in view."""
+        if self.camera.is_visible(y, x):
+            self.window.addch(y - self.camera.top + 1, x - self.camera.left + 1, char, attr)
+
+    def draw_view(self):
+        """Draw every occupied cell in view from the board (all of an arena's snakes and food)."""
+        skin = self.SKINS[self.current_skin]
+        chars = {SNAKE: (skin['body'], curses.A_NORMAL), FOOD: ('*', curses.A_BOLD), OBSTACLE: ('#', curses.A_BOLD)}
+        camera = self.camera
+        get = self.board.get
+        for win_y in range(1, camera.height + 1):
+            y = camera.top + win_y - 1
+            for win_x in range(1, camera.width + 1):
+                char = chars.get(get(y, camera.left + win_x - 1))
+                if char is not None:
+                    self.window.addch(win_y, win_x, char[0], char[1])
+        head_y, head_x = divmod(self.snake.head, self.state.width)
+        self.draw_cell(head_y, head_x, skin['head'], curses.A_BOLD)
 
     def draw_snake(self):
         """Draw the snake on the screen."""
         skin = self.SKINS[self.current_skin]
-        for i, segment in enumerate(self.snake):
-            y, x = segment
+        width = self.state.width
+        for i, cell in enumerate(self.snake.indices()):
+            y, x = divmod(cell, width)
             if i == 0:
                 # Head of snake
-                self.window.addch(y, x, skin['head'], curses.A_BOLD)
+                self.draw_cell(y, x, skin['head'], curses.A_BOLD)
             else:
                 # Body of snake
-                self.window.addch(y, x, skin['body'])
+                self.draw_cell(y, x, skin['body'])
 
     def draw_obstacles(self):
         """Draw obstacles on the screen."""
         for obstacle in self.obstacles:
             y, x = obstacle
-            self.window.addch(y, x, '#', curses.A_BOLD)
+            self.draw_cell(y, x, '#', curses.A_BOLD)
 
     def draw_food(self):
-        """Draw food on the screen."""
+        """Draw food on the screen (there is none once the board is full)."""
+        if self.food is None:
+            return
         y, x = self.food
-        self.window.addch(y, x, '*', curses.A_BOLD)
+        self.draw_cell(y, x, '*', curses.A_BOLD)
 
     def get_input(self):
         """Get user input and update direction."""
@@ -242,20 +609,40 @@ class SnakeGame:
         # Check for skin change
         if key in [ord('s'), ord('S')]:
             self.change_skin()
+            self.full_redraw = True
+            return True
+
+        # Check for performance overlay toggle
+        if key in [ord('o'), ord('O')]:
+            self.show_overlay = not self.show_overlay
+            self.overlay_updated = 0.0
+            return True
+
+        # Check for autopilot toggle
+        if key in [ord('a'), ord('A')] and not self.replay and self.autopilot_available:
+            if self.autopilot_enabled:
+                self.autopilot_enabled = False
+            else:
+                self.enable_autopilot()
+            self.input_queue.clear()
+            self.overlay_updated = 0.0
             return True
 
         # Check for leaderboard view
         if key in [ord('l'), ord('L')]:
             self.show_leaderboard()
+            self.full_redraw = True
+            self.clock.reset()
             return True
 
-        # Update direction (prevent 180-degree turns) only if not paused
-        if not self.paused and key in [curses.KEY_UP, curses.KEY_DOWN, curses.KEY_LEFT, curses.KEY_RIGHT]:
-            if (key == curses.KEY_UP and self.last_direction != curses.KEY_DOWN) or \
-               (key == curses.KEY_DOWN and self.last_direction != curses.KEY_UP) or \
-               (key == curses.KEY_LEFT and self.last_direction != curses.KEY_RIGHT) or \
-               (key == curses.KEY_RIGHT and self.last_direction != curses.KEY_LEFT):
-                self.direction = key
+        # Lay the screen out again for the new terminal size
+        if key == curses.KEY_RESIZE:
+            self.handle_resize()
+            return True
+
+        # Queue direction change (prevent 180-degree turns) only if not paused
+        if not self.paused and not self.replay and not self.autopilot_enabled and key in KEY_DIRECTIONS:
+            self.input_queue.push(KEY_DIRECTIONS[key], self.state.direction)
 
         return True
 
@@ -267,18 +654,23 @@ class SnakeGame:
 
     def show_leaderboard(self):
         """Display the leaderboard."""
+        if self.too_small:
+            return
+        self.apply_loaded_leaderboards()
         self.window.clear()
         self.window.border()
 
-        title = "=== LEADERBOARD (Top 10) ==="
+        title = f"=== LEADERBOARD (Top {LEADERBOARD_SIZE}) ==="
         self.window.addstr(2, self.game_width // 2 - len(title) // 2, title, curses.A_BOLD)
 
         if not self.leaderboard:
             no_scores = "No scores yet!"
             self.window.addstr(4, self.game_width // 2 - len(no_scores) // 2, no_scores)
         else:
-            for i, entry in enumerate(self.leaderboard[:10]):
-                score_line = f"{i+1:2d}. Score: {entry['score']:4d} | Level: {entry['level']:2d} | {entry['date']}"
+            for i, entry in enumerate(self.leaderboard[:LEADERBOARD_SIZE]):
+                # Scores imported from the old high score file have no level or date
+                level = f"{entry['level']:2d}" if entry['level'] is not None else "--"
+                score_line = f"{i+1:2d}. Score: {entry['score']:4d} | Level: {level} | {entry['date'] or ''}"
                 if i + 4 < self.game_height - 2:
                     self.window.addstr(i + 4, 3, score_line)
 
@@ -287,83 +679,96 @@ class SnakeGame:
 
         self.window.refresh()
         self.window.nodelay(0)
-        self.window.getch()
+        if self.window.getch() == curses.KEY_RESIZE:
+            self.handle_resize()
         self.window.nodelay(1)
 
-    def move_snake(self):
-        """Move snake in current direction."""
-        head = self.snake[0].copy()
-
-        # Calculate new head position
-        if self.direction == curses.KEY_UP:
-            head[0] -= 1
-        elif self.direction == curses.KEY_DOWN:
-            head[0] += 1
-        elif self.direction == curses.KEY_LEFT:
-            head[1] -= 1
-        elif self.direction == curses.KEY_RIGHT:
-            head[1] += 1
-
-        return head
-
     def check_collision(self, head):
         """Check if snake collided with wall, itself, or obstacles."""
-        y, x = head
-
-        # Check wall collision
-        if y <= 0 or y >= self.game_height - 1 or x <= 0 or x >= self.game_width - 1:
-            return True
-
-        # Check self collision
-        if head in self.snake:
-            return True
-
-        # Check obstacle collision
-        if head in self.obstacles:
-            return True
-
-        return False
+        return self.state.check_collision(head)
 
     def update(self):
-        """Update game state."""
-        # Don't update if paused
-        if self.paused:
+        """Update game state. Returns False when the game is over."""
+        # Don't update if paused or the game cannot be shown
+        if self.paused or self.too_small:
             return True
 
-        new_head = self.move_snake()
-
-        # Check collision
-        if self.check_collision(new_head):
-            return False
-
-        # Add new head
-        self.snake.appendleft(new_head)
-
-        # Check if food eaten
-        if new_head == self.food:
-            self.score += 10
-            self.food = self.generate_food()
-            # Calculate level progression
-            self.calculate_level()
-            # Snake grows (don't remove tail)
+        if self.replay:
+            if self.replay.is_finished(self.state):
+                return False
+            direction = self.replay.turn_at(self.state.ticks)
         else:
-            # Remove tail (snake moves)
-            self.snake.pop()
+            if self.autopilot_enabled:
+                direction = self.autopilot.next_direction(self.state)
+                self.perf.record('autopilot', self.autopilot.last_search_time)
+                self.autopilot_used = True
+                # Only turns are recorded, keeping replays compact
+                if direction == self.state.direction:
+                    direction = None
+            else:
+                direction = self.input_queue.pop()
+                if direction is not None:
+                    self.perf.record('input_latency', self.input_queue.latency_last)
+            if direction is not None and self.recorder:
+                self.recorder.record_turn(self.state.ticks, direction)
+
+        events = self.state.step(direction)
+        if self.broadcaster:
+            self.broadcaster.publish(self.state)
+
+        # Speed up after a level change
+        if LEVEL_UP in events:
+            self.update_speed()
 
-        # Update last direction
-        self.last_direction = self.direction
+        return not self.state.game_over
 
-        return True
+    def save_recording(self):
+        """Write the current game's replay to the record file, if recording."""
+        if self.recorder:
+            # Encode now, while the state matches; only the file write is deferred
+            data = self.recorder.to_bytes(self.state)
+            self.persistence.submit(lambda: atomic_write(self.record_file, data), key='replay',
+                                    description=f"Saving the replay {self.record_file}")
 
     def game_over_screen(self):
         """Display game over screen."""
-        # Update leaderboard
-        self.update_leaderboard(self.score)
+        # Update leaderboard (replays are not scored again, autopilot and arena games not at all)
+        if not self.replay:
+            self.save_recording()
+            if not self.autopilot_used and not self.arena:
+                self.update_leaderboard(self.score)
+
+        self.draw_game_over()
+
+        # Wait for R, L, or Q
+        self.window.nodelay(0)  # Blocking input
+        while True:
+            key = self.window.getch()
+            if key in [ord('r'), ord('R')]:
+                self.window.nodelay(1)  # Non-blocking input
+                self.reset_game()
+                return True
+            elif key in [ord('l'), ord('L')]:
+                self.show_leaderboard()
+                # Redraw game over screen after leaderboard
+                self.draw_game_over()
+            elif key == curses.KEY_RESIZE:
+                # Redraw the final board and game over screen at the new size
+                self.handle_resize()
+                self.render()
+                self.draw_game_over()
+            elif key in [ord('q'), ord('Q')]:
+                return False
+
+    def draw_game_over(self):
+        """Draw the game over screen over the game window."""
+        if self.too_small:
+            return
 
         self.window.clear()
         self.window.border()
 
-        game_over_text = "GAME OVER!"
+        game_over_text = "YOU WIN!" if self.won else "GAME OVER!"
         final_score_text = f"Final Score: {self.score} | Level: {self.level}"
 
         mid_y = self.game_height // 2
@@ -382,73 +787,152 @@ class SnakeGame:
 
         self.window.refresh()
 
-        # Wait for R, L, or Q
-        self.window.nodelay(0)  # Blocking input
+    def wait_for_tick(self):
+        """Handle input until the next tick is due. Returns False on quit."""
         while True:
-            key = self.window.getch()
-            if key in [ord('r'), ord('R')]:
-                self.window.nodelay(1)  # Non-blocking input
-                self.reset_game()
+            timeout = self.clock.ms_until_tick()
+            if timeout == 0:
                 return True
-            elif key in [ord('l'), ord('L')]:
-                self.show_leaderboard()
-                # Redraw game over screen after leaderboard
-                self.window.clear()
-                self.window.border()
-                self.window.addstr(mid_y - 2, mid_x - len(game_over_text) // 2, game_over_text, curses.A_BOLD)
-                self.window.addstr(mid_y, mid_x - len(final_score_text) // 2, final_score_text)
-                if self.score == self.high_score and self.score > 0:
-                    new_high_score_text = "NEW HIGH SCORE!"
-                    self.window.addstr(mid_y + 1, mid_x - len(new_high_score_text) // 2, new_high_score_text, curses.A_BOLD)
-                self.window.addstr(mid_y + 3, mid_x - len(restart_text) // 2, restart_text)
-                self.window.refresh()
-            elif key in [ord('q'), ord('Q')]:
+            self.window.timeout(timeout)
+            if not self.get_input():
                 return False
 
     def run(self):
         """Main game loop."""
-        running = True
-
-        while running:
-            # Clear screen
-            self.stdscr.clear()
-            self.window.clear()
-
-            # Draw everything
-            self.draw_border()
-            self.draw_snake()
-            self.draw_food()
-            self.draw_obstacles()
+        # Put the first frame up before the slow-to-import score database is opened
+        self.render()
+        self.persistence.submit(self.open_leaderboard_store, description="Opening the score database")
 
-            # Refresh
-            self.stdscr.refresh()
-            self.window.refresh()
-
-            # Get input
-            if not self.get_input():
+        while True:
+            self.apply_loaded_leaderboards()
+
+            # Draw what changed since the last frame, unless running behind
+            if self.clock.should_render():
+                render_start = time.monotonic()
+                self.render()
+                render_time = time.monotonic() - render_start
+                self.clock.record_render(render_time)
+                self.perf.record('render', render_time)
+
+            # Get input until the next tick
+            wait_start = time.monotonic()
+            if not self.wait_for_tick():
+                if not self.replay:
+                    self.save_recording()
                 break
-
-            # Update game state
-            if not self.update():
-                # Game over
-                if not self.game_over_screen():
+            self.perf.record('idle', time.monotonic() - wait_start)
+
+            # Update game state once per due tick
+            for _ in range(self.clock.due_ticks()):
+                tick_start = time.monotonic()
+                alive = self.update()
+                self.perf.record_tick(time.monotonic() - tick_start)
+                if not alive:
+                    # Game over
+                    if not self.game_over_screen():
+                        return
                     break
 
 
-def main(stdscr):
-    """Main entry point for the game."""
-    game = SnakeGame(stdscr)
-    game.run()
+def world_size(text):
+    """Parse a WIDTHxHEIGHT world size into a (height, width) pair."""
+    import argparse
+    try:
+        width, height = (int(part) for part in text.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got {text!r}")
+    if width < 8 or height < 8:
+        raise argparse.ArgumentTypeError("the world must be at least 8x8")
+    return height, width
+
+
+def replay_speed(text):
+    """Parse a replay speed multiplier, which must be positive."""
+    import argparse
+    try:
+        speed = float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a number, got {text!r}")
+    if not 0 < speed < float('inf'):
+        raise argparse.ArgumentTypeError(f"the speed must be a positive number, got {text!r}")
+    return speed
+
+
+def parse_args(argv=None):
+    """Parse command line options (sys.argv unless given)."""
+    if argv is None:
+        argv = sys.argv[1:]
+    if not argv:
+        # argparse and the re module it needs are a large part of the startup time
+        return types.SimpleNamespace(**DEFAULT_OPTIONS)
+
+    import argparse
+    parser = argparse.ArgumentParser(description="Terminal snake game.")
+    parser.set_defaults(**DEFAULT_OPTIONS)
+    parser.add_argument('--record', metavar='FILE', help="save each game as a replay file")
+    parser.add_argument('--replay', metavar='FILE', help="play back a replay file")
+    parser.add_argument('--speed', type=replay_speed,
+                        help="replay speed multiplier (default: 1.0)")
+    parser.add_argument('--autopilot', action='store_true', help="start with the autopilot steering")
+    parser.add_argument('--hamiltonian', action='store_true',
+                        help="autopilot follows a Hamiltonian cycle (implies --autopilot)")
+    parser.add_argument('--world', metavar='WxH', type=world_size,
+                        help="play on a world of this size, scrolling if larger than the terminal")
+    parser.add_argument('--arena', metavar='BOTS', type=int,
+                        help="share the world with this many bot snakes")
+    parser.add_argument('--broadcast', metavar='FILE',
+                        help="stream the game to spectators through a file (watch it with snake_viewer.py)")
+    parser.add_argument('--broadcast-port', metavar='PORT', type=int,
+                        help="stream the game to spectators connecting to this TCP port on the loopback interface")
+    parser.add_argument('--perf-log', metavar='FILE',
+                        help="write frame timing statistics as JSON lines on exit")
+    return parser.parse_args(argv)
+
+
+def main(stdscr, args=None, persistence=None):
+    """Main entry point for the game.
+
+    Pending writes go to the given persistence worker; without one they
+    are flushed before returning.
+    """
+    if args is None:
+        args = parse_args([])
+    replay = None
+    if args.replay:
+        from modules.replay import Replay
+        replay = Replay.load(args.replay)
+    game = SnakeGame(stdscr, record_file=args.record, replay=replay, replay_speed=args.speed,
+                     persistence=persistence, autopilot=args.autopilot, hamiltonian=args.hamiltonian,
+                     world_size=args.world, arena_bots=args.arena, broadcast_file=args.broadcast,
+                     broadcast_port=args.broadcast_port)
+    try:
+        game.run()
+    finally:
+        if game.broadcaster:
+            game.broadcaster.close()
+        if args.perf_log:
+            game.persistence.submit(lambda: game.perf.dump(args.perf_log),
+                                    description=f"Writing the perf log {args.perf_log}")
+        if persistence is None:
+            game.persistence.close()
 
 
 def main_wrapper():
     """Wrapper function for poetry script entry point."""
+    args = parse_args()
+    persistence = PersistenceWorker()
     try:
-        curses.wrapper(main)
+        curses.wrapper(main, args, persistence)
     except KeyboardInterrupt:
         print("\nGame terminated by user.")
     except Exception as e:
         print(f"An error occurred: {e}")
+    finally:
+        # Finish pending score and replay writes once the terminal is restored
+        if not persistence.close():
+            print("Warning: some scores or replays could not be saved in time.")
+        for failure in persistence.failures:
+            print(f"Warning: {failure}")
 
 
 if __name__ == "__main__":
@@ -8,38 +8,56 @@ This is a refactored modular version that imports from separate modules.
 import sys
 import os
 import curses
-import random
+import time
+import types
 from collections import deque
 
 # Add the current directory to the path to import modules
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-# Import modular components
+# Import modular components (the score database loads on first use)
 from modules.game_config import (
-    REFRESH_RATE_MS, INITIAL_SNAKE_LENGTH, FOOD_POINTS,
-    SCORE_FILE, WINDOW_MARGIN_TOP, WINDOW_MARGIN_BOTTOM, WINDOW_MARGIN_HORIZONTAL
+    REFRESH_RATE_MS, SCORE_FILE, LEADERBOARD_FILE, LEADERBOARD_DB,
+    WINDOW_MARGIN_TOP, WINDOW_MARGIN_BOTTOM, WINDOW_MARGIN_HORIZONTAL, MIN_SCREEN_HEIGHT, MIN_SCREEN_WIDTH
 )
-from modules.score_manager import ScoreManager
+from modules.persistence import PersistenceWorker
 from modules.game_renderer import GameRenderer
+from modules.game_clock import GameClock
+from modules.input_queue import InputQueue
+from modules.game_engine import GameState, UP, DOWN, LEFT, RIGHT
+
+# Arrow keys mapped to engine directions
+KEY_DIRECTIONS = {
+    curses.KEY_UP: UP,
+    curses.KEY_DOWN: DOWN,
+    curses.KEY_LEFT: LEFT,
+    curses.KEY_RIGHT: RIGHT
+}
 
 
 class SnakeGame:
     """Main Snake Game class handling game logic and rendering."""
 
-    def __init__(self, stdscr):
-        """Initialize the game with curses screen."""
+    def __init__(self, stdscr, persistence=None, ansi=False):
+        """Initialize the game with curses screen.
+
+        With ansi set, frames are drawn by the AnsiRenderer backend
+        instead of curses; curses still reads the keys.
+        """
         self.stdscr = stdscr
-        self.score = 0
         self.paused = False
 
-        # Initialize score manager
-        self.score_manager = ScoreManager(SCORE_FILE)
-        self.high_score = self.score_manager.load_high_score()
+        # Scores are kept in the database shared with the main version,
+        # read and written on the persistence thread once the first frame is up;
+        # the stored high score reaches the main loop through loaded_high_scores
+        self.persistence = persistence or PersistenceWorker()
+        self.leaderboard_store = None
+        self.high_score = 0
+        self.loaded_high_scores = deque()
 
         # Setup curses
         curses.curs_set(0)  # Hide cursor
         self.stdscr.nodelay(1)  # Non-blocking input
-        self.stdscr.timeout(REFRESH_RATE_MS)  # Refresh rate in ms
 
         # Get screen dimensions
         self.height, self.width = stdscr.getmaxyx()
@@ -49,46 +67,102 @@ class SnakeGame:
         self.game_width = self.width - WINDOW_MARGIN_HORIZONTAL
         self.window = curses.newwin(self.game_height, self.game_width, WINDOW_MARGIN_TOP, 1)
         self.window.keypad(1)
-        self.window.timeout(REFRESH_RATE_MS)
+
+        # Direction changes are buffered and applied one per tick
+        self.input_queue = InputQueue()
+
+        # Simulation ticks run on a fixed schedule, independent of input
+        self.clock = GameClock(REFRESH_RATE_MS)
 
         # Initialize renderer
-        self.renderer = GameRenderer(self.stdscr, self.window, self.game_height, self.game_width)
+        if ansi:
+            from modules.ansi_renderer import AnsiRenderer
+            self.renderer = AnsiRenderer(self.stdscr, self.window, self.game_height, self.game_width)
+        else:
+            self.renderer = GameRenderer(self.stdscr, self.window, self.game_height, self.game_width)
 
-        # Initialize game state
+        # Initialize game state (no levels or obstacles in this version)
+        self.state = GameState(self.game_height, self.game_width, progression=False, track_changes=True)
+        self.too_small = False
         self.reset_game()
 
+    @property
+    def snake(self):
+        """Snake body as a SnakeBody ring buffer of packed y * width + x cell indices, head first."""
+        return self.state.snake
+
+    @property
+    def food(self):
+        """Current food position, or None once the board is full."""
+        return self.state.food
+
+    @property
+    def board(self):
+        """Occupancy grid of the play area."""
+        return self.state.board
+
+    @property
+    def score(self):
+        """Current score."""
+        return self.state.score
+
+    @property
+    def won(self):
+        """True if the last game ended with the board full."""
+        return self.state.won
+
+    def open_leaderboard_store(self):
+        """Open the score database, importing the old JSON score files once.
+
+        Runs on the persistence thread, which also takes the sqlite3 import.
+        """
+        from modules.leaderboard_store import LeaderboardStore
+        store = LeaderboardStore(LEADERBOARD_DB)
+        store.migrate_high_score_file(SCORE_FILE)
+        store.migrate_leaderboard_file(LEADERBOARD_FILE)
+        self.leaderboard_store = store
+        self.loaded_high_scores.append(store.high_score())
+
+    def get_leaderboard_store(self):
+        """Return the score database, opening it if that has not succeeded yet. Runs on the persistence thread."""
+        if self.leaderboard_store is None:
+            self.open_leaderboard_store()
+        return self.leaderboard_store
+
+    def apply_loaded_high_scores(self):
+        """Take the high scores read on the persistence thread. Runs on the main thread."""
+        while self.loaded_high_scores:
+            self.high_score = max(self.high_score, self.loaded_high_scores.popleft())
+
+    def record_score(self):
+        """Update the high score and queue the finished game for the score database."""
+        self.apply_loaded_high_scores()
+        if self.score > self.high_score:
+            self.high_score = self.score
+        score, level = self.score, self.state.level
+        self.persistence.submit(lambda: self.get_leaderboard_store().add_score(score, level),
+                                description=f"Saving the score {score}")
+
     def reset_game(self):
         """Reset game state for a new game."""
-        # Snake starts in the middle
-        start_y = self.game_height // 2
-        start_x = self.game_width // 2
-
-        # Snake body (deque of [y, x] coordinates)
-        self.snake = deque([
-            [start_y, start_x],
-            [start_y, start_x - 1],
-            [start_y, start_x - 2]
-        ])
-
-        # Initial direction (right)
-        self.direction = curses.KEY_RIGHT
-        self.last_direction = self.direction
-
-        # Generate first food
-        self.food = self.generate_food()
+        # A new game fits the terminal again, even if the last snake kept the board larger
+        if not (self.height < MIN_SCREEN_HEIGHT or self.width < MIN_SCREEN_WIDTH):
+            self.state.reset(size=(self.height - WINDOW_MARGIN_BOTTOM, self.width - WINDOW_MARGIN_HORIZONTAL))
+            if self.too_small or (self.state.height, self.state.width) != (self.game_height, self.game_width):
+                self.too_small = False
+                self.game_height, self.game_width = self.state.height, self.state.width
+                self.renderer.resize(self.game_height, self.game_width)
+        else:
+            self.state.reset()
+        self.input_queue.clear()
+        self.clock.reset()
 
-        # Reset score
-        self.score = 0
+        # New board, so repaint everything on the next frame
+        self.renderer.invalidate()
 
     def generate_food(self):
-        """Generate food at a random position not occupied by snake."""
-        while True:
-            food_y = random.randint(1, self.game_height - 2)
-            food_x = random.randint(1, self.game_width - 2)
-            food = [food_y, food_x]
-
-            if food not in self.snake:
-                return food
+        """Generate food at a random free position, or None if the board is full."""
+        return self.state.generate_food()
 
     def get_input(self):
         """Get user input and update direction."""
@@ -108,82 +182,60 @@ class SnakeGame:
             self.reset_game()
             return True
 
+        # Lay the screen out again for the new terminal size
+        if key == curses.KEY_RESIZE:
+            self.handle_resize()
+            return True
+
         # Don't update direction if paused
         if self.paused:
             return True
 
-        # Update direction (prevent 180-degree turns)
-        if key in [curses.KEY_UP, curses.KEY_DOWN, curses.KEY_LEFT, curses.KEY_RIGHT]:
-            if (key == curses.KEY_UP and self.last_direction != curses.KEY_DOWN) or \
-               (key == curses.KEY_DOWN and self.last_direction != curses.KEY_UP) or \
-               (key == curses.KEY_LEFT and self.last_direction != curses.KEY_RIGHT) or \
-               (key == curses.KEY_RIGHT and self.last_direction != curses.KEY_LEFT):
-                self.direction = key
+        # Queue direction change (prevent 180-degree turns)
+        if key in KEY_DIRECTIONS:
+            self.input_queue.push(KEY_DIRECTIONS[key], self.state.direction)
 
         return True
 
-    def move_snake(self):
-        """Move snake in current direction."""
-        head = self.snake[0].copy()
-
-        # Calculate new head position
-        if self.direction == curses.KEY_UP:
-            head[0] -= 1
-        elif self.direction == curses.KEY_DOWN:
-            head[0] += 1
-        elif self.direction == curses.KEY_LEFT:
-            head[1] -= 1
-        elif self.direction == curses.KEY_RIGHT:
-            head[1] += 1
-
-        return head
+    def handle_resize(self):
+        """Resize the board with the terminal, keeping the game going.
+
+        The game pauses with a notice while the terminal is smaller than
+        MIN_SCREEN_HEIGHT x MIN_SCREEN_WIDTH or too small for the snake.
+        """
+        self.height, self.width = self.stdscr.getmaxyx()
+        game_height = self.height - WINDOW_MARGIN_BOTTOM
+        game_width = self.width - WINDOW_MARGIN_HORIZONTAL
+        self.too_small = self.height < MIN_SCREEN_HEIGHT or self.width < MIN_SCREEN_WIDTH
+        if not self.too_small:
+            self.state.resize(game_height, game_width)
+            # The board never shrinks past the snake; this version has no camera to scroll it
+            self.too_small = self.state.height > game_height or self.state.width > game_width
+        if self.too_small:
+            self.renderer.draw_message(f"Terminal too small: resize to at least "
+                                       f"{max(MIN_SCREEN_WIDTH, self.state.width + WINDOW_MARGIN_HORIZONTAL)}x"
+                                       f"{max(MIN_SCREEN_HEIGHT, self.state.height + WINDOW_MARGIN_BOTTOM)}")
+            return
+        self.game_height, self.game_width = self.state.height, self.state.width
+        self.renderer.resize(self.game_height, self.game_width)
 
     def check_collision(self, head):
         """Check if snake collided with wall or itself."""
-        y, x = head
-
-        # Check wall collision
-        if y <= 0 or y >= self.game_height - 1 or x <= 0 or x >= self.game_width - 1:
-            return True
-
-        # Check self collision
-        if head in self.snake:
-            return True
-
-        return False
+        return self.state.check_collision(head)
 
     def update(self):
-        """Update game state."""
-        # Don't update if paused
-        if self.paused:
+        """Update game state. Returns False when the game is over."""
+        # Don't update if paused or the game cannot be shown
+        if self.paused or self.too_small:
             return True
 
-        new_head = self.move_snake()
-
-        # Check collision
-        if self.check_collision(new_head):
-            return False
-
-        # Add new head
-        self.snake.appendleft(new_head)
-
-        # Check if food eaten
-        if new_head == self.food:
-            self.score += FOOD_POINTS
-            self.food = self.generate_food()
-            # Snake grows (don't remove tail)
-        else:
-            # Remove tail (snake moves)
-            self.snake.pop()
-
-        # Update last direction
-        self.last_direction = self.direction
-
-        return True
+        self.state.step(self.input_queue.pop())
+        return not self.state.game_over
 
     def game_over_screen(self):
         """Display game over screen and wait for input."""
-        self.renderer.draw_game_over(self.score)
+        if not self.too_small:
+            self.renderer.draw_game_over(self.score, self.won)
 
         # Wait for R or Q
         self.window.nodelay(0)  # Blocking input
@@ -193,57 +245,103 @@ class SnakeGame:
                 self.window.nodelay(1)  # Non-blocking input
                 self.reset_game()
                 return True
+            elif key == curses.KEY_RESIZE:
+                # Redraw the final board and game over screen at the new size
+                self.handle_resize()
+                if not self.too_small:
+                    self.draw_frame()
+                    self.renderer.draw_game_over(self.score, self.won)
             elif key in [ord('q'), ord('Q')]:
                 return False
 
+    def draw_frame(self):
+        """Draw the game with the renderer."""
+        self.renderer.draw_frame(self.board, self.snake, self.food, self.score, self.high_score, self.paused)
+
+    def wait_for_tick(self):
+        """Handle input until the next tick is due. Returns False on quit."""
+        while True:
+            timeout = self.clock.ms_until_tick()
+            if timeout == 0:
+                return True
+            self.window.timeout(timeout)
+            if not self.get_input():
+                return False
+
     def run(self):
         """Main game loop."""
-        running = True
-
-        while running:
-            # Clear screen
-            self.stdscr.clear()
-            self.window.clear()
+        first_frame = True
+        while True:
+            self.apply_loaded_high_scores()
 
-            # Draw everything
-            self.renderer.draw_border(self.score, self.high_score, self.paused)
-            self.renderer.draw_snake(self.snake)
-            self.renderer.draw_food(self.food)
+            # Draw what changed since the last frame, unless running behind
+            if self.clock.should_render() and not self.too_small:
+                render_start = time.monotonic()
+                self.draw_frame()
+                self.clock.record_render(time.monotonic() - render_start)
 
-            # Refresh
-            self.stdscr.refresh()
-            self.window.refresh()
+            # Put the first frame up before the slow-to-import score database is opened
+            if first_frame:
+                self.persistence.submit(self.open_leaderboard_store, description="Opening the score database")
+                first_frame = False
 
-            # Get input
-            if not self.get_input():
+            # Get input until the next tick
+            if not self.wait_for_tick():
                 break
 
-            # Update game state
-            if not self.update():
-                # Update high score
-                if self.score > self.high_score:
-                    self.high_score = self.score
-                    self.score_manager.save_high_score(self.high_score)
+            # Update game state once per due tick
+            for _ in range(self.clock.due_ticks()):
+                if not self.update():
+                    # Record the score
+                    self.record_score()
 
-                # Game over
-                if not self.game_over_screen():
+                    # Game over
+                    if not self.game_over_screen():
+                        return
                     break
 
 
-def main(stdscr):
+def parse_args(argv=None):
+    """Parse command line options (sys.argv unless given)."""
+    if argv is None:
+        argv = sys.argv[1:]
+    if not argv:
+        # Skip loading argparse for a plain start
+        return types.SimpleNamespace(ansi=False)
+
+    import argparse
+    parser = argparse.ArgumentParser(description="Terminal snake game (modular version).")
+    parser.add_argument('--ansi', action='store_true',
+                        help="draw frames with raw ANSI escape sequences instead of curses")
+    return parser.parse_args(argv)
+
+
+def main(stdscr, persistence=None, ansi=False):
     """Main entry point for the game."""
-    game = SnakeGame(stdscr)
-    game.run()
+    game = SnakeGame(stdscr, persistence=persistence, ansi=ansi)
+    try:
+        game.run()
+    finally:
+        if persistence is None:
+            game.persistence.close()
 
 
 def main_wrapper():
     """Wrapper function for poetry script entry point."""
+    args = parse_args()
+    persistence = PersistenceWorker()
     try:
-        curses.wrapper(main)
+        curses.wrapper(main, persistence, args.ansi)
     except KeyboardInterrupt:
         print("\nGame terminated by user.")
     except Exception as e:
         print(f"An error occurred: {e}")
+    finally:
+        # Finish pending score writes once the terminal is restored
+        if not persistence.close():
+            print("Warning: some scores could not be saved in time.")
+        for failure in persistence.failures:
+            print(f"Warning: {failure}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Snake Viewer - Terminal Based
+Watches a game broadcast with --broadcast or --broadcast-port: rebuilds
+it from the frame stream and draws it with the modular GameRenderer.
+"""
+
+import sys
+import os
+import argparse
+import curses
+import socket
+
+# Add the current directory to the path to import modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.frame_stream import FrameDecoder, TICK, KEYFRAME, GAME_OVER, latest_keyframe
+from modules.game_config import MIN_SCREEN_HEIGHT, MIN_SCREEN_WIDTH
+from modules.game_renderer import GameRenderer
+
+# Bytes read from the stream at a time
+READ_SIZE = 65536
+
+# Milliseconds between checks for new data on a live stream
+POLL_MS = 10
+
+
+class StreamSource:
+    """Reads a frame stream from a file or a socket without blocking for long."""
+
+    def __init__(self, file=None, sock=None, follow=False, prefix=b''):
+        """Read from an open binary file (waiting for more at its end if follow is set) or a socket.
+
+        prefix is handed out before anything read.
+        """
+        self.file = file
+        self.sock = sock
+        self.follow = follow
+        self.prefix = prefix
+        if sock is not None:
+            sock.setblocking(False)
+
+    def read(self):
+        """Return the bytes available now: b'' if none yet, None once the stream has ended."""
+        if self.prefix:
+            data = self.prefix
+            self.prefix = b''
+            return data
+        if self.sock is not None:
+            try:
+                data = self.sock.recv(READ_SIZE)
+            except BlockingIOError:
+                return b''
+            return data or None
+        data = self.file.read(READ_SIZE)
+        if not data and not self.follow:
+            return None
+        return data
+
+    def close(self):
+        """Close the file or socket."""
+        if self.sock is not None:
+            self.sock.close()
+        else:
+            self.file.close()
+
+
+class SnakeViewer:
+    """Replays a frame stream on screen.
+
+    A stream read from a file is played back at the game's speed, one
+    tick per tick interval. A live stream is drawn as it arrives.
+    """
+
+    def __init__(self, stdscr, source, paced, ansi=False):
+        """Initialize the viewer for a stream source, drawing with the ANSI backend if ansi is set."""
+        self.stdscr = stdscr
+        self.source = source
+        self.paced = paced
+        self.ansi = ansi
+        self.decoder = FrameDecoder()
+        self.renderer = None
+        self.window = None
+        self.high_score = 0
+        self.ended = False
+
+        curses.curs_set(0)  # Hide cursor
+        self.stdscr.keypad(True)
+
+    def create_renderer(self):
+        """Create the game window once the stream header gives the board size.
+
+        A board larger than the terminal is shown through the renderer's
+        camera, in a window as large as fits.
+        """
+        screen_height, screen_width = self.stdscr.getmaxyx()
+        if screen_height < MIN_SCREEN_HEIGHT or screen_width < MIN_SCREEN_WIDTH:
+            raise ValueError(f"The terminal is too small: resize to at least {MIN_SCREEN_WIDTH}x{MIN_SCREEN_HEIGHT}")
+        height = min(self.decoder.height, screen_height - 5)
+        width = min(self.decoder.width, screen_width - 2)
+        self.window = curses.newwin(height, width, 2, 1)
+        if self.ansi:
+            from modules.ansi_renderer import AnsiRenderer
+            self.renderer = AnsiRenderer(self.stdscr, self.window, height, width)
+        else:
+            self.renderer = GameRenderer(self.stdscr, self.window, height, width)
+        self.renderer.instructions = "Spectating | Q: Quit"
+        self.renderer.game_over_hint = "Waiting for the next game... Q: Quit"
+        self.renderer.layout()
+
+    def read(self):
+        """Feed newly available stream data to the decoder. Returns False once the stream has ended."""
+        data = self.source.read()
+        if data is None:
+            return False
+        if data:
+            self.decoder.feed(data)
+        return True
+
+    def apply(self):
+        """Apply records up to the next tick. Returns the last record applied, or None if none is complete."""
+        last = None
+        while True:
+            record = self.decoder.next_record()
+            if record is None:
+                return last
+            if self.renderer is None and self.decoder.height is not None:
+                self.create_renderer()
+            last = record
+            if record == KEYFRAME:
+                self.renderer.invalidate()
+            if record in (TICK, KEYFRAME, GAME_OVER):
+                return last
+
+    def draw(self, record):
+        """Draw the game after a record was applied."""
+        state = self.decoder.state
+        if state is None:
+            return
+        self.high_score = max(self.high_score, state.score)
+        if state.game_over:
+            if record == GAME_OVER or record == KEYFRAME:
+                self.renderer.draw_game_over(state.score, state.won)
+            return
+        self.renderer.draw_frame(state.board, state.snake, state.food, state.score, self.high_score,
+                                 False, state.obstacles, state.level)
+
+    def wait(self, ms):
+        """Wait up to ms milliseconds for a key. Returns False if the user quit."""
+        self.stdscr.timeout(ms)
+        key = self.stdscr.getch()
+        return key not in (ord('q'), ord('Q'))
+
+    def run(self):
+        """Show the stream until it ends and the user quits, or the user quits."""
+        while True:
+            record = self.apply()
+            if record is None:
+                if not self.ended and not self.read():
+                    self.ended = True
+                if not self.wait(POLL_MS):
+                    return
+                continue
+
+            self.draw(record)
+            if self.paced and record in (TICK, KEYFRAME) and self.decoder.state is not None:
+                if not self.wait(self.decoder.state.tick_interval()):
+                    return
+            elif not self.wait(0):
+                return
+
+
+def open_source(args):
+    """Open the stream named by the command line arguments. Returns (source, paced)."""
+    if args.port is not None:
+        sock = socket.create_connection((args.host, args.port))
+        return StreamSource(sock=sock), False
+
+    file = open(args.file, 'rb')
+    if not args.live:
+        return StreamSource(file=file, follow=args.follow), True
+
+    # Join a running broadcast at its latest keyframe
+    data = file.read()
+    decoder = FrameDecoder()
+    decoder.feed(data)
+    decoder.next_record()
+    start = decoder.pos
+    keyframe = latest_keyframe(data[start:], decoder.height, decoder.width)
+    file.seek(start + keyframe if keyframe is not None else len(data))
+    return StreamSource(file=file, follow=True, prefix=data[:start]), False
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Watch a broadcast snake game.")
+    parser.add_argument('file', nargs='?', help="stream file written with --broadcast")
+    parser.add_argument('--follow', action='store_true', help="keep reading as the file grows")
+    parser.add_argument('--live', action='store_true',
+                        help="start at the latest keyframe of the file and follow it")
+    parser.add_argument('--host', default='127.0.0.1', help="broadcasting game's address (default: loopback)")
+    parser.add_argument('--port', type=int, help="connect to a game started with --broadcast-port")
+    parser.add_argument('--ansi', action='store_true',
+                        help="draw frames with raw ANSI escape sequences instead of curses")
+    args = parser.parse_args(argv)
+    if (args.file is None) == (args.port is None):
+        parser.error("give either a stream file or --port")
+    return args
+
+
+def main(stdscr, source, paced, ansi=False):
+    """Main entry point for the viewer."""
+    SnakeViewer(stdscr, source, paced, ansi).run()
+
+
+def main_wrapper():
+    """Wrapper function for poetry script entry point."""
+    args = parse_args()
+    try:
+        source, paced = open_source(args)
+    except OSError as e:
+        print(f"Could not open the stream: {e}")
+        return
+    try:
+        curses.wrapper(main, source, paced, args.ansi)
+    except KeyboardInterrupt:
+        print("\nViewer terminated by user.")
+    except Exception as e:
+        print(f"An error occurred: {e}")
+    finally:
+        source.close()
+
+
+if __name__ == "__main__":
+    main_wrapper()